@@ -0,0 +1,226 @@
+"""
+Метрики запросов к API: счетчики и гистограммы по эндпоинтам
+Позволяют увидеть, на что уходит время синхронизации (товары, вариации, термины)
+"""
+import re
+import json
+import time
+import logging
+import threading
+from bisect import bisect_left
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Числовые сегменты пути (ID) заменяются на {id}, чтобы запросы к разным товарам попадали в одну группу
+_ID_SEGMENT = re.compile(r"(?<=/)\d+(?=/|$)|^\d+(?=/|$)")
+
+def endpoint_template(endpoint: str) -> str:
+    """
+    Шаблон эндпоинта без конкретных ID
+    
+    Example:
+        "products/15/variations/batch" -> "products/{id}/variations/batch"
+    """
+    return _ID_SEGMENT.sub("{id}", endpoint.strip("/"))
+
+class Histogram:
+    """Гистограмма с фиксированными границами корзин"""
+    
+    def __init__(self, bounds: Tuple[float, ...]):
+        """
+        Args:
+            bounds: Верхние границы корзин по возрастанию (последняя корзина - все, что больше)
+        """
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+    
+    def observe(self, value: float):
+        """Учет одного значения"""
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.min = value if self.min is None else min(self.min, value)
+        self.max = value if self.max is None else max(self.max, value)
+    
+    def percentile(self, fraction: float) -> Optional[float]:
+        """Оценка перцентиля по границам корзин (верхняя граница корзины, в которую он попал)"""
+        if not self.count:
+            return None
+        
+        rank = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(self.bounds[index], self.max) if index < len(self.bounds) else self.max
+        return self.max
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Представление для JSON"""
+        labels = [f"<={bound:g}" for bound in self.bounds] + [f">{self.bounds[-1]:g}"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "avg": round(self.total / self.count, 6) if self.count else None,
+            "min": self.min,
+            "max": self.max,
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "p99": self.percentile(0.99),
+            "buckets": dict(zip(labels, self.counts))
+        }
+
+class EndpointStats:
+    """Счетчики и гистограммы одной пары (метод, шаблон эндпоинта)"""
+    
+    LATENCY_BOUNDS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    SIZE_BOUNDS = (1024, 10 * 1024, 100 * 1024, 1024 * 1024, 10 * 1024 * 1024)
+    
+    def __init__(self):
+        self.requests = 0
+        self.errors = 0
+        self.retries = 0
+        self.cache_hits = 0
+        self.request_bytes = 0
+        self.response_bytes = 0
+        self.max_page = 0
+        self.statuses: Dict[str, int] = {}
+        self.latency = Histogram(self.LATENCY_BOUNDS)
+        self.duration = Histogram(self.LATENCY_BOUNDS)
+        self.response_size = Histogram(self.SIZE_BOUNDS)
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Представление для JSON"""
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "retries": self.retries,
+            "cache_hits": self.cache_hits,
+            "request_bytes": self.request_bytes,
+            "response_bytes": self.response_bytes,
+            "max_page": self.max_page,
+            "statuses": dict(sorted(self.statuses.items())),
+            "latency_seconds": self.latency.to_dict(),
+            "duration_seconds": self.duration.to_dict(),
+            "response_size_bytes": self.response_size.to_dict()
+        }
+
+class ApiMetrics:
+    """
+    Сбор метрик всех запросов к API в памяти процесса
+    
+    latency - время последней попытки (ответ сервера), duration - полное время
+    вызова с ожиданием ограничителя и повторами.
+    """
+    
+    def __init__(self):
+        self._stats: Dict[Tuple[str, str], EndpointStats] = {}
+        self._lock = threading.Lock()
+        self.started_at = time.time()
+    
+    def record(self, method: str, endpoint: str, status: Optional[int], latency: float, duration: float,
+               request_bytes: int = 0, response_bytes: int = 0, retries: int = 0,
+               page: Optional[int] = None, from_cache: bool = False):
+        """
+        Учет одного вызова API
+        
+        Args:
+            method: HTTP-метод
+            endpoint: Эндпоинт (ID заменяются шаблоном автоматически)
+            status: Код ответа или None при ошибке соединения
+            latency: Время последней попытки в секундах
+            duration: Полное время вызова в секундах
+            request_bytes: Размер тела запроса
+            response_bytes: Размер полученного тела ответа (0 для ответа из кэша)
+            retries: Количество повторов
+            page: Номер страницы для постраничных запросов
+            from_cache: Ответ взят из HTTP-кэша (сервер вернул 304)
+        """
+        key = (method, endpoint_template(endpoint))
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = EndpointStats()
+            
+            stats.requests += 1
+            stats.retries += retries
+            stats.request_bytes += request_bytes
+            stats.response_bytes += response_bytes
+            stats.latency.observe(latency)
+            stats.duration.observe(duration)
+            
+            if status is None:
+                stats.errors += 1
+                stats.statuses["error"] = stats.statuses.get("error", 0) + 1
+                return
+            
+            stats.statuses[str(status)] = stats.statuses.get(str(status), 0) + 1
+            if status >= 400:
+                stats.errors += 1
+            if from_cache:
+                stats.cache_hits += 1
+            stats.response_size.observe(response_bytes)
+            if page:
+                stats.max_page = max(stats.max_page, int(page))
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Текущие метрики
+        
+        Returns:
+            Dict: Итоги и метрики по эндпоинтам, отсортированные по суммарному времени
+        """
+        with self._lock:
+            endpoints: List[Dict[str, Any]] = [
+                dict(method=method, endpoint=template, **stats.to_dict())
+                for (method, template), stats in self._stats.items()
+            ]
+        
+        endpoints.sort(key=lambda item: item["duration_seconds"]["sum"], reverse=True)
+        return {
+            "started_at": self.started_at,
+            "collected_at": time.time(),
+            "totals": {
+                "requests": sum(item["requests"] for item in endpoints),
+                "errors": sum(item["errors"] for item in endpoints),
+                "retries": sum(item["retries"] for item in endpoints),
+                "cache_hits": sum(item["cache_hits"] for item in endpoints),
+                "request_bytes": sum(item["request_bytes"] for item in endpoints),
+                "response_bytes": sum(item["response_bytes"] for item in endpoints),
+                "duration_seconds": round(sum(item["duration_seconds"]["sum"] for item in endpoints), 6)
+            },
+            "endpoints": endpoints
+        }
+    
+    def dump(self, path: str) -> bool:
+        """
+        Сохранение метрик в JSON
+        
+        Args:
+            path: Путь к файлу
+        
+        Returns:
+            bool: True если файл сохранен
+        """
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump(self.snapshot(), f, ensure_ascii=False, indent=2)
+            logger.info(f"Метрики API сохранены в {path}")
+            return True
+        except OSError as e:
+            logger.error(f"Ошибка сохранения метрик API: {e}")
+            return False
+    
+    def reset(self):
+        """Сброс накопленных метрик"""
+        with self._lock:
+            self._stats.clear()
+            self.started_at = time.time()
+
+# Метрики процесса, общие для всех менеджеров
+api_metrics = ApiMetrics()
@@ -0,0 +1,564 @@
+"""
+WooCommerce Product Manager - асинхронный клиент API на asyncio
+Те же операции, что и в WooCommerceManager, но тысячи запросов выполняются
+в одном цикле событий вместо отдельного потока на запрос
+"""
+import asyncio
+import json
+import logging
+import time
+from collections import deque
+from typing import List, Dict, Any, Optional, Tuple, Iterable, AsyncIterator, Mapping, NamedTuple
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from woocommerce import API
+from config import config_manager
+from rate_limiter import AdaptiveRateLimiter, get_rate_limiter, parse_retry_after
+from api_metrics import api_metrics
+from woocommerce_manager import (
+    BATCH_LIMIT, BATCH_KINDS, sign_request, split_batch, batch_payload,
+    collect_batch_results, batch_summary
+)
+
+logger = logging.getLogger(__name__)
+
+class ApiResponse(NamedTuple):
+    """Ответ API: код, заголовки (без учета регистра) и разобранное тело (JSON или текст)"""
+    status: int
+    headers: Mapping[str, str]
+    data: Any
+
+class AsyncWooCommerceManager:
+    """
+    Асинхронный клиент WooCommerce REST API
+    
+    Использование:
+        async with AsyncWooCommerceManager(config) as manager:
+            products = await manager.get_all_products()
+    
+    Число одновременных соединений ограничено max_connections, частота
+    запросов - общим ограничителем профиля (как у WooCommerceManager).
+    Отмена задачи прерывает все ее запросы.
+    """
+    
+    RETRY_STATUSES = (500, 502, 504)
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+    
+    def __init__(self, config: Dict[str, Any] = None, max_connections: Optional[int] = None,
+                 base_url: Optional[str] = None):
+        """
+        Инициализация асинхронного клиента
+        
+        Args:
+            config: Словарь с настройками подключения (по умолчанию текущий профиль)
+            max_connections: Максимум одновременных соединений (по умолчанию max_workers профиля)
+            base_url: Адрес сайта вместо site_url из настроек (например, тестовый сервер)
+        """
+        if aiohttp is None:
+            raise ImportError("Для асинхронного клиента требуется пакет aiohttp: pip install aiohttp")
+        
+        self.current_config = config if config is not None else config_manager.get_current_config()
+        self.api = API(
+            url=base_url or self.current_config.get('site_url', ''),
+            consumer_key=self.current_config.get('consumer_key', ''),
+            consumer_secret=self.current_config.get('consumer_secret', ''),
+            version=self.current_config.get('api_version', 'wc/v3'),
+            timeout=self.current_config.get('timeout', 30)
+        )
+        self.max_connections = max(1, max_connections or self._config_value('max_workers', 4))
+        self.rate_limiter: AdaptiveRateLimiter = get_rate_limiter(
+            f"{self.api.url}|{self.api.consumer_key}",
+            self._config_value('rate_limit', 20.0)
+        )
+        self.session = None
+    
+    async def __aenter__(self) -> 'AsyncWooCommerceManager':
+        return self
+    
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+    
+    def _config_value(self, key: str, default: Any) -> Any:
+        """Получение параметра из конфигурации подключения"""
+        value = self.current_config.get(key)
+        return default if value is None else value
+    
+    def _get_session(self) -> 'aiohttp.ClientSession':
+        """HTTP-сессия создается при первом запросе внутри цикла событий"""
+        if self.session is None or self.session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                ssl=None if self.api.verify_ssl else False
+            )
+            self.session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.api.timeout),
+                headers={"user-agent": self.api.user_agent, "accept": "application/json"}
+            )
+        return self.session
+    
+    async def close(self):
+        """Закрытие HTTP-сессии"""
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+    
+    async def _request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                       data: Any = None) -> ApiResponse:
+        """
+        Выполнение запроса к API
+        
+        Политика повторов та же, что у WooCommerceManager: ошибки установки
+        соединения повторяются для всех методов, ответы 5xx и обрывы - только
+        для идемпотентных, 429/503 - после паузы из Retry-After. Каждая попытка
+        подписывается заново, поэтому повторы работают и с OAuth (http).
+        
+        Args:
+            method: HTTP-метод
+            endpoint: Эндпоинт API
+            params: Параметры строки запроса
+            data: Тело запроса (сериализуется в JSON)
+        
+        Returns:
+            ApiResponse: Ответ сервера
+        """
+        session = self._get_session()
+        max_retries = max(0, self._config_value('max_retries', 3))
+        backoff = self._config_value('retry_backoff', 0.5)
+        idempotent = method in self.IDEMPOTENT_METHODS
+        page = (params or {}).get("page")
+        request_bytes = len(json.dumps(data)) if data is not None else 0
+        call_started = time.monotonic()
+        
+        for attempt in range(max_retries + 1):
+            wait = self.rate_limiter.reserve()
+            while wait > 0:
+                await asyncio.sleep(wait)
+                wait = self.rate_limiter.reserve()
+            
+            url, query, basic_auth = sign_request(self.api, method, endpoint, params)
+            auth = aiohttp.BasicAuth(self.api.consumer_key, self.api.consumer_secret) if basic_auth else None
+            started = time.monotonic()
+            try:
+                async with session.request(method, url, params=query, json=data, auth=auth) as response:
+                    raw = await response.read()
+                    text = await response.text()
+                    try:
+                        body = json.loads(text) if text else None
+                    except ValueError:
+                        body = text
+                    result = ApiResponse(response.status, response.headers, body)
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as e:
+                self.rate_limiter.on_error()
+                # Обрыв после отправки повторяется только для идемпотентных методов
+                connect_failed = isinstance(e, aiohttp.ClientConnectorError)
+                if attempt == max_retries or not (idempotent or connect_failed):
+                    finished = time.monotonic()
+                    api_metrics.record(method, endpoint, None, finished - started, finished - call_started,
+                                       request_bytes=request_bytes, retries=attempt, page=page)
+                    raise
+                await asyncio.sleep(backoff * (2 ** attempt))
+                continue
+            
+            latency = time.monotonic() - started
+            retry_after = parse_retry_after(result.headers.get("Retry-After"))
+            self.rate_limiter.on_response(result.status, latency, retry_after)
+            
+            if attempt == max_retries:
+                break
+            if result.status in AdaptiveRateLimiter.THROTTLE_STATUSES:
+                if result.status == 503 and not idempotent and retry_after is None:
+                    break
+                if retry_after is None:
+                    await asyncio.sleep(backoff * (2 ** attempt))
+                logger.warning(f"Ответ {result.status} для {endpoint}, повтор {attempt + 1} из {max_retries}")
+                continue
+            if result.status in self.RETRY_STATUSES and idempotent:
+                await asyncio.sleep(backoff * (2 ** attempt))
+                continue
+            break
+        
+        api_metrics.record(method, endpoint, result.status, latency, time.monotonic() - call_started,
+                           request_bytes=request_bytes, response_bytes=len(raw), retries=attempt, page=page)
+        return result
+    
+    async def _call(self, method: str, endpoint: str, action: str, params: Optional[Dict[str, Any]] = None,
+                    data: Any = None, expected: Tuple[int, ...] = (200,)) -> Optional[Any]:
+        """
+        Запрос с проверкой кода ответа
+        
+        Args:
+            action: Описание операции для журнала ошибок
+            expected: Коды успешного ответа
+        
+        Returns:
+            Тело ответа или None в случае ошибки
+        """
+        try:
+            response = await self._request(method, endpoint, params, data)
+            if response.status in expected:
+                return response.data
+            logger.error(f"Ошибка {action}: {response.status} - {response.data}")
+            return None
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка при {action}: {e}")
+            return None
+    
+    async def test_connection(self) -> bool:
+        """
+        Тестирование подключения к API
+        
+        Returns:
+            bool: True если подключение успешно
+        """
+        return await self._call("GET", "products", "подключения", params={"per_page": 1}) is not None
+    
+    async def _get_page(self, endpoint: str, params: Dict[str, Any], page: int) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+        """Получение одной страницы коллекции: (элементы, всего страниц) или None при ошибке"""
+        response = await self._request("GET", endpoint, dict(params, page=page))
+        if response.status != 200:
+            logger.error(f"Ошибка получения страницы {page} ({endpoint}): {response.status}")
+            return None
+        
+        total_pages = response.headers.get("X-WP-TotalPages")
+        return response.data, int(total_pages) if total_pages else None
+    
+    async def _iter_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                          per_page: Optional[int] = None, strict: bool = False) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Постраничный обход коллекции
+        
+        Как и в WooCommerceManager: число страниц берется из X-WP-TotalPages
+        первой страницы, остальные загружаются одновременно (не больше
+        2 * max_connections вперед) и отдаются строго по порядку.
+        """
+        per_page = per_page or self._config_value('products_per_page', 100)
+        params = dict(params or {}, per_page=per_page)
+        
+        first = await self._get_page(endpoint, params, 1)
+        if first is None:
+            if strict:
+                raise RuntimeError(f"Не удалось загрузить страницу 1 ({endpoint})")
+            return
+        
+        items, total_pages = first
+        if items:
+            yield items
+        
+        if total_pages is None:
+            page = 2
+            while len(items) >= per_page:
+                page_result = await self._get_page(endpoint, params, page)
+                if page_result is None and strict:
+                    raise RuntimeError(f"Не удалось загрузить страницу {page} ({endpoint})")
+                if page_result is None or not page_result[0]:
+                    break
+                if page_result[0][:1] == items[:1]:
+                    # Эндпоинт не поддерживает page и отдает всю коллекцию сразу
+                    break
+                items = page_result[0]
+                yield items
+                page += 1
+            return
+        
+        pages = iter(range(2, total_pages + 1))
+        window = deque(
+            asyncio.ensure_future(self._get_page(endpoint, params, page))
+            for _, page in zip(range(self.max_connections * 2), pages)
+        )
+        try:
+            page = 1
+            while window:
+                page += 1
+                page_result = await window.popleft()
+                if page_result is None:
+                    if strict:
+                        raise RuntimeError(f"Не удалось загрузить страницу {page} ({endpoint})")
+                    break
+                
+                next_page = next(pages, None)
+                if next_page is not None:
+                    window.append(asyncio.ensure_future(self._get_page(endpoint, params, next_page)))
+                
+                if page_result[0]:
+                    yield page_result[0]
+        finally:
+            # Прерванный обход: отменяем загрузку следующих страниц и дожидаемся отмены,
+            # чтобы не оставить незавершенные задачи и неполученные исключения
+            for task in window:
+                task.cancel()
+            await asyncio.gather(*window, return_exceptions=True)
+    
+    async def _fetch_all_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                               per_page: Optional[int] = None, strict: bool = False) -> List[Dict[str, Any]]:
+        """Получение всех страниц коллекции одним списком"""
+        results = []
+        async for items in self._iter_pages(endpoint, params, per_page, strict):
+            results.extend(items)
+        return results
+    
+    async def _fetch_collection(self, endpoint: str, action: str) -> List[Dict[str, Any]]:
+        """Полная загрузка коллекции; при ошибке любой страницы - пустой список вместо неполных данных"""
+        try:
+            return await self._fetch_all_pages(endpoint, per_page=100, strict=True)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка при {action}: {e}")
+            return []
+    
+    async def iter_product_pages(self, fields: Optional[Iterable[str]] = None) -> AsyncIterator[List[Dict[str, Any]]]:
+        """
+        Постраничная загрузка товаров с сайта
+        
+        Args:
+            fields: Запрашиваемые поля (например, Product.LIST_FIELDS); по умолчанию все
+        
+        Yields:
+            List[Dict]: Товары очередной страницы
+        """
+        params = {"_fields": ",".join(fields)} if fields else None
+        pages = self._iter_pages("products", params)
+        try:
+            async for items in pages:
+                yield items
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(f"Ошибка при получении товаров: {e}")
+        finally:
+            # При прерванном обходе закрываем вложенный генератор сразу, а не при сборке мусора
+            await pages.aclose()
+    
+    async def get_all_products(self, fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
+        """
+        Получение всех товаров с сайта
+        
+        Args:
+            fields: Запрашиваемые поля; по умолчанию все
+        
+        Returns:
+            List[Dict]: Список всех товаров
+        """
+        products = []
+        async for items in self.iter_product_pages(fields):
+            products.extend(items)
+        logger.info(f"Загружено {len(products)} товаров")
+        return products
+    
+    async def get_product(self, product_id: int) -> Optional[Dict[str, Any]]:
+        """Получение полных данных товара"""
+        return await self._call("GET", f"products/{product_id}", "получения товара")
+    
+    async def hydrate_products(self, product_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """Получение полных данных нескольких товаров (группами по 100 через include, одновременно)"""
+        product_ids = list(dict.fromkeys(product_ids))
+        chunks = [product_ids[i:i + 100] for i in range(0, len(product_ids), 100)]
+        results = await asyncio.gather(*(
+            self._call("GET", "products", "получения полных данных товаров", params={
+                "include": ",".join(str(product_id) for product_id in chunk),
+                "per_page": len(chunk)
+            }) for chunk in chunks
+        ))
+        return [product for items in results if items for product in items]
+    
+    async def create_product(self, product_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Создание нового товара"""
+        return await self._call("POST", "products", "создания товара", data=product_data, expected=(200, 201))
+    
+    async def update_product(self, product_id: int, product_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Обновление товара"""
+        return await self._call("PUT", f"products/{product_id}", "обновления товара", data=product_data)
+    
+    async def delete_product(self, product_id: int, force: bool = True) -> bool:
+        """Удаление товара"""
+        return await self._call("DELETE", f"products/{product_id}", "удаления товара",
+                                params={"force": force}) is not None
+    
+    async def get_product_by_sku(self, sku: str) -> Optional[Dict[str, Any]]:
+        """Поиск товара по SKU"""
+        products = await self._call("GET", "products", "поиска товара по SKU", params={"sku": sku})
+        return products[0] if products else None
+    
+    async def get_categories(self) -> List[Dict[str, Any]]:
+        """Получение всех категорий товаров"""
+        return await self._fetch_collection("products/categories", "получении категорий")
+    
+    async def get_attributes(self) -> List[Dict[str, Any]]:
+        """Получение всех атрибутов товаров"""
+        return await self._fetch_collection("products/attributes", "получении атрибутов")
+    
+    async def create_attribute(self, attribute_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Создание нового атрибута"""
+        return await self._call("POST", "products/attributes", "создания атрибута",
+                                data=attribute_data, expected=(200, 201))
+    
+    async def update_attribute(self, attribute_id: int, attribute_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Обновление атрибута"""
+        return await self._call("PUT", f"products/attributes/{attribute_id}", "обновления атрибута",
+                                data=attribute_data)
+    
+    async def delete_attribute(self, attribute_id: int) -> bool:
+        """Удаление атрибута"""
+        return await self._call("DELETE", f"products/attributes/{attribute_id}", "удаления атрибута",
+                                params={"force": True}) is not None
+    
+    async def get_attribute_terms(self, attribute_id: int) -> List[Dict[str, Any]]:
+        """Получение значений атрибута"""
+        return await self._fetch_collection(f"products/attributes/{attribute_id}/terms",
+                                            "получении значений атрибута")
+    
+    async def create_attribute_term(self, attribute_id: int, term_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Создание значения атрибута"""
+        return await self._call("POST", f"products/attributes/{attribute_id}/terms", "создания значения атрибута",
+                                data=term_data, expected=(200, 201))
+    
+    async def delete_attribute_term(self, attribute_id: int, term_id: int) -> bool:
+        """Удаление значения атрибута"""
+        return await self._call("DELETE", f"products/attributes/{attribute_id}/terms/{term_id}",
+                                "удаления значения атрибута", params={"force": True}) is not None
+    
+    async def create_variation(self, parent_id: int, variation_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Создание вариации товара"""
+        return await self._call("POST", f"products/{parent_id}/variations", "создания вариации",
+                                data=variation_data, expected=(200, 201))
+    
+    async def get_variations(self, parent_id: int) -> List[Dict[str, Any]]:
+        """Получение всех вариаций товара (постранично)"""
+        return await self._fetch_collection(f"products/{parent_id}/variations", "получении вариаций")
+    
+    async def get_variations_for_products(self, parent_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Получение вариаций многих товаров одновременно
+        
+        Одновременно загружается не больше max_connections товаров.
+        
+        Returns:
+            Dict: {ID товара: список вариаций} для успешно загруженных товаров
+        """
+        semaphore = asyncio.Semaphore(self.max_connections)
+        
+        async def fetch(parent_id):
+            async with semaphore:
+                try:
+                    return parent_id, await self._fetch_all_pages(f"products/{parent_id}/variations",
+                                                                  per_page=100, strict=True)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.error(f"Ошибка при получении вариаций товара {parent_id}: {e}")
+                    return parent_id, None
+        
+        results = await asyncio.gather(*(fetch(parent_id) for parent_id in dict.fromkeys(parent_ids)))
+        return {parent_id: variations for parent_id, variations in results if variations is not None}
+    
+    async def update_variation(self, parent_id: int, variation_id: int, variation_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Обновление вариации товара"""
+        return await self._call("PUT", f"products/{parent_id}/variations/{variation_id}", "обновления вариации",
+                                data=variation_data)
+    
+    async def delete_variation(self, parent_id: int, variation_id: int, force: bool = True) -> bool:
+        """Удаление вариации товара"""
+        return await self._call("DELETE", f"products/{parent_id}/variations/{variation_id}", "удаления вариации",
+                                params={"force": force}) is not None
+    
+    async def _run_batch(self, endpoint: str, operations: Dict[str, List[Any]],
+                         extra: Optional[Dict[str, Any]] = None) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Выполнение пакетных операций: части отправляются одновременно,
+        результаты сопоставляются с входными элементами (см. WooCommerceManager._run_batch)
+        """
+        chunks, results = split_batch(operations, self._config_value('batch_size', BATCH_LIMIT))
+        
+        async def send_chunk(chunk):
+            try:
+                response = await self._request("POST", endpoint, data=batch_payload(chunk, extra))
+                if response.status == 200:
+                    return response.data, None
+                logger.error(f"Ошибка пакетного запроса {endpoint}: {response.status} - {response.data}")
+                return None, {"code": f"http_{response.status}", "message": str(response.data)}
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Ошибка при пакетном запросе {endpoint}: {e}")
+                return None, {"code": "request_failed", "message": str(e)}
+        
+        responses = await asyncio.gather(*(send_chunk(chunk) for chunk in chunks))
+        for chunk, (response_data, chunk_error) in zip(chunks, responses):
+            collect_batch_results(results, chunk, response_data, chunk_error)
+        return results
+    
+    async def batch_create_products(self, products_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Пакетное создание товаров"""
+        results = await self._run_batch("products/batch", {"create": products_data})
+        return batch_summary(results["create"], "создание")
+    
+    async def batch_update_products(self, products_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Пакетное обновление товаров"""
+        results = await self._run_batch("products/batch", {"update": products_data})
+        return batch_summary(results["update"], "обновление")
+    
+    async def batch_delete_products(self, product_ids: List[int], force: bool = True) -> Dict[str, Any]:
+        """Пакетное удаление товаров"""
+        results = await self._run_batch("products/batch", {"delete": list(product_ids)},
+                                        extra={"force": True} if force else None)
+        return batch_summary(results["delete"], "удаление")
+    
+    async def batch_products(self, create: Optional[List[Dict[str, Any]]] = None,
+                             update: Optional[List[Dict[str, Any]]] = None,
+                             delete: Optional[List[int]] = None) -> Dict[str, Dict[str, Any]]:
+        """Смешанная пакетная операция: создание, обновление и удаление в одних запросах"""
+        results = await self._run_batch("products/batch", {
+            "create": create or [],
+            "update": update or [],
+            "delete": list(delete or [])
+        }, extra={"force": True} if delete else None)
+        
+        operations = {"create": "создание", "update": "обновление", "delete": "удаление"}
+        return {kind: batch_summary(results[kind], operations[kind]) for kind in BATCH_KINDS}
+    
+    async def batch_create_variations(self, parent_id: int, variations_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Пакетное создание вариаций товара"""
+        results = await self._run_batch(f"products/{parent_id}/variations/batch", {"create": variations_data})
+        return batch_summary(results["create"], "создание вариаций")
+    
+    async def batch_update_variations(self, parent_id: int, variations_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Пакетное обновление вариаций товара"""
+        results = await self._run_batch(f"products/{parent_id}/variations/batch", {"update": variations_data})
+        return batch_summary(results["update"], "обновление вариаций")
+    
+    async def batch_delete_variations(self, parent_id: int, variation_ids: List[int], force: bool = True) -> Dict[str, Any]:
+        """Пакетное удаление вариаций товара"""
+        results = await self._run_batch(f"products/{parent_id}/variations/batch", {"delete": list(variation_ids)},
+                                        extra={"force": True} if force else None)
+        return batch_summary(results["delete"], "удаление вариаций")
+    
+    async def create_variable_product_with_variations(self, product_data: Dict[str, Any],
+                                                      variations_data: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """
+        Создание вариативного товара с вариациями (вариации - пакетными запросами)
+        
+        Returns:
+            Dict: Созданный товар с вариациями или None в случае ошибки;
+                  ошибки отдельных вариаций - в "variation_errors"
+        """
+        parent_product = await self.create_product(product_data)
+        if not parent_product:
+            return None
+        
+        parent_id = parent_product["id"]
+        batch_result = await self.batch_create_variations(parent_id, variations_data)
+        created_variations = batch_result["success"]
+        for error in batch_result["errors"]:
+            logger.warning(f"Не удалось создать вариацию {error['index'] + 1} для товара {parent_id}: {error['error']}")
+        
+        parent_product["variations"] = created_variations
+        parent_product["variation_errors"] = batch_result["errors"]
+        logger.info(f"Создан вариативный товар {parent_id} с {len(created_variations)} вариациями")
+        return parent_product
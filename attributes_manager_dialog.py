@@ -8,6 +8,8 @@ from typing import List, Dict, Any, Optional
 import threading
 import logging
 
+from request_scheduler import INTERACTIVE, BACKGROUND, prioritized
+
 logger = logging.getLogger(__name__)
 
 class AttributesManagerDialog:
@@ -25,6 +27,7 @@ class AttributesManagerDialog:
         self.wc_manager = wc_manager
         self.attributes = []
         self.selected_attribute = None
+        self.counts_generation = 0
         
         # Создаем диалоговое окно
         self.window = ctk.CTkToplevel(parent)
@@ -106,7 +109,7 @@ class AttributesManagerDialog:
         self.delete_attr_btn.pack(side="left", padx=5)
         
         self.refresh_btn = ctk.CTkButton(list_buttons_frame, text="🔄 Обновить", 
-                                       command=self.load_attributes, width=80)
+                                       command=lambda: self.load_attributes(refresh=True), width=80)
         self.refresh_btn.pack(side="right", padx=5)
         
         # Создаем Treeview для списка атрибутов
@@ -221,15 +224,20 @@ class AttributesManagerDialog:
         close_btn = ctk.CTkButton(buttons_frame, text="Закрыть", command=self.close_dialog)
         close_btn.pack(side="right", padx=5)
     
-    def load_attributes(self):
-        """Загрузка атрибутов с сервера"""
+    def load_attributes(self, refresh: bool = False):
+        """
+        Загрузка атрибутов (из кэша профиля или с сервера)
+        
+        Args:
+            refresh: Загрузить с сервера, даже если в кэше есть актуальные данные
+        """
         def load_thread():
             try:
                 # Показываем индикатор загрузки
                 self.window.after(0, lambda: self.refresh_btn.configure(text="⏳ Загрузка..."))
                 
                 # Загружаем атрибуты
-                self.attributes = self.wc_manager.get_attributes()
+                self.attributes = self.wc_manager.get_attributes(refresh=refresh)
                 
                 # Обновляем список в главном потоке
                 self.window.after(0, self.update_attributes_list)
@@ -239,7 +247,7 @@ class AttributesManagerDialog:
             finally:
                 self.window.after(0, lambda: self.refresh_btn.configure(text="🔄 Обновить"))
         
-        threading.Thread(target=load_thread, daemon=True).start()
+        threading.Thread(target=prioritized(INTERACTIVE, load_thread), daemon=True).start()
     
     def update_attributes_list(self):
         """Обновление списка атрибутов в интерфейсе"""
@@ -247,17 +255,46 @@ class AttributesManagerDialog:
         for item in self.attributes_tree.get_children():
             self.attributes_tree.delete(item)
         
-        # Добавляем атрибуты
+        # Список показывается сразу, количество терминов подгружается в фоне
         for attr in self.attributes:
-            # Получаем количество терминов для каждого атрибута
-            terms_count = len(self.wc_manager.get_attribute_terms(attr['id']))
-            
-            self.attributes_tree.insert("", "end", values=(
+            self.attributes_tree.insert("", "end", iid=str(attr['id']), values=(
                 attr['id'],
                 attr['name'],
                 attr['slug'],
-                f"{terms_count} шт."
+                "⏳"
             ))
+        
+        self.load_terms_counts()
+    
+    def load_terms_counts(self):
+        """Фоновая загрузка количества терминов всех атрибутов"""
+        self.counts_generation += 1
+        generation = self.counts_generation
+        attribute_ids = [attr['id'] for attr in self.attributes]
+        
+        def counts_thread():
+            counts = self.wc_manager.iter_attribute_term_counts(attribute_ids)
+            try:
+                for attr_id, count in counts:
+                    if generation != self.counts_generation:
+                        # Список уже перезагружен - эти результаты не нужны
+                        break
+                    self.window.after(0, lambda a=attr_id, c=count: self.set_terms_count(a, c, generation))
+            except tk.TclError:
+                # Окно закрыто
+                pass
+            finally:
+                counts.close()
+        
+        threading.Thread(target=prioritized(BACKGROUND, counts_thread), daemon=True).start()
+    
+    def set_terms_count(self, attr_id: int, count: Optional[int], generation: Optional[int] = None):
+        """Отображение количества терминов атрибута"""
+        if generation is not None and generation != self.counts_generation:
+            return
+        if not self.attributes_tree.exists(str(attr_id)):
+            return
+        self.attributes_tree.set(str(attr_id), "terms", f"{count} шт." if count is not None else "—")
     
     def on_attribute_select(self, event):
         """Обработка выбора атрибута из списка"""
@@ -313,13 +350,16 @@ class AttributesManagerDialog:
             except Exception as e:
                 self.window.after(0, lambda: messagebox.showerror("Ошибка", f"Не удалось загрузить термины:\n{e}"))
         
-        threading.Thread(target=load_terms_thread, daemon=True).start()
+        threading.Thread(target=prioritized(INTERACTIVE, load_terms_thread), daemon=True).start()
     
     def update_terms_list(self, terms):
         """Обновление списка терминов"""
         self.terms_listbox.delete(0, "end")
         for term in terms:
             self.terms_listbox.insert("end", f"{term['name']} (ID: {term['id']})")
+        
+        if self.selected_attribute:
+            self.set_terms_count(self.selected_attribute['id'], len(terms))
     
     def clear_editor(self):
         """Очистка редактора"""
@@ -369,7 +409,7 @@ class AttributesManagerDialog:
                 except Exception as e:
                     self.window.after(0, lambda: messagebox.showerror("Ошибка", f"Ошибка при удалении атрибута:\n{e}"))
             
-            threading.Thread(target=delete_thread, daemon=True).start()
+            threading.Thread(target=prioritized(INTERACTIVE, delete_thread), daemon=True).start()
     
     def save_attribute(self):
         """Сохранение атрибута"""
@@ -412,7 +452,7 @@ class AttributesManagerDialog:
             except Exception as e:
                 self.window.after(0, lambda: messagebox.showerror("Ошибка", f"Ошибка при сохранении атрибута:\n{e}"))
         
-        threading.Thread(target=save_thread, daemon=True).start()
+        threading.Thread(target=prioritized(INTERACTIVE, save_thread), daemon=True).start()
     
     def cancel_edit(self):
         """Отмена редактирования"""
@@ -447,7 +487,7 @@ class AttributesManagerDialog:
                 except Exception as e:
                     self.window.after(0, lambda: messagebox.showerror("Ошибка", f"Ошибка при добавлении значения:\n{e}"))
             
-            threading.Thread(target=add_term_thread, daemon=True).start()
+            threading.Thread(target=prioritized(INTERACTIVE, add_term_thread), daemon=True).start()
     
     def delete_term(self):
         """Удаление выбранного термина"""
@@ -482,7 +522,7 @@ class AttributesManagerDialog:
                 except Exception as e:
                     self.window.after(0, lambda: messagebox.showerror("Ошибка", f"Ошибка при удалении значения:\n{e}"))
             
-            threading.Thread(target=delete_term_thread, daemon=True).start()
+            threading.Thread(target=prioritized(INTERACTIVE, delete_term_thread), daemon=True).start()
     
     def close_dialog(self):
         """Закрытие диалога"""
@@ -0,0 +1,305 @@
+"""
+Замеры производительности WooCommerceManager на локальном имитаторе магазина
+
+Сценарии:
+    get_all_products        - загрузка всего каталога (полные данные)
+    get_all_products_list   - загрузка каталога только с полями таблицы
+    save_changes            - сохранение правок пакетами, как «Сохранить изменения»
+    csv_import_push         - импорт простого CSV (catalogue_generator) и отправка новых товаров на сайт
+    attributes              - атрибуты, количество значений и все значения
+    async_client            - AsyncWooCommerceManager: каталог, вариации, пакетное сохранение
+                              и прерванная постраничная загрузка (нужен aiohttp)
+
+Запуск:
+    python benchmark.py --sizes 1000 10000 --latency 0.02
+    python benchmark.py --sizes 1000 --compare benchmark_20240101_120000.json
+"""
+import os
+import sys
+import asyncio
+import json
+import time
+import random
+import logging
+import argparse
+import platform
+import tempfile
+from datetime import datetime
+from typing import List, Dict, Any, Callable
+
+from api_metrics import api_metrics
+from catalogue_generator import CatalogueGenerator
+from csv_manager import CSVManager
+from mock_woocommerce_server import MockWooCommerceServer
+from product_models import Product, ProductCategory
+from sync_planner import SyncPlanner
+from woocommerce_manager import WooCommerceManager
+
+logger = logging.getLogger(__name__)
+
+SCENARIOS = ("get_all_products", "get_all_products_list", "save_changes", "csv_import_push", "attributes",
+             "async_client")
+
+class BenchmarkRunner:
+    """Выполнение сценариев на имитаторе и сбор результатов"""
+    
+    def __init__(self, latency: float = 0.0, error_rate: float = 0.0, throttle_rate: float = 0.0,
+                 max_workers: int = 4, edit_ratio: float = 0.1, push_ratio: float = 0.1, seed: int = 0):
+        """
+        Args:
+            latency: Задержка ответа имитатора, сек
+            error_rate: Доля ответов 500
+            throttle_rate: Доля ответов 429
+            max_workers: Параллельных запросов (max_workers профиля)
+            edit_ratio: Доля товаров, изменяемых в сценарии save_changes
+            push_ratio: Доля от размера каталога, импортируемая в сценарии csv_import_push
+            seed: Начальное значение генераторов
+        """
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.max_workers = max_workers
+        self.edit_ratio = edit_ratio
+        self.push_ratio = push_ratio
+        self.seed = seed
+    
+    def settings(self) -> Dict[str, Any]:
+        """Параметры запуска для отчета"""
+        return {
+            "latency": self.latency,
+            "error_rate": self.error_rate,
+            "throttle_rate": self.throttle_rate,
+            "max_workers": self.max_workers,
+            "edit_ratio": self.edit_ratio,
+            "push_ratio": self.push_ratio,
+            "seed": self.seed
+        }
+    
+    def run(self, sizes: List[int], scenarios: List[str]) -> List[Dict[str, Any]]:
+        """
+        Выполнение сценариев для каждого размера каталога
+        
+        Returns:
+            List[Dict]: Результаты сценариев
+        """
+        results = []
+        for size in sizes:
+            server = MockWooCommerceServer(latency=self.latency, error_rate=self.error_rate,
+                                           throttle_rate=self.throttle_rate, seed=self.seed)
+            print(f"📦 Каталог {size} товаров: заполнение имитатора...")
+            server.populate(products=size, seed=self.seed)
+            
+            with server:
+                config = {
+                    "site_url": server.url,
+                    "consumer_key": "ck_benchmark",
+                    "consumer_secret": "cs_benchmark",
+                    "max_workers": self.max_workers,
+                    "rate_limit": 100000,
+                    "http_cache_mb": 0
+                }
+                manager = WooCommerceManager(config)
+                context: Dict[str, Any] = {"config": config}
+                for scenario in scenarios:
+                    result = self._measure(scenario, size, lambda: getattr(self, f"_scenario_{scenario}")(
+                        manager, server, size, context))
+                    results.append(result)
+                    print(f"   {scenario:<24} {result['seconds']:>9.2f} с  {result['items']:>8} объектов  "
+                          f"{result['requests']:>6} запросов")
+        return results
+    
+    def _measure(self, scenario: str, size: int, func: Callable[[], int]) -> Dict[str, Any]:
+        """Замер одного сценария вместе с метриками API"""
+        api_metrics.reset()
+        started = time.perf_counter()
+        items = func()
+        seconds = time.perf_counter() - started
+        totals = api_metrics.snapshot()["totals"]
+        return {
+            "scenario": scenario,
+            "size": size,
+            "seconds": round(seconds, 4),
+            "items": items,
+            "items_per_second": round(items / seconds, 1) if seconds > 0 else None,
+            "requests": totals["requests"],
+            "errors": totals["errors"],
+            "retries": totals["retries"],
+            "request_bytes": totals["request_bytes"],
+            "response_bytes": totals["response_bytes"]
+        }
+    
+    def _scenario_get_all_products(self, manager, server, size, context) -> int:
+        products = manager.get_all_products()
+        context["products"] = [Product.from_woocommerce_dict(data) for data in products]
+        return len(products)
+    
+    def _scenario_get_all_products_list(self, manager, server, size, context) -> int:
+        return len(manager.get_all_products(fields=Product.LIST_FIELDS))
+    
+    def _scenario_save_changes(self, manager, server, size, context) -> int:
+        products = context.get("products")
+        if products is None:
+            products = [Product.from_woocommerce_dict(data) for data in manager.get_all_products()]
+        
+        rng = random.Random(self.seed)
+        edited = rng.sample(products, max(1, int(len(products) * self.edit_ratio)))
+        for product in edited:
+            product.regular_price = f"{rng.randint(100, 99999) / 100:.2f}"
+            product.stock_quantity = rng.randint(0, 500)
+            product.mark_as_modified()
+        
+        # Несколько удалений и новых товаров, как при обычной работе в таблице
+        for product in edited[:max(1, len(edited) // 20)]:
+            product.mark_as_deleted()
+        for index in range(max(1, len(edited) // 20)):
+            new_product = Product(name=f"Новый товар {index + 1}", sku=f"BENCH-NEW-{index + 1:07d}",
+                                  regular_price="100.00")
+            new_product.mark_as_new()
+            products.append(new_product)
+        
+        planner = SyncPlanner(manager)
+        plan = planner.plan(products)
+        result = planner.execute(plan)
+        if result.failed:
+            logger.warning(f"save_changes: ошибок {len(result.failed)}")
+        return plan.total()
+    
+    def _scenario_csv_import_push(self, manager, server, size, context) -> int:
+        count = max(1, int(size * self.push_ratio))
+        # Простой CSV не переносит вариации, поэтому импортируются только простые товары
+        categories = [ProductCategory(id=item["id"], name=item["name"]) for item in manager.get_categories()]
+        generator = CatalogueGenerator(seed=self.seed, variable_ratio=0, sku_prefix="BENCH-CSV", with_ids=False,
+                                       categories=categories)
+        
+        with tempfile.TemporaryDirectory() as directory:
+            filename = os.path.join(directory, "import.csv")
+            generator.export(count, filename)
+            products = CSVManager().import_products_from_csv(filename)
+        
+        for product in products:
+            product.mark_as_new()
+        planner = SyncPlanner(manager)
+        result = planner.execute(planner.plan(products))
+        if result.failed:
+            logger.warning(f"csv_import_push: ошибок {len(result.failed)}")
+        return len(result.created)
+    
+    def _scenario_attributes(self, manager, server, size, context) -> int:
+        manager.taxonomy_cache.invalidate()
+        attributes = manager.get_attributes(refresh=True)
+        attribute_ids = [attribute["id"] for attribute in attributes]
+        dict(manager.iter_attribute_term_counts(attribute_ids))
+        
+        terms = 0
+        for attribute_id in attribute_ids:
+            terms += len(manager.get_attribute_terms(attribute_id, refresh=True))
+        return len(attributes) + terms
+    
+    def _scenario_async_client(self, manager, server, size, context) -> int:
+        import async_woocommerce_manager
+        from async_woocommerce_manager import AsyncWooCommerceManager
+        
+        if async_woocommerce_manager.aiohttp is None:
+            logger.warning("async_client пропущен: не установлен пакет aiohttp")
+            return 0
+        
+        async def run():
+            async with AsyncWooCommerceManager(context["config"]) as client:
+                products = await client.get_all_products()
+                if len(products) != len(server.products):
+                    raise RuntimeError(f"async_client: загружено {len(products)} из {len(server.products)} товаров")
+                
+                parent_ids = [product["id"] for product in products if product["type"] == "variable"]
+                variations = await client.get_variations_for_products(parent_ids)
+                if len(variations) != len(parent_ids):
+                    raise RuntimeError(f"async_client: вариации загружены для {len(variations)} из {len(parent_ids)}")
+                
+                rng = random.Random(self.seed)
+                edited = rng.sample(products, max(1, int(len(products) * self.edit_ratio)))
+                summary = await client.batch_products(
+                    create=[{"name": f"Async товар {index + 1}", "sku": f"BENCH-ASYNC-{index + 1:07d}",
+                             "regular_price": "100.00"} for index in range(max(1, len(edited) // 20))],
+                    update=[{"id": product["id"], "regular_price": f"{rng.randint(100, 99999) / 100:.2f}"}
+                            for product in edited[1:]],
+                    delete=[edited[0]["id"]]
+                )
+                failed = sum(len(result["errors"]) for result in summary.values())
+                if failed:
+                    logger.warning(f"async_client: ошибок пакетных операций {failed}")
+                
+                # Прерванная загрузка: оставшиеся запросы страниц отменяются и дожидаются завершения
+                pages = client.iter_product_pages()
+                loaded_pages = 0
+                async for _ in pages:
+                    loaded_pages += 1
+                    if loaded_pages == 2:
+                        # Со второй страницы работает окно одновременных запросов
+                        break
+                await pages.aclose()
+                pending = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+                if pending:
+                    raise RuntimeError(f"async_client: после прерванной загрузки осталось {len(pending)} задач")
+                
+                return (len(products) + sum(len(items) for items in variations.values())
+                        + sum(len(result["items"]) for result in summary.values()))
+        
+        return asyncio.run(run())
+
+def compare_reports(current: Dict[str, Any], previous: Dict[str, Any]):
+    """Вывод изменения времени сценариев относительно предыдущего отчета"""
+    previous_results = {(item["scenario"], item["size"]): item for item in previous.get("results", [])}
+    
+    print(f"\n📊 Сравнение с отчетом от {previous.get('created_at', '?')}:")
+    for item in current["results"]:
+        before = previous_results.get((item["scenario"], item["size"]))
+        if not before or not before["seconds"]:
+            print(f"   {item['scenario']:<24} {item['size']:>7}   нет данных для сравнения")
+            continue
+        change = (item["seconds"] - before["seconds"]) / before["seconds"] * 100
+        marker = "⚡" if change < -5 else ("🐢" if change > 5 else "  ")
+        print(f"   {item['scenario']:<24} {item['size']:>7}   {before['seconds']:>9.2f} с -> "
+              f"{item['seconds']:>9.2f} с  {change:+6.1f}% {marker}")
+
+def main():
+    """Запуск замеров из командной строки"""
+    parser = argparse.ArgumentParser(description="Замеры производительности на имитаторе WooCommerce")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000], help="Размеры каталога")
+    parser.add_argument("--scenarios", nargs="+", choices=SCENARIOS, default=list(SCENARIOS), help="Сценарии")
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответа имитатора, сек")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Доля ответов 429")
+    parser.add_argument("--max-workers", type=int, default=4, help="Параллельных запросов")
+    parser.add_argument("--edit-ratio", type=float, default=0.1, help="Доля изменяемых товаров (save_changes)")
+    parser.add_argument("--push-ratio", type=float, default=0.1, help="Доля каталога для csv_import_push")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генераторов")
+    parser.add_argument("--output", help="Файл отчета JSON (по умолчанию benchmark_<дата>.json)")
+    parser.add_argument("--compare", help="Предыдущий отчет для сравнения")
+    parser.add_argument("--verbose", action="store_true", help="Подробный журнал")
+    args = parser.parse_args()
+    
+    # woocommerce_manager настраивает журнал при импорте, поэтому уровень задается явно
+    logging.getLogger().setLevel(logging.INFO if args.verbose else logging.WARNING)
+    
+    runner = BenchmarkRunner(latency=args.latency, error_rate=args.error_rate, throttle_rate=args.throttle_rate,
+                             max_workers=args.max_workers, edit_ratio=args.edit_ratio,
+                             push_ratio=args.push_ratio, seed=args.seed)
+    results = runner.run(args.sizes, args.scenarios)
+    
+    report = {
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": sys.version.split()[0],
+        "platform": platform.platform(),
+        "settings": runner.settings(),
+        "results": results
+    }
+    output = args.output or f"benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 Отчет сохранен: {output}")
+    
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            compare_reports(report, json.load(f))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+"""
+Генератор синтетических каталогов для проверки работы на больших объемах
+Создает правдоподобные товары (вариации, атрибуты, мета-поля, длинные HTML-описания,
+списки изображений) и сохраняет их в простом CSV или в CSV WooCommerce.
+Результат полностью определяется seed: товар с данным номером одинаков при любом размере каталога.
+
+Запуск:
+    python catalogue_generator.py 10000 catalogue.csv
+    python catalogue_generator.py 100000 catalogue_wc.csv --format woocommerce --variable-ratio 0.3 --seed 7
+"""
+import random
+import logging
+import argparse
+import itertools
+from typing import List, Dict, Any, Iterator, Optional, Tuple
+
+from csv_manager import CSVManager
+from product_models import Product, ProductCategory, ProductImage, ProductAttribute, ProductVariation
+from woocommerce_csv_manager import WooCommerceCSVManager
+
+logger = logging.getLogger(__name__)
+
+# Запятые и | в названиях недопустимы: в CSV WooCommerce это разделители значений
+ATTRIBUTE_VALUES = {
+    "Цвет": ["Белый", "Черный", "Красный", "Синий", "Зеленый", "Серый", "Бежевый", "Коричневый",
+             "Желтый", "Розовый", "Фиолетовый", "Оранжевый"],
+    "Размер": ["XS", "S", "M", "L", "XL", "XXL", "3XL"],
+    "Материал": ["Хлопок", "Лен", "Шерсть", "Полиэстер", "Кожа", "Замша", "Вискоза", "Шелк"],
+    "Объем": ["250 мл", "500 мл", "750 мл", "1 л", "1.5 л", "2 л"],
+    "Вес": ["100 г", "250 г", "500 г", "1 кг", "2 кг", "5 кг"],
+    "Страна производства": ["Россия", "Беларусь", "Китай", "Турция", "Италия", "Германия"],
+    "Сезон": ["Зима", "Весна", "Лето", "Осень", "Всесезонный"],
+    "Пол": ["Мужской", "Женский", "Унисекс", "Детский"]
+}
+
+# Остальные атрибуты до предела в 21 слот CSV WooCommerce
+EXTRA_ATTRIBUTES = [
+    "Бренд", "Коллекция", "Форма", "Покрытие", "Тип застежки", "Стиль", "Назначение",
+    "Гарантия", "Комплектация", "Узор", "Утеплитель", "Длина рукава", "Посадка"
+]
+
+CATEGORY_NAMES = [
+    "Одежда", "Обувь", "Аксессуары", "Дом и сад", "Кухня", "Электроника", "Спорт",
+    "Детские товары", "Косметика", "Книги", "Игрушки", "Инструменты", "Зоотовары",
+    "Продукты", "Подарки", "Мебель", "Текстиль", "Посуда", "Освещение", "Канцтовары"
+]
+
+WORDS = (
+    "качественный удобный прочный легкий современный классический практичный надежный "
+    "стильный универсальный материал модель изделие товар дизайн размер цвет упаковка "
+    "комплект основа поверхность отделка деталь конструкция использование уход хранение "
+    "подходит отлично ежедневного долгого служит сохраняет форму выполнен подчеркивает "
+    "натуральный мягкий плотный приятный износостойкий функциональный компактный"
+).split()
+
+PRODUCT_NOUNS = ["Футболка", "Кружка", "Рюкзак", "Лампа", "Куртка", "Чайник", "Плед", "Кроссовки",
+                 "Ваза", "Сумка", "Свитер", "Подушка", "Часы", "Кошелек", "Шарф", "Термос"]
+
+# Мета-поля, которые переносит CSV WooCommerce (WooCommerceCSVManager.meta_fields)
+META_KEYS = [
+    "_yoast_wpseo_title", "_yoast_wpseo_metadesc", "_yoast_wpseo_focuskw", "_yoast_wpseo_linkdex",
+    "_yoast_wpseo_content_score", "_yoast_wpseo_estimated-reading-time-minutes", "_yoast_wpseo_bctitle",
+    "_yfym_barcode", "_yfym_condition", "_yfym_quality", "_yfym_individual_vat", "_yfym_cargo_types"
+]
+
+MAX_ATTRIBUTES = 21
+
+class CatalogueGenerator:
+    """Воспроизводимый генератор каталога товаров"""
+    
+    def __init__(self, seed: int = 0, variable_ratio: float = 0.2, max_attributes: int = MAX_ATTRIBUTES,
+                 full_attributes_ratio: float = 0.02, variations_range: Tuple[int, int] = (2, 24),
+                 images_range: Tuple[int, int] = (0, 10), paragraphs_range: Tuple[int, int] = (2, 25),
+                 meta_ratio: float = 0.7, sku_prefix: str = "GEN", with_ids: bool = True,
+                 image_base_url: str = "https://example.com/wp-content/uploads",
+                 categories: Optional[List[ProductCategory]] = None):
+        """
+        Args:
+            seed: Начальное значение генератора
+            variable_ratio: Доля вариативных товаров
+            max_attributes: Максимум атрибутов у товара (не больше 21 слота CSV WooCommerce)
+            full_attributes_ratio: Доля товаров, занимающих все max_attributes слотов
+            variations_range: Минимум и максимум вариаций вариативного товара
+            images_range: Минимум и максимум изображений товара
+            paragraphs_range: Минимум и максимум абзацев HTML-описания
+            meta_ratio: Доля товаров с мета-полями
+            sku_prefix: Префикс артикулов
+            with_ids: Присваивать ID (как в выгрузке с сайта); без ID вариации не связываются при импорте CSV WooCommerce
+            image_base_url: Адрес каталога изображений
+            categories: Категории сайта для товаров (по умолчанию - встроенный список)
+        """
+        self.seed = seed
+        self.variable_ratio = variable_ratio
+        self.max_attributes = max(0, min(max_attributes, MAX_ATTRIBUTES))
+        self.full_attributes_ratio = full_attributes_ratio
+        self.variations_range = variations_range
+        self.images_range = images_range
+        self.paragraphs_range = paragraphs_range
+        self.meta_ratio = meta_ratio
+        self.sku_prefix = sku_prefix
+        self.with_ids = with_ids
+        self.image_base_url = image_base_url.rstrip("/")
+        
+        rng = random.Random(f"{seed}-catalogue")
+        self.categories = categories or [
+            ProductCategory(id=100 + index, name=name) for index, name in enumerate(CATEGORY_NAMES)
+        ]
+        self.attributes: List[Tuple[int, str, List[str]]] = []
+        for index, name in enumerate(list(ATTRIBUTE_VALUES) + EXTRA_ATTRIBUTES):
+            values = ATTRIBUTE_VALUES.get(name) or [f"{name} {number}" for number in range(1, rng.randint(4, 15))]
+            self.attributes.append((index + 1, name, values))
+    
+    def iter_products(self, count: int, start: int = 0) -> Iterator[Product]:
+        """
+        Генерация товаров по одному (каталог не хранится в памяти)
+        
+        Args:
+            count: Количество товаров
+            start: Номер первого товара
+        
+        Yields:
+            Product: Очередной товар
+        """
+        for index in range(start, start + count):
+            yield self.product(index)
+    
+    def generate(self, count: int) -> List[Product]:
+        """Список из count товаров"""
+        return list(self.iter_products(count))
+    
+    def product(self, index: int) -> Product:
+        """
+        Товар с данным номером
+        
+        Args:
+            index: Номер товара
+        
+        Returns:
+            Product: Один и тот же товар для одинаковых seed и номера
+        """
+        rng = random.Random(f"{self.seed}-{index}")
+        variable = rng.random() < self.variable_ratio
+        noun = rng.choice(PRODUCT_NOUNS)
+        name = f"{noun} {rng.choice(WORDS)} {index + 1}"
+        sku = f"{self.sku_prefix}-{index + 1:07d}"
+        
+        price = rng.randint(100, 50000)
+        manage_stock = rng.random() < 0.7
+        product = Product(
+            name=name,
+            type="variable" if variable else "simple",
+            sku=sku,
+            regular_price="" if variable else str(price),
+            sale_price=str(int(price * rng.uniform(0.6, 0.95))) if not variable and rng.random() < 0.2 else "",
+            description=self._html_description(rng, noun),
+            short_description=f"<p>{self._sentence(rng, 8, 25)}</p>",
+            manage_stock=manage_stock,
+            stock_quantity=rng.randint(0, 500) if manage_stock else None,
+            stock_status=rng.choices(["instock", "outofstock", "onbackorder"], weights=[85, 12, 3])[0],
+            weight=str(rng.randint(50, 20000)),
+            dimensions={key: str(rng.randint(10, 2000)) for key in ("length", "width", "height")},
+            categories=rng.sample(self.categories, rng.randint(1, min(3, len(self.categories)))),
+            images=self._images(rng, sku),
+            attributes=self._product_attributes(rng, variable),
+            meta_data=self._meta_data(rng, name, sku) if rng.random() < self.meta_ratio else [],
+            status="publish" if rng.random() < 0.9 else "draft",
+            featured=rng.random() < 0.05,
+            id=10000 + index if self.with_ids else None
+        )
+        
+        if variable:
+            product.variations = self._variations(rng, product, price)
+        return product
+    
+    def export(self, count: int, filename: str, csv_format: str = "simple") -> bool:
+        """
+        Сохранение каталога в CSV
+        
+        Args:
+            count: Количество товаров
+            filename: Имя файла
+            csv_format: 'simple' (CSVManager) или 'woocommerce' (WooCommerceCSVManager)
+        
+        Returns:
+            bool: True если файл сохранен
+        """
+        if csv_format == "woocommerce":
+            return WooCommerceCSVManager().export_to_woocommerce_csv(self.iter_products(count), filename)
+        return CSVManager().export_products_to_csv(self.iter_products(count), filename)
+    
+    def _sentence(self, rng: random.Random, min_words: int, max_words: int) -> str:
+        """Предложение из случайных слов"""
+        words = [rng.choice(WORDS) for _ in range(rng.randint(min_words, max_words))]
+        return " ".join(words).capitalize() + "."
+    
+    def _html_description(self, rng: random.Random, noun: str) -> str:
+        """Длинное HTML-описание с заголовками, списками и таблицей характеристик"""
+        parts = [f"<h2>{noun}</h2>"]
+        for number in range(rng.randint(*self.paragraphs_range)):
+            parts.append("<p>" + " ".join(self._sentence(rng, 6, 20) for _ in range(rng.randint(2, 6))) + "</p>")
+            if number % 5 == 2:
+                items = "".join(f"<li>{self._sentence(rng, 3, 8)}</li>" for _ in range(rng.randint(3, 8)))
+                parts.append(f"<ul>{items}</ul>")
+        
+        if rng.random() < 0.5:
+            rows = "".join(
+                f"<tr><td>{name}</td><td>{rng.choice(values)}</td></tr>"
+                for _, name, values in rng.sample(self.attributes, rng.randint(3, 8))
+            )
+            parts.append(f"<h3>Характеристики</h3><table>{rows}</table>")
+        return "\n".join(parts)
+    
+    def _images(self, rng: random.Random, sku: str) -> List[ProductImage]:
+        """Список изображений товара"""
+        return [
+            ProductImage(src=f"{self.image_base_url}/{2020 + rng.randint(0, 5)}/{rng.randint(1, 12):02d}/"
+                             f"{sku.lower()}-{number + 1}.jpg",
+                         name=f"{sku}-{number + 1}", alt=sku)
+            for number in range(rng.randint(*self.images_range))
+        ]
+    
+    def _product_attributes(self, rng: random.Random, variable: bool) -> List[ProductAttribute]:
+        """Атрибуты товара: у большинства несколько, у части заняты все слоты"""
+        if rng.random() < self.full_attributes_ratio:
+            count = self.max_attributes
+        else:
+            count = min(self.max_attributes, int(rng.expovariate(1 / 3)))
+        if variable:
+            count = max(count, min(2, self.max_attributes))
+        
+        attributes = []
+        for position, (attribute_id, name, values) in enumerate(rng.sample(self.attributes, count)):
+            # Первые два атрибута вариативного товара используются для вариаций
+            used_for_variations = variable and position < 2
+            options = rng.sample(values, rng.randint(2 if used_for_variations else 1, min(len(values), 5)))
+            attributes.append(ProductAttribute(id=attribute_id, name=name, options=options,
+                                               visible=rng.random() < 0.9, variation=used_for_variations))
+        return attributes
+    
+    def _variations(self, rng: random.Random, product: Product, price: int) -> List[ProductVariation]:
+        """Вариации по сочетаниям значений вариационных атрибутов"""
+        attributes = [attribute for attribute in product.attributes if attribute.variation]
+        combinations = list(itertools.product(*(attribute.options for attribute in attributes)))
+        rng.shuffle(combinations)
+        count = min(len(combinations), rng.randint(*self.variations_range))
+        
+        variations = []
+        for number, combination in enumerate(combinations[:count], 1):
+            variation_price = int(price * rng.uniform(0.8, 1.3))
+            variations.append(ProductVariation(
+                regular_price=str(variation_price),
+                sale_price=str(int(variation_price * 0.9)) if rng.random() < 0.15 else "",
+                sku=f"{product.sku}-{number}",
+                stock_quantity=rng.randint(0, 100),
+                attributes=[
+                    {"id": attribute.id, "name": attribute.name, "option": option}
+                    for attribute, option in zip(attributes, combination)
+                ],
+                image=rng.choice(product.images) if product.images and rng.random() < 0.5 else None
+            ))
+        return variations
+    
+    def _meta_data(self, rng: random.Random, name: str, sku: str) -> List[Dict[str, Any]]:
+        """SEO и служебные мета-поля"""
+        values = {
+            "_yoast_wpseo_title": f"{name} - купить недорого",
+            "_yoast_wpseo_metadesc": self._sentence(rng, 15, 30),
+            "_yoast_wpseo_focuskw": name.split()[0].lower(),
+            "_yoast_wpseo_linkdex": str(rng.randint(0, 100)),
+            "_yoast_wpseo_content_score": str(rng.randint(0, 100)),
+            "_yoast_wpseo_estimated-reading-time-minutes": str(rng.randint(1, 10)),
+            "_yoast_wpseo_bctitle": name,
+            "_yfym_barcode": str(rng.randint(10 ** 12, 10 ** 13 - 1)),
+            "_yfym_condition": rng.choice(["new", "used", "refurbished"]),
+            "_yfym_quality": rng.choice(["perfect", "excellent", "good"]),
+            "_yfym_individual_vat": rng.choice(["global", "VAT_20", "VAT_10"]),
+            "_yfym_cargo_types": rng.choice(["default", "CIS_REQUIRED"])
+        }
+        return [{"key": key, "value": values[key]} for key in rng.sample(META_KEYS, rng.randint(2, len(META_KEYS)))]
+
+def main():
+    """Создание CSV-файла каталога из командной строки"""
+    parser = argparse.ArgumentParser(description="Генерация синтетического каталога товаров в CSV")
+    parser.add_argument("count", type=int, help="Количество товаров")
+    parser.add_argument("output", help="Имя CSV-файла")
+    parser.add_argument("--format", choices=("simple", "woocommerce"), default="simple", help="Формат CSV")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора")
+    parser.add_argument("--variable-ratio", type=float, default=0.2, help="Доля вариативных товаров")
+    parser.add_argument("--max-attributes", type=int, default=MAX_ATTRIBUTES, help="Максимум атрибутов у товара")
+    parser.add_argument("--sku-prefix", default="GEN", help="Префикс артикулов")
+    parser.add_argument("--no-ids", action="store_true", help="Не присваивать ID (товары как новые)")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    
+    generator = CatalogueGenerator(seed=args.seed, variable_ratio=args.variable_ratio,
+                                   max_attributes=args.max_attributes, sku_prefix=args.sku_prefix,
+                                   with_ids=not args.no_ids)
+    if generator.export(args.count, args.output, args.format):
+        print(f"✅ Каталог из {args.count} товаров сохранен в {args.output}")
+    else:
+        print(f"❌ Не удалось сохранить каталог в {args.output}")
+
+if __name__ == "__main__":
+    main()
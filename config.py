@@ -15,7 +15,11 @@ class ConnectionProfile:
     
     def __init__(self, name: str = "", site_url: str = "", consumer_key: str = "", 
                  consumer_secret: str = "", api_version: str = "wc/v3", 
-                 timeout: int = 30, products_per_page: int = 100):
+                 timeout: int = 30, products_per_page: int = 100,
+                 max_workers: int = 4, batch_size: int = 100,
+                 max_retries: int = 3, retry_backoff: float = 0.5,
+                 rate_limit: float = 20.0, taxonomy_ttl: int = 600,
+                 http_cache_mb: int = 50):
         self.name = name
         self.site_url = site_url.rstrip('/') if site_url else ""
         self.consumer_key = consumer_key
@@ -23,6 +27,13 @@ class ConnectionProfile:
         self.api_version = api_version
         self.timeout = timeout
         self.products_per_page = products_per_page
+        self.max_workers = max_workers
+        self.batch_size = batch_size
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.rate_limit = rate_limit
+        self.taxonomy_ttl = taxonomy_ttl
+        self.http_cache_mb = http_cache_mb
         self.created_at = datetime.now().isoformat()
         self.last_used = None
     
@@ -36,6 +47,13 @@ class ConnectionProfile:
             "api_version": self.api_version,
             "timeout": self.timeout,
             "products_per_page": self.products_per_page,
+            "max_workers": self.max_workers,
+            "batch_size": self.batch_size,
+            "max_retries": self.max_retries,
+            "retry_backoff": self.retry_backoff,
+            "rate_limit": self.rate_limit,
+            "taxonomy_ttl": self.taxonomy_ttl,
+            "http_cache_mb": self.http_cache_mb,
             "created_at": self.created_at,
             "last_used": self.last_used
         }
@@ -50,7 +68,14 @@ class ConnectionProfile:
             consumer_secret=data.get("consumer_secret", ""),
             api_version=data.get("api_version", "wc/v3"),
             timeout=data.get("timeout", 30),
-            products_per_page=data.get("products_per_page", 100)
+            products_per_page=data.get("products_per_page", 100),
+            max_workers=data.get("max_workers", 4),
+            batch_size=data.get("batch_size", 100),
+            max_retries=data.get("max_retries", 3),
+            retry_backoff=data.get("retry_backoff", 0.5),
+            rate_limit=data.get("rate_limit", 20.0),
+            taxonomy_ttl=data.get("taxonomy_ttl", 600),
+            http_cache_mb=data.get("http_cache_mb", 50)
         )
         profile.created_at = data.get("created_at", datetime.now().isoformat())
         profile.last_used = data.get("last_used")
@@ -190,13 +215,29 @@ class WooCommerceConfig:
         if not self.current_profile:
             return {}
         
+        return self._profile_config(self.current_profile)
+    
+    def get_profile_config(self, name: str) -> Dict[str, Any]:
+        """Получение конфигурации профиля по имени (например, для отправки в несколько магазинов)"""
+        profile = self.profiles.get(name)
+        return self._profile_config(profile) if profile else {}
+    
+    def _profile_config(self, profile: ConnectionProfile) -> Dict[str, Any]:
+        """Настройки подключения профиля в формате WooCommerceManager"""
         return {
-            "site_url": self.current_profile.site_url,
-            "consumer_key": self.current_profile.consumer_key,
-            "consumer_secret": self.current_profile.consumer_secret,
-            "api_version": self.current_profile.api_version,
-            "timeout": self.current_profile.timeout,
-            "products_per_page": self.current_profile.products_per_page
+            "site_url": profile.site_url,
+            "consumer_key": profile.consumer_key,
+            "consumer_secret": profile.consumer_secret,
+            "api_version": profile.api_version,
+            "timeout": profile.timeout,
+            "products_per_page": profile.products_per_page,
+            "max_workers": profile.max_workers,
+            "batch_size": profile.batch_size,
+            "max_retries": profile.max_retries,
+            "retry_backoff": profile.retry_backoff,
+            "rate_limit": profile.rate_limit,
+            "taxonomy_ttl": profile.taxonomy_ttl,
+            "http_cache_mb": profile.http_cache_mb
         }
     
     def create_quick_profile(self, site_url: str, consumer_key: str, consumer_secret: str) -> ConnectionProfile:
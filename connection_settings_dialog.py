@@ -247,6 +247,48 @@ class ConnectionSettingsDialog:
         self.per_page_entry.pack(anchor="w", padx=10, pady=5, fill="x")
         self.per_page_entry.insert(0, "100")
         
+        # Параллельные запросы
+        ctk.CTkLabel(settings_frame, text="Параллельных запросов:", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=(10, 0))
+        self.max_workers_entry = ctk.CTkEntry(settings_frame, placeholder_text="4")
+        self.max_workers_entry.pack(anchor="w", padx=10, pady=5, fill="x")
+        self.max_workers_entry.insert(0, "4")
+        
+        # Размер пакета
+        ctk.CTkLabel(settings_frame, text="Операций в пакетном запросе (до 100):", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=(10, 0))
+        self.batch_size_entry = ctk.CTkEntry(settings_frame, placeholder_text="100")
+        self.batch_size_entry.pack(anchor="w", padx=10, pady=5, fill="x")
+        self.batch_size_entry.insert(0, "100")
+        
+        # Повторы запросов
+        ctk.CTkLabel(settings_frame, text="Повторов при сбое запроса:", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=(10, 0))
+        self.max_retries_entry = ctk.CTkEntry(settings_frame, placeholder_text="3")
+        self.max_retries_entry.pack(anchor="w", padx=10, pady=5, fill="x")
+        self.max_retries_entry.insert(0, "3")
+        
+        # Пауза между повторами
+        ctk.CTkLabel(settings_frame, text="Начальная пауза между повторами (секунды):", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=(10, 0))
+        self.retry_backoff_entry = ctk.CTkEntry(settings_frame, placeholder_text="0.5")
+        self.retry_backoff_entry.pack(anchor="w", padx=10, pady=5, fill="x")
+        self.retry_backoff_entry.insert(0, "0.5")
+        
+        # Ограничение частоты запросов
+        ctk.CTkLabel(settings_frame, text="Максимум запросов в секунду:", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=(10, 0))
+        self.rate_limit_entry = ctk.CTkEntry(settings_frame, placeholder_text="20")
+        self.rate_limit_entry.pack(anchor="w", padx=10, pady=5, fill="x")
+        self.rate_limit_entry.insert(0, "20")
+        
+        # Время жизни кэша категорий и атрибутов
+        ctk.CTkLabel(settings_frame, text="Кэш категорий и атрибутов (сек):", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=(10, 0))
+        self.taxonomy_ttl_entry = ctk.CTkEntry(settings_frame, placeholder_text="600")
+        self.taxonomy_ttl_entry.pack(anchor="w", padx=10, pady=5, fill="x")
+        self.taxonomy_ttl_entry.insert(0, "600")
+        
+        # Размер HTTP-кэша условных запросов
+        ctk.CTkLabel(settings_frame, text="HTTP-кэш ответов (МБ, 0 - отключен):", font=ctk.CTkFont(weight="bold")).pack(anchor="w", padx=10, pady=(10, 0))
+        self.http_cache_entry = ctk.CTkEntry(settings_frame, placeholder_text="50")
+        self.http_cache_entry.pack(anchor="w", padx=10, pady=5, fill="x")
+        self.http_cache_entry.insert(0, "50")
+        
         # Дополнительные опции
         options_frame = ctk.CTkFrame(settings_frame)
         options_frame.pack(fill="x", padx=10, pady=20)
@@ -424,7 +466,14 @@ class ConnectionSettingsDialog:
             consumer_secret=secret,
             api_version=self.api_version_menu.get(),
             timeout=int(self.timeout_entry.get() or 30),
-            products_per_page=int(self.per_page_entry.get() or 100)
+            products_per_page=int(self.per_page_entry.get() or 100),
+            max_workers=int(self.max_workers_entry.get() or 4),
+            batch_size=int(self.batch_size_entry.get() or 100),
+            max_retries=int(self.max_retries_entry.get() or 3),
+            retry_backoff=float(self.retry_backoff_entry.get() or 0.5),
+            rate_limit=float(self.rate_limit_entry.get() or 20),
+            taxonomy_ttl=int(self.taxonomy_ttl_entry.get() or 600),
+            http_cache_mb=int(self.http_cache_entry.get() or 50)
         )
         
         if config_manager.add_profile(profile):
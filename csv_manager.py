@@ -4,7 +4,7 @@
 """
 import pandas as pd
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Iterable
 from product_models import Product, ProductCategory, ProductImage, ProductAttribute
 import json
 
@@ -13,6 +13,9 @@ logger = logging.getLogger(__name__)
 class CSVManager:
     """Класс для работы с CSV файлами"""
     
+    # Количество строк, записываемых в файл за один раз при экспорте
+    EXPORT_CHUNK_SIZE = 1000
+    
     def __init__(self):
         """Инициализация менеджера CSV"""
         self.required_columns = [
@@ -26,78 +29,99 @@ class CSVManager:
             'virtual', 'downloadable'
         ]
     
-    def export_products_to_csv(self, products: List[Product], filename: str) -> bool:
+    def export_products_to_csv(self, products: Iterable[Product], filename: str) -> bool:
         """
         Экспорт товаров в CSV файл
         
+        Товары записываются блоками по EXPORT_CHUNK_SIZE строк, поэтому можно
+        передавать генератор (например, поверх WooCommerceManager.iter_products())
+        и не держать весь каталог в памяти.
+        
         Args:
-            products: Список товаров
+            products: Список или итератор товаров
             filename: Имя файла для сохранения
             
         Returns:
             bool: True если экспорт успешен
         """
         try:
-            # Преобразуем товары в DataFrame
-            data = []
-            for product in products:
-                row = {
-                    'id': product.id,
-                    'name': product.name,
-                    'type': product.type,
-                    'sku': product.sku,
-                    'regular_price': product.regular_price,
-                    'sale_price': product.sale_price,
-                    'description': product.description,
-                    'short_description': product.short_description,
-                    'stock_quantity': product.stock_quantity,
-                    'manage_stock': product.manage_stock,
-                    'stock_status': product.stock_status,
-                    'weight': product.weight,
-                    'status': product.status,
-                    'featured': product.featured,
-                    'virtual': product.virtual,
-                    'downloadable': product.downloadable,
-                    'date_created': product.date_created,
-                    'date_modified': product.date_modified
-                }
-                
-                # Преобразуем сложные поля в JSON строки
-                row['categories'] = json.dumps([
-                    {'id': cat.id, 'name': cat.name} for cat in product.categories
-                ], ensure_ascii=False)
-                
-                row['images'] = json.dumps([
-                    {'src': img.src, 'name': img.name, 'alt': img.alt} 
-                    for img in product.images
-                ], ensure_ascii=False)
-                
-                row['attributes'] = json.dumps([
-                    {
-                        'id': attr.id,
-                        'name': attr.name,
-                        'options': attr.options,
-                        'visible': attr.visible,
-                        'variation': attr.variation
-                    } for attr in product.attributes
-                ], ensure_ascii=False)
-                
-                row['meta_data'] = json.dumps(product.meta_data, ensure_ascii=False)
-                row['dimensions'] = json.dumps(product.dimensions, ensure_ascii=False)
-                
-                data.append(row)
+            exported_count = 0
+            columns = None
+            chunk = []
             
-            # Создаем DataFrame и сохраняем в CSV
-            df = pd.DataFrame(data)
-            df.to_csv(filename, index=False, encoding='utf-8-sig')
+            with open(filename, 'w', encoding='utf-8-sig', newline='') as csv_file:
+                for product in products:
+                    row = self._product_to_row(product)
+                    if columns is None:
+                        columns = list(row.keys())
+                    chunk.append(row)
+                    
+                    if len(chunk) >= self.EXPORT_CHUNK_SIZE:
+                        pd.DataFrame(chunk, columns=columns).to_csv(
+                            csv_file, index=False, header=exported_count == 0)
+                        exported_count += len(chunk)
+                        chunk = []
+                
+                if chunk:
+                    pd.DataFrame(chunk, columns=columns).to_csv(
+                        csv_file, index=False, header=exported_count == 0)
+                    exported_count += len(chunk)
             
-            logger.info(f"Экспорт завершен: {len(products)} товаров в файл {filename}")
+            logger.info(f"Экспорт завершен: {exported_count} товаров в файл {filename}")
             return True
             
         except Exception as e:
             logger.error(f"Ошибка экспорта в CSV: {e}")
             return False
     
+    def _product_to_row(self, product: Product) -> Dict[str, Any]:
+        """Преобразование товара в строку простого CSV"""
+        row = {
+            'id': product.id,
+            'name': product.name,
+            'type': product.type,
+            'sku': product.sku,
+            'regular_price': product.regular_price,
+            'sale_price': product.sale_price,
+            'description': product.description,
+            'short_description': product.short_description,
+            'stock_quantity': product.stock_quantity,
+            'manage_stock': product.manage_stock,
+            'stock_status': product.stock_status,
+            'weight': product.weight,
+            'status': product.status,
+            'featured': product.featured,
+            'virtual': product.virtual,
+            'downloadable': product.downloadable,
+            'date_created': product.date_created,
+            'date_modified': product.date_modified
+        }
+        
+        # Преобразуем сложные поля в JSON строки
+        row['categories'] = json.dumps([
+            {'id': cat.id, 'name': cat.name} for cat in product.categories
+        ], ensure_ascii=False)
+        
+        row['images'] = json.dumps([
+            {'src': img.src, 'name': img.name, 'alt': img.alt} 
+            for img in product.images
+        ], ensure_ascii=False)
+        
+        row['attributes'] = json.dumps([
+            {
+                'id': attr.id,
+                'name': attr.name,
+                'options': attr.options,
+                'visible': attr.visible,
+                'variation': attr.variation
+            } for attr in product.attributes
+        ], ensure_ascii=False)
+        
+        row['meta_data'] = json.dumps(product.meta_data, ensure_ascii=False)
+        row['dimensions'] = json.dumps(product.dimensions, ensure_ascii=False)
+        
+        return row
+    
     def detect_csv_format(self, filename: str) -> str:
         """
         Определение формата CSV файла
@@ -0,0 +1,232 @@
+"""
+HTTP-кэш ответов API с условными запросами (ETag / Last-Modified)
+Повторный GET отправляется с If-None-Match / If-Modified-Since, и ответ 304
+обслуживается из локальной копии без передачи тела
+"""
+import os
+import json
+import time
+import hashlib
+import sqlite3
+import logging
+import threading
+from typing import Dict, Any, Optional, NamedTuple
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+logger = logging.getLogger(__name__)
+
+class CachedResponse(NamedTuple):
+    """Сохраненный ответ с валидаторами"""
+    etag: Optional[str]
+    last_modified: Optional[str]
+    headers: Dict[str, str]
+    body: bytes
+
+class HttpCache:
+    """Кэш ответов GET в SQLite с ограничением размера и вытеснением давно не использованных (LRU)"""
+    
+    DEFAULT_PATH = os.path.join("cache", "http.db")
+    # Каталог кэшей профилей подключения (см. get_http_cache)
+    PROFILES_DIRECTORY = os.path.join("cache", "http")
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS responses (
+            key TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            headers TEXT NOT NULL,
+            body BLOB NOT NULL,
+            size INTEGER NOT NULL,
+            last_used REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses (last_used);
+    """
+    
+    # Заголовки ответа, которые нужны вызывающему коду (остальные не сохраняются)
+    STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "X-WP-Total", "X-WP-TotalPages", "Link")
+    
+    def __init__(self, path: str = DEFAULT_PATH, max_size_mb: float = 50):
+        """
+        Инициализация кэша
+        
+        Args:
+            path: Путь к файлу базы данных
+            max_size_mb: Максимальный суммарный размер сохраненных ответов
+        """
+        self.path = path
+        self.max_size = int(max_size_mb * 1024 * 1024)
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+    
+    def configure(self, max_size_mb: float):
+        """Изменение максимального размера (при изменении настроек профиля)"""
+        with self._lock:
+            self.max_size = int(max_size_mb * 1024 * 1024)
+            self._evict()
+    
+    def close(self):
+        """Закрытие соединения с базой"""
+        with self._lock:
+            self._conn.close()
+    
+    def get(self, key: str) -> Optional[CachedResponse]:
+        """
+        Получение сохраненного ответа
+        
+        Args:
+            key: Ключ запроса
+        
+        Returns:
+            CachedResponse: Сохраненный ответ или None
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, headers, body FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(row[0], row[1], json.loads(row[2]), row[3])
+    
+    def conditional_headers(self, cached: CachedResponse) -> Dict[str, str]:
+        """Заголовки условного запроса для сохраненного ответа"""
+        headers = {}
+        if cached.etag:
+            headers["If-None-Match"] = cached.etag
+        if cached.last_modified:
+            headers["If-Modified-Since"] = cached.last_modified
+        return headers
+    
+    def store(self, key: str, response: requests.Response) -> bool:
+        """
+        Сохранение ответа 200, если сервер прислал валидаторы
+        
+        Args:
+            key: Ключ запроса
+            response: Ответ сервера
+        
+        Returns:
+            bool: True если ответ сохранен
+        """
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status_code != 200 or not (etag or last_modified):
+            return False
+        
+        body = response.content
+        if len(body) > self.max_size // 4:
+            # Слишком большой ответ вытеснил бы почти весь кэш
+            return False
+        
+        headers = {name: response.headers[name] for name in self.STORED_HEADERS if name in response.headers}
+        with self._lock, self._conn:
+            previous = self._conn.execute("SELECT size FROM responses WHERE key = ?", (key,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, etag, last_modified, headers, body, size, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, etag, last_modified, json.dumps(headers), body, len(body), time.time())
+            )
+            self._size += len(body) - (previous[0] if previous else 0)
+            self._evict()
+        return True
+    
+    def revalidated(self, key: str, cached: CachedResponse, not_modified: requests.Response) -> requests.Response:
+        """
+        Ответ из локальной копии для 304 Not Modified
+        
+        Args:
+            key: Ключ запроса
+            cached: Сохраненный ответ
+            not_modified: Ответ 304 сервера
+        
+        Returns:
+            requests.Response: Ответ 200 с сохраненным телом
+        """
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+        
+        response = requests.Response()
+        response.status_code = 200
+        response.headers = CaseInsensitiveDict(cached.headers)
+        response._content = cached.body
+        response.url = not_modified.url
+        response.request = not_modified.request
+        response.elapsed = not_modified.elapsed
+        response.reason = "OK"
+        response.from_cache = True
+        return response
+    
+    def clear(self):
+        """Удаление всех сохраненных ответов с освобождением места на диске"""
+        with self._lock:
+            with self._conn:
+                self._conn.execute("DELETE FROM responses")
+            self._conn.execute("VACUUM")
+            self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            self._size = 0
+    
+    def _evict(self):
+        """Удаление давно не использованных ответов сверх максимального размера (под блокировкой)"""
+        if self._size <= self.max_size:
+            return
+        
+        evicted = 0
+        for key, size in self._conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall():
+            if self._size <= self.max_size * 0.9:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self._size -= size
+            evicted += 1
+        self._conn.commit()
+        logger.info(f"Из HTTP-кэша вытеснено ответов: {evicted}")
+
+# Кэши по профилям подключения: у каждого профиля свой файл и свой размер
+_caches: Dict[str, HttpCache] = {}
+_caches_lock = threading.Lock()
+
+def get_http_cache(key: str, max_size_mb: float = 50) -> Optional[HttpCache]:
+    """
+    Получение HTTP-кэша профиля подключения
+    
+    Args:
+        key: Ключ профиля (адрес сайта и ключ API)
+        max_size_mb: Максимальный размер; 0 - кэш профиля отключен, сохраненные ответы удаляются
+    
+    Returns:
+        HttpCache: Кэш, общий для всех менеджеров профиля, или None, если он отключен или недоступен
+    """
+    digest = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    path = os.path.join(HttpCache.PROFILES_DIRECTORY, f"{digest}.db")
+    
+    with _caches_lock:
+        cache = _caches.get(key)
+        try:
+            if max_size_mb <= 0:
+                # Кэш профиля отключен: освобождаем место, занятое его ответами.
+                # Менеджеры, получившие кэш раньше, больше ничего в него не сохраняют
+                if cache is None and os.path.exists(path):
+                    cache = _caches[key] = HttpCache(path, 0)
+                if cache is not None:
+                    cache.configure(0)
+                    cache.clear()
+                return None
+            
+            if cache is None:
+                cache = _caches[key] = HttpCache(path, max_size_mb)
+            else:
+                cache.configure(max_size_mb)
+        except sqlite3.Error as e:
+            logger.error(f"HTTP-кэш недоступен: {e}")
+            return None
+        return cache
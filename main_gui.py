@@ -6,11 +6,19 @@ import tkinter as tk
 from tkinter import messagebox, filedialog, ttk
 import threading
 import logging
+import time
 from typing import List, Dict, Any, Optional
 import json
 
 from woocommerce_manager import WooCommerceManager
-from product_models import Product
+from product_models import Product, ProductVariation
+from product_cache import ProductCache
+from product_mirror import ProductMirror
+from sync_planner import SyncPlanner, SyncPlan
+from operation_journal import OperationJournal, get_operation_journal
+from multi_store import MultiStorePush, ChangeSet, MultiStoreReport, StoreReport
+from request_scheduler import INTERACTIVE, FOREGROUND, BACKGROUND, prioritized
+from api_metrics import api_metrics
 from csv_manager import CSVManager
 from config import config_manager, ConnectionProfile
 from connection_settings_dialog import ConnectionSettingsDialog
@@ -39,6 +47,17 @@ class ProductManagerGUI:
         self.categories: List[Dict] = []
         self.attributes: List[Dict] = []
         
+        # Постоянный кэш и локальная копия каталога текущего профиля
+        self.product_cache: Optional[ProductCache] = None
+        self.product_mirror: Optional[ProductMirror] = None
+        try:
+            self.product_cache = ProductCache()
+        except Exception as e:
+            logger.error(f"Не удалось открыть кэш товаров: {e}")
+        
+        # Журнал отправки изменений (продолжение после сбоя)
+        self.operation_journal: Optional[OperationJournal] = get_operation_journal()
+        
         # Переменные состояния
         self.is_loading = False
         
@@ -77,6 +96,8 @@ class ProductManagerGUI:
         import_menu.add_command(label="Авто-определение формата", command=self.import_csv)
         import_menu.add_command(label="Простой CSV", command=lambda: self.import_csv('simple'))
         import_menu.add_command(label="WooCommerce CSV", command=lambda: self.import_csv('woocommerce'))
+        import_menu.add_separator()
+        import_menu.add_command(label="📡 CSV в несколько магазинов", command=self.import_csv_to_stores)
         
         # Экспорт
         export_menu = tk.Menu(file_menu, tearoff=0)
@@ -84,6 +105,8 @@ class ProductManagerGUI:
         export_menu.add_command(label="Простой CSV", command=lambda: self.export_csv('simple'))
         export_menu.add_command(label="WooCommerce CSV", command=lambda: self.export_csv('woocommerce'))
         
+        file_menu.add_separator()
+        file_menu.add_command(label="📡 Отправить изменения в несколько магазинов", command=self.push_to_stores)
         file_menu.add_separator()
         file_menu.add_command(label="Выход", command=self.root.quit)
         
@@ -92,6 +115,8 @@ class ProductManagerGUI:
         menubar.add_cascade(label="Настройки", menu=settings_menu)
         settings_menu.add_command(label="🔗 Подключения WooCommerce", command=self.open_connection_settings)
         settings_menu.add_command(label="🏷️ Управление атрибутами", command=self.open_attributes_manager)
+        settings_menu.add_command(label="🗑 Очистить кэш товаров", command=self.invalidate_cache)
+        settings_menu.add_command(label="📊 Сохранить метрики API", command=self.save_api_metrics)
         settings_menu.add_separator()
         settings_menu.add_command(label="📤 Экспорт профилей", command=self.export_profiles_menu)
         settings_menu.add_command(label="📥 Импорт профилей", command=self.import_profiles_menu)
@@ -313,7 +338,7 @@ class ProductManagerGUI:
             self.add_btn.configure(state="normal")
             
             self.update_status("Подключение к API успешно установлено")
-            
+        
         except Exception as e:
             messagebox.showerror("Ошибка подключения", f"Не удалось подключиться к API:\n{e}")
             logger.error(f"Ошибка подключения к API: {e}")
@@ -338,8 +363,13 @@ class ProductManagerGUI:
         
         threading.Thread(target=test_thread, daemon=True).start()
     
-    def load_products(self):
-        """Загрузка товаров с сайта"""
+    def load_products(self, background: bool = False):
+        """
+        Загрузка товаров с сайта
+        
+        Args:
+            background: Фоновая сверка (запросы уступают действиям пользователя и массовым операциям)
+        """
         if not self.wc_manager:
             return
         
@@ -349,13 +379,45 @@ class ProductManagerGUI:
             self.is_loading = True
             
             try:
-                products_data = self.wc_manager.get_all_products()
-                self.products = [Product.from_woocommerce_dict(data) for data in products_data]
+                # При полной загрузке товары показываются постранично, по мере получения
+                streamed_products = []
+                
+                def show_page(page):
+                    page_products = [Product.from_woocommerce_dict(data) for data in page]
+                    if not streamed_products:
+                        self.root.after(0, self.clear_products_table)
+                    streamed_products.extend(page_products)
+                    self.products = self.merge_local_changes(streamed_products)
+                    loaded_count = len(streamed_products)
+                    self.root.after(0, lambda chunk=page_products: self.append_products_to_table(chunk))
+                    self.root.after(0, lambda count=loaded_count: self.update_status(f"Загружено {count} товаров..."))
+                
+                if self.product_mirror:
+                    # Инкрементальная синхронизация с локальной копией каталога
+                    stats = self.wc_manager.sync_products(self.product_mirror, on_page=show_page,
+                                                          fields=Product.LIST_FIELDS)
+                    if stats is None:
+                        raise RuntimeError("синхронизация с сайтом не удалась")
+                    
+                    if stats["full"]:
+                        self.products = self.merge_local_changes(streamed_products)
+                    else:
+                        self.products = self.merge_local_changes(
+                            [Product.from_woocommerce_dict(data) for data in self.product_mirror.get_products()])
+                else:
+                    for page in self.wc_manager.iter_product_pages(fields=Product.LIST_FIELDS):
+                        show_page(page)
+                    self.products = self.merge_local_changes(streamed_products)
                 
                 # Также загружаем категории и атрибуты
                 self.categories = self.wc_manager.get_categories()
                 self.attributes = self.wc_manager.get_attributes()
                 
+                if self.product_mirror:
+                    profile_key = self.product_mirror.profile_key
+                    self.product_cache.set_categories(profile_key, self.categories)
+                    self.product_cache.set_attributes(profile_key, self.attributes)
+                
                 self.root.after(0, self.update_products_table)
                 self.root.after(0, lambda: self.update_status(f"Загружено {len(self.products)} товаров"))
                 
@@ -363,7 +425,7 @@ class ProductManagerGUI:
                 self.root.after(0, lambda: self.edit_btn.configure(state="normal"))
                 self.root.after(0, lambda: self.delete_btn.configure(state="normal"))
                 self.root.after(0, lambda: self.save_btn.configure(state="normal"))
-                
+            
             except Exception as e:
                 self.root.after(0, lambda: messagebox.showerror("Ошибка", f"Не удалось загрузить товары:\n{e}"))
                 logger.error(f"Ошибка загрузки товаров: {e}")
@@ -371,20 +433,110 @@ class ProductManagerGUI:
                 self.is_loading = False
                 self.root.after(0, lambda: self.progress_bar.stop())
         
-        threading.Thread(target=load_thread, daemon=True).start()
+        threading.Thread(target=prioritized(BACKGROUND if background else FOREGROUND, load_thread), daemon=True).start()
+    
+    def merge_local_changes(self, loaded: List[Product]) -> List[Product]:
+        """
+        Список товаров с сайта с сохранением несохраненных изменений текущего списка
+        
+        Пока идет сверка с сайтом, товары из кэша уже можно редактировать: измененные,
+        новые и помеченные для удаления товары заменяют свои строки с сайта, иначе
+        их изменения пропали бы вместе со старым списком.
+        
+        Args:
+            loaded: Товары, полученные с сайта
+        
+        Returns:
+            List[Product]: Новый список товаров
+        """
+        pending = [product for product in self.products if product.is_changed()]
+        if not pending:
+            return loaded
+        
+        local = {product.id: product for product in pending if product.id}
+        merged = [local.pop(product.id, product) if product.id else product for product in loaded]
+        # Измененные товары, которых (еще) нет в загруженной части, и новые товары
+        merged.extend(product for product in pending if not product.id or product.id in local)
+        return merged
+    
+    def load_cached_products(self):
+        """Мгновенный показ товаров из кэша и фоновая сверка с сайтом"""
+        if not self.product_mirror or self.product_mirror.is_empty():
+            return
+        
+        def cached_load_thread():
+            try:
+                profile_key = self.product_mirror.profile_key
+                self.products = [Product.from_woocommerce_dict(data) for data in self.product_mirror.get_products()]
+                self.categories = self.product_cache.get_categories(profile_key)
+                self.attributes = self.product_cache.get_attributes(profile_key)
+                
+                self.root.after(0, self.update_products_table)
+                self.root.after(0, lambda: self.update_status(f"Из кэша загружено {len(self.products)} товаров, сверка с сайтом..."))
+                self.root.after(0, lambda: self.edit_btn.configure(state="normal"))
+                self.root.after(0, lambda: self.delete_btn.configure(state="normal"))
+                self.root.after(0, lambda: self.save_btn.configure(state="normal"))
+                
+                # Сверка с сайтом в фоне
+                self.root.after(0, lambda: self.load_products(background=True))
+            
+            except Exception as e:
+                logger.error(f"Ошибка загрузки товаров из кэша: {e}")
+        
+        threading.Thread(target=cached_load_thread, daemon=True).start()
+    
+    def invalidate_cache(self):
+        """Очистка кэша товаров текущего профиля"""
+        if not self.product_mirror:
+            messagebox.showwarning("Предупреждение", "Профиль подключения не выбран")
+            return
+        
+        if not messagebox.askyesno("Подтверждение", "Очистить кэш товаров текущего профиля?\nСледующая загрузка будет полной."):
+            return
+        
+        self.product_mirror.clear()
+        if self.wc_manager and self.wc_manager.taxonomy_cache:
+            self.wc_manager.taxonomy_cache.invalidate()
+        self.update_status(f"Кэш профиля '{config_manager.current_profile.name}' очищен")
+    
+    def save_api_metrics(self):
+        """Сохранение метрик запросов к API в JSON"""
+        filename = filedialog.asksaveasfilename(
+            title="Сохранить метрики API",
+            defaultextension=".json",
+            initialfile="api_metrics.json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        if api_metrics.dump(filename):
+            totals = api_metrics.snapshot()["totals"]
+            self.update_status(f"Метрики API сохранены: {totals['requests']} запросов, "
+                               f"{totals['duration_seconds']:.1f} с")
+        else:
+            messagebox.showerror("Ошибка", "Не удалось сохранить метрики API")
+    
+    def clear_products_table(self):
+        """Очистка таблицы товаров"""
+        for item in self.products_tree.get_children():
+            self.products_tree.delete(item)
     
     def update_products_table(self):
         """Обновление таблицы товаров"""
         # Очищаем таблицу
-        for item in self.products_tree.get_children():
-            self.products_tree.delete(item)
+        self.clear_products_table()
         
         # Заполняем таблицу
-        for product in self.products:
+        self.append_products_to_table(self.products)
+    
+    def append_products_to_table(self, products: List[Product]):
+        """Добавление товаров в конец таблицы без ее очистки"""
+        for product in products:
             # Пропускаем удаленные товары (но показываем помеченные к удалению)
             if product._is_deleted and not product.id:
                 continue
-                
+            
             display_info = product.get_display_info()
             values = [display_info.get(col, "") for col in self.products_tree["columns"]]
             
@@ -461,19 +613,86 @@ class ProductManagerGUI:
         if product_id:
             # Находим товар в списке
             product = next((p for p in self.products if p.id == product_id), None)
-            if product:
-                from product_dialog import ProductDialog
-                
-                dialog = ProductDialog(self.root, product=product, categories=self.categories, attributes=self.attributes, wc_manager=self.wc_manager)
-                self.root.wait_window(dialog.window)  # Ждем закрытия диалога
-                if dialog.result:
-                    # Помечаем товар как измененный
-                    dialog.result.mark_as_modified()
-                    # Обновляем товар в списке
-                    index = self.products.index(product)
-                    self.products[index] = dialog.result
-                    self.update_products_table()
-                    self.update_status("Товар изменен локально. Нажмите 'Сохранить изменения' для отправки на сайт.")
+            if product and product.is_partial():
+                self.hydrate_and_edit(product)
+            elif product:
+                self.open_product_dialog(product)
+    
+    def open_product_dialog(self, product: Product):
+        """Открытие диалога редактирования товара"""
+        from product_dialog import ProductDialog
+        
+        dialog = ProductDialog(self.root, product=product, categories=self.categories, attributes=self.attributes, wc_manager=self.wc_manager)
+        self.root.wait_window(dialog.window)  # Ждем закрытия диалога
+        if dialog.result:
+            # Помечаем товар как измененный
+            dialog.result.mark_as_modified()
+            # Обновляем товар в списке
+            index = self.products.index(product)
+            self.products[index] = dialog.result
+            self.update_products_table()
+            self.update_status("Товар изменен локально. Нажмите 'Сохранить изменения' для отправки на сайт.")
+    
+    def hydrate_and_edit(self, product: Product):
+        """Загрузка полных данных товара (в таблице только поля списка) и открытие редактора"""
+        def hydrate_thread():
+            self.root.after(0, lambda: self.update_status(f"Загрузка товара {product.id}..."))
+            data = self.wc_manager.get_product(product.id)
+            if not data:
+                self.root.after(0, lambda: messagebox.showerror("Ошибка", "Не удалось загрузить данные товара"))
+                return
+            
+            self.replace_with_hydrated([data])
+            full_product = next((p for p in self.products if p.id == product.id), None)
+            if not full_product:
+                return
+            self.root.after(0, lambda: self.update_status("Товар загружен"))
+            self.root.after(0, lambda: self.open_product_dialog(full_product))
+        
+        threading.Thread(target=prioritized(INTERACTIVE, hydrate_thread), daemon=True).start()
+    
+    def hydrate_partial_products(self) -> bool:
+        """
+        Загрузка полных данных всех товаров, полученных только с полями списка
+        
+        Returns:
+            bool: True если все товары загружены полностью
+        """
+        partial_ids = [p.id for p in self.products if p.is_partial() and p.id]
+        if not partial_ids:
+            return True
+        
+        self.root.after(0, lambda: self.update_status(f"Загрузка полных данных {len(partial_ids)} товаров..."))
+        hydrated = self.wc_manager.hydrate_products(partial_ids) if self.wc_manager else []
+        self.replace_with_hydrated(hydrated)
+        return len(hydrated) == len(partial_ids)
+    
+    def replace_with_hydrated(self, products_data: List[Dict[str, Any]]) -> List[Product]:
+        """
+        Замена неполных товаров в списке полными данными с сайта
+        
+        Локальные изменения товара (флаги) сохраняются; полные данные
+        также записываются в кэш профиля.
+        
+        Returns:
+            List[Product]: Товары с полными данными
+        """
+        by_id = {data["id"]: data for data in products_data}
+        hydrated = []
+        for index, product in enumerate(self.products):
+            data = by_id.get(product.id)
+            if data is None or not product.is_partial():
+                continue
+            
+            full_product = Product.from_woocommerce_dict(data)
+            full_product._is_deleted = product._is_deleted
+            self.products[index] = full_product
+            hydrated.append(full_product)
+        
+        if self.product_mirror and products_data:
+            self.product_cache.upsert_products(self.product_mirror.profile_key, products_data)
+        
+        return hydrated
     
     def delete_product(self):
         """Удаление товара"""
@@ -505,147 +724,64 @@ class ProductManagerGUI:
             return
         
         # Собираем товары для различных операций
-        products_to_create = []
-        products_to_update = []
-        products_to_delete = []
+        planner = SyncPlanner(self.wc_manager, self.operation_journal)
+        plan = planner.plan(self.products)
         
-        for product in self.products:
-            if product.is_changed():
-                status = product.get_change_status()
-                if status == "new":
-                    products_to_create.append(product)
-                elif status == "modified":
-                    products_to_update.append(product)
-                elif status == "deleted":
-                    products_to_delete.append(product)
-        
-        total_operations = len(products_to_create) + len(products_to_update) + len(products_to_delete)
-        
-        if total_operations == 0:
+        if plan.is_empty():
             messagebox.showinfo("Информация", "Нет изменений для сохранения")
             return
         
         # Подтверждение операции
         confirm_message = f"""
 Будут выполнены следующие операции:
-• Создать: {len(products_to_create)} товаров
-• Обновить: {len(products_to_update)} товаров  
-• Удалить: {len(products_to_delete)} товаров
+• Создать: {len(plan.create)} товаров
+• Обновить: {len(plan.update)} товаров  
+• Удалить: {len(plan.delete) + len(plan.discard)} товаров
 
 Продолжить?"""
-        
+
         if not messagebox.askyesno("Подтверждение", confirm_message):
             return
         
+        self.start_save(plan)
+    
+    def start_save(self, plan: SyncPlan):
+        """
+        Отправка плана изменений на сайт в фоновом потоке
+        
+        Создание, обновление и удаление объединяются в общие пакетные запросы.
+        Товары, которые не удалось сохранить, сохраняют свои флаги изменений,
+        поэтому повторная отправка затрагивает только их.
+        """
+        planner = SyncPlanner(self.wc_manager, self.operation_journal)
+        
         def save_thread():
             try:
-                self.root.after(0, lambda: self.update_status("Сохранение изменений..."))
                 self.root.after(0, lambda: self.progress_bar.start())
+                status = f"Отправка {plan.total()} операций ({planner.request_count(plan)} запросов)..."
+                self.root.after(0, lambda: self.update_status(status))
                 
-                # Результаты операций
-                results = {
-                    "created": [],
-                    "updated": [],
-                    "deleted": [],
-                    "errors": []
-                }
+                result = planner.execute(plan)
                 
-                # Создание новых товаров
-                if products_to_create:
-                    self.root.after(0, lambda: self.update_status(f"Создание {len(products_to_create)} товаров..."))
-                    
-                    # Пакетное создание если много товаров
-                    if len(products_to_create) > 5:
-                        create_data = [product.to_woocommerce_dict() for product in products_to_create]
-                        batch_result = self.wc_manager.batch_create_products(create_data)
-                        
-                        for i, created_product in enumerate(batch_result["success"]):
-                            products_to_create[i].id = created_product["id"]
-                            products_to_create[i].reset_change_flags()
-                            results["created"].append(created_product)
-                        
-                        results["errors"].extend(batch_result["errors"])
-                    else:
-                        # Поштучное создание для малого количества
-                        for product in products_to_create:
-                            created_product = self.wc_manager.create_product(product.to_woocommerce_dict())
-                            if created_product:
-                                product.id = created_product["id"]
-                                product.reset_change_flags()
-                                results["created"].append(created_product)
-                            else:
-                                results["errors"].append({"product": product.name, "error": "Не удалось создать"})
-                
-                # Обновление существующих товаров
-                if products_to_update:
-                    self.root.after(0, lambda: self.update_status(f"Обновление {len(products_to_update)} товаров..."))
-                    
-                    # Пакетное обновление если много товаров
-                    if len(products_to_update) > 5:
-                        update_data = []
-                        for product in products_to_update:
-                            product_dict = product.to_woocommerce_dict()
-                            product_dict["id"] = product.id
-                            update_data.append(product_dict)
-                        
-                        batch_result = self.wc_manager.batch_update_products(update_data)
-                        
-                        for i, updated_product in enumerate(batch_result["success"]):
-                            products_to_update[i].reset_change_flags()
-                            results["updated"].append(updated_product)
-                        
-                        results["errors"].extend(batch_result["errors"])
-                    else:
-                        # Поштучное обновление
-                        for product in products_to_update:
-                            updated_product = self.wc_manager.update_product(product.id, product.to_woocommerce_dict())
-                            if updated_product:
-                                product.reset_change_flags()
-                                results["updated"].append(updated_product)
-                            else:
-                                results["errors"].append({"product": product.name, "error": "Не удалось обновить"})
-                
-                # Удаление товаров
-                if products_to_delete:
-                    self.root.after(0, lambda: self.update_status(f"Удаление {len(products_to_delete)} товаров..."))
-                    
-                    # Пакетное удаление если много товаров
-                    if len(products_to_delete) > 5:
-                        delete_ids = [product.id for product in products_to_delete if product.id]
-                        batch_result = self.wc_manager.batch_delete_products(delete_ids)
-                        
-                        results["deleted"].extend(batch_result["success"])
-                        results["errors"].extend(batch_result["errors"])
-                        
-                        # Удаляем товары из локального списка
-                        self.products = [p for p in self.products if not p._is_deleted]
-                    else:
-                        # Поштучное удаление
-                        for product in products_to_delete:
-                            if product.id and self.wc_manager.delete_product(product.id):
-                                results["deleted"].append({"id": product.id, "name": product.name})
-                            else:
-                                results["errors"].append({"product": product.name, "error": "Не удалось удалить"})
-                        
-                        # Удаляем товары из локального списка
-                        self.products = [p for p in self.products if not p._is_deleted]
+                # Удаляем из локального списка только успешно удаленные товары
+                if result.deleted:
+                    deleted_ids = {id(product) for product in result.deleted}
+                    self.products = [p for p in self.products if id(p) not in deleted_ids]
                 
                 # Обновляем таблицу
                 self.root.after(0, self.update_products_table)
                 
                 # Формируем отчет
-                success_count = len(results["created"]) + len(results["updated"]) + len(results["deleted"])
-                error_count = len(results["errors"])
+                success_count = result.success_count()
                 
-                if error_count == 0:
+                if not result.errors:
                     message = f"Синхронизация завершена успешно!\n\nВыполнено операций: {success_count}"
                     self.root.after(0, lambda: messagebox.showinfo("Успех", message))
                 else:
-                    message = f"Синхронизация завершена с ошибками.\n\nУспешно: {success_count}\nОшибок: {error_count}"
-                    self.root.after(0, lambda: messagebox.showwarning("Частичный успех", message))
+                    self.root.after(0, lambda: self.report_save_errors(success_count, result.errors, result.failed))
                 
                 self.root.after(0, lambda: self.update_status("Синхронизация завершена"))
-                
+            
             except Exception as e:
                 error_message = f"Критическая ошибка при синхронизации: {e}"
                 self.root.after(0, lambda: messagebox.showerror("Ошибка", error_message))
@@ -655,6 +791,200 @@ class ProductManagerGUI:
         
         threading.Thread(target=save_thread, daemon=True).start()
     
+    def report_save_errors(self, success_count: int, errors: List[Dict[str, Any]], failed_products: List[Product]):
+        """Отчет о товарах, которые не удалось сохранить, с предложением повторить отправку"""
+        details = "\n".join(f"• {error['product']}: {error['error']}" for error in errors[:10])
+        if len(errors) > 10:
+            details += f"\n... и еще {len(errors) - 10}"
+        
+        message = (f"Синхронизация завершена с ошибками.\n\nУспешно: {success_count}\nОшибок: {len(errors)}\n\n"
+                   f"{details}\n\nПовторить отправку только для товаров с ошибками?")
+        
+        if messagebox.askyesno("Частичный успех", message, icon="warning"):
+            self.start_save(SyncPlanner(self.wc_manager, self.operation_journal).plan(failed_products))
+    
+    def check_interrupted_syncs(self):
+        """Предложение продолжить синхронизации, прерванные сбоем или обрывом связи"""
+        if not self.operation_journal or not self.wc_manager or not self.wc_manager.profile_key:
+            return
+        
+        for sync in self.operation_journal.unfinished(self.wc_manager.profile_key):
+            pending = sync["pending"]
+            started = time.strftime("%d.%m.%Y %H:%M", time.localtime(sync["started_at"]))
+            message = (f"Синхронизация от {started} не была завершена.\n\n"
+                       f"Не подтверждено сервером:\n"
+                       f"• Создание: {pending.get('create', 0)}\n"
+                       f"• Обновление: {pending.get('update', 0)}\n"
+                       f"• Удаление: {pending.get('delete', 0)}\n\n"
+                       f"Продолжить? Созданные товары будут найдены по артикулу, дубликаты не появятся.\n"
+                       f"«Нет» - отказаться от продолжения.")
+            answer = messagebox.askyesnocancel("Прерванная синхронизация", message, icon="warning")
+            if answer is None:
+                continue
+            if answer:
+                self.resume_sync(sync["id"])
+            else:
+                self.operation_journal.abandon(sync["id"])
+    
+    def resume_sync(self, sync_id: int):
+        """Продолжение прерванной синхронизации в фоновом потоке"""
+        planner = SyncPlanner(self.wc_manager, self.operation_journal)
+        
+        def resume_thread():
+            try:
+                self.root.after(0, lambda: self.progress_bar.start())
+                self.root.after(0, lambda: self.update_status("Продолжение прерванной синхронизации..."))
+                
+                result = planner.resume(sync_id)
+                success_count = result.success_count()
+                if not result.errors:
+                    message = f"Прерванная синхронизация завершена.\n\nВыполнено операций: {success_count}"
+                    self.root.after(0, lambda: messagebox.showinfo("Успех", message))
+                else:
+                    details = "\n".join(f"• {error['product']}: {error['error']}" for error in result.errors[:10])
+                    message = (f"Прерванная синхронизация завершена с ошибками.\n\n"
+                               f"Успешно: {success_count}\nОшибок: {len(result.errors)}\n\n{details}")
+                    self.root.after(0, lambda: messagebox.showwarning("Частичный успех", message))
+                
+                # Данные на сайте изменились - перезагружаем список
+                self.root.after(0, self.load_products)
+            except Exception as e:
+                error_message = f"Ошибка продолжения синхронизации: {e}"
+                self.root.after(0, lambda: messagebox.showerror("Ошибка", error_message))
+                logger.error(error_message)
+            finally:
+                self.root.after(0, lambda: self.progress_bar.stop())
+        
+        threading.Thread(target=resume_thread, daemon=True).start()
+    
+    def push_to_stores(self):
+        """Отправка несохраненных изменений в выбранные магазины"""
+        plan = SyncPlanner(self.wc_manager, self.operation_journal).plan(self.products)
+        if plan.total() == 0:
+            messagebox.showinfo("Информация", "Нет изменений для отправки")
+            return
+        
+        description = (f"Создать: {len(plan.create)}, обновить: {len(plan.update)}, "
+                       f"удалить: {len(plan.delete)} товаров")
+        self.choose_stores_and_push(ChangeSet.from_plan(plan), description)
+    
+    def import_csv_to_stores(self):
+        """Импорт товаров из CSV и отправка в выбранные магазины (создание или обновление по SKU)"""
+        filename = filedialog.askopenfilename(
+            title="Выберите CSV файл для отправки в магазины",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")]
+        )
+        if not filename:
+            return
+        
+        def import_thread():
+            self.root.after(0, lambda: self.update_status("Импорт из CSV..."))
+            self.root.after(0, lambda: self.progress_bar.start())
+            try:
+                imported_products = self.csv_manager.import_products_from_csv(filename)
+                if not imported_products:
+                    self.root.after(0, lambda: messagebox.showwarning("Предупреждение", "В файле нет товаров"))
+                    return
+                
+                description = f"Создать или обновить по артикулу: {len(imported_products)} товаров"
+                self.root.after(0, lambda: self.choose_stores_and_push(ChangeSet.upsert(imported_products), description))
+            except Exception as e:
+                self.root.after(0, lambda: messagebox.showerror("Ошибка импорта", f"Не удалось импортировать CSV:\n{e}"))
+            finally:
+                self.root.after(0, lambda: self.progress_bar.stop())
+        
+        threading.Thread(target=import_thread, daemon=True).start()
+    
+    def choose_stores_and_push(self, changes: ChangeSet, description: str):
+        """Выбор магазинов и отправка в них набора изменений в фоновом потоке"""
+        from multi_store_dialog import MultiStoreDialog
+        
+        profiles = config_manager.get_profile_names()
+        if not profiles:
+            messagebox.showerror("Ошибка", "Нет сохраненных профилей подключения")
+            return
+        
+        current = config_manager.current_profile.name if config_manager.current_profile else None
+        dialog = MultiStoreDialog(self.root, profiles, description, current_profile=current)
+        self.root.wait_window(dialog.dialog)
+        if not dialog.result:
+            return
+        
+        selected = dialog.result["profiles"]
+        pusher = MultiStorePush(self.operation_journal, create_missing=dialog.result["create_missing"])
+        
+        def push_thread():
+            try:
+                self.root.after(0, lambda: self.progress_bar.start())
+                self.root.after(0, lambda: self.update_status(f"Отправка в {len(selected)} магазинов..."))
+                
+                done = []
+                def on_store_done(report):
+                    done.append(report.profile)
+                    status = f"Отправка в магазины: готово {len(done)} из {len(selected)} ({report.profile})"
+                    self.root.after(0, lambda: self.update_status(status))
+                
+                report = pusher.push(changes, selected, on_store_done=on_store_done)
+                
+                # Изменения отправлены и в текущий магазин: подтвержденные товары больше
+                # не ждут сохранения, после чего список сверяется с сайтом
+                current_report = next((store for store in report.stores if store.profile == current), None)
+                if current_report:
+                    self.root.after(0, lambda: self.apply_store_acknowledgements(current_report))
+                self.root.after(0, lambda: self.report_multi_store_push(report))
+                if current_report:
+                    self.root.after(0, self.load_products)
+            except Exception as e:
+                error_message = f"Ошибка отправки в несколько магазинов: {e}"
+                self.root.after(0, lambda: messagebox.showerror("Ошибка", error_message))
+                logger.error(error_message)
+            finally:
+                self.root.after(0, lambda: self.progress_bar.stop())
+        
+        threading.Thread(target=push_thread, daemon=True).start()
+    
+    def apply_store_acknowledgements(self, store: StoreReport):
+        """
+        Учет отправки в текущий магазин: подтвержденные магазином товары сохранены
+        
+        Созданные товары получают ID магазина, удаленные убираются из списка.
+        Товары с ошибками и пропущенные остаются несохраненными.
+        """
+        deleted_ids = set()
+        for product, store_product_id in store.acknowledged:
+            if product.get_change_status() == "deleted":
+                deleted_ids.add(id(product))
+                continue
+            if store_product_id:
+                product.id = store_product_id
+            product.reset_change_flags()
+        
+        if deleted_ids:
+            self.products = [p for p in self.products if id(p) not in deleted_ids]
+        self.update_products_table()
+    
+    def report_multi_store_push(self, report: MultiStoreReport):
+        """Отчет об отправке в несколько магазинов с предложением сохранить подробности"""
+        failed = [store for store in report.stores if store.status != "ok"]
+        self.update_status("Отправка в магазины завершена")
+        
+        if not failed:
+            messagebox.showinfo("Успех", f"Отправка завершена успешно!\n\n{report.summary()}")
+            return
+        
+        message = (f"Отправка завершена с ошибками.\n\n{report.summary()}\n\n"
+                   f"Сохранить подробный отчет (ошибки и пропущенные товары по магазинам)?")
+        if not messagebox.askyesno("Частичный успех", message, icon="warning"):
+            return
+        
+        filename = filedialog.asksaveasfilename(
+            title="Сохранить отчет",
+            defaultextension=".json",
+            filetypes=[("JSON files", "*.json"), ("All files", "*.*")]
+        )
+        if filename and not report.save(filename):
+            messagebox.showerror("Ошибка", "Не удалось сохранить отчет")
+    
     def import_csv(self, csv_format='auto'):
         """Импорт товаров из CSV"""
         filename = filedialog.askopenfilename(
@@ -686,7 +1016,7 @@ class ProductManagerGUI:
                     
                     self.root.after(0, self.update_products_table)
                     self.root.after(0, lambda: self.update_status(f"Импортировано {len(imported_products)} товаров"))
-                    
+                
                 except Exception as e:
                     self.root.after(0, lambda: messagebox.showerror("Ошибка импорта", f"Не удалось импортировать CSV:\n{e}"))
                 finally:
@@ -713,7 +1043,14 @@ class ProductManagerGUI:
                 self.root.after(0, lambda: self.progress_bar.start())
                 
                 try:
+                    # Для экспорта нужны все поля товаров, а не только поля таблицы
+                    if not self.hydrate_partial_products():
+                        raise RuntimeError("не удалось загрузить полные данные всех товаров")
+                    
                     if csv_format == 'woocommerce':
+                        # Вариации выгружаются отдельными строками - загружаем их заранее
+                        self.load_variations()
+                        
                         # Экспорт в формате WooCommerce
                         try:
                             from woocommerce_csv_manager import WooCommerceCSVManager
@@ -740,6 +1077,35 @@ class ProductManagerGUI:
             
             threading.Thread(target=export_thread, daemon=True).start()
     
+    def load_variations(self):
+        """Загрузка вариаций всех вариативных товаров, для которых они еще не загружены"""
+        variable_products = {
+            p.id: p for p in self.products
+            if p.type == "variable" and p.id and not p.variations
+        }
+        if not variable_products or not self.wc_manager:
+            return
+        
+        total = len(variable_products)
+        loaded = 0
+        failed = 0
+        self.root.after(0, lambda: self.update_status(f"Загрузка вариаций {total} товаров..."))
+        
+        for parent_id, variations in self.wc_manager.iter_variations(variable_products):
+            if variations is None:
+                failed += 1
+                continue
+            
+            variable_products[parent_id].variations = [ProductVariation.from_woocommerce_dict(v) for v in variations]
+            if self.product_mirror:
+                self.product_cache.set_variations(self.product_mirror.profile_key, parent_id, variations)
+            
+            loaded += 1
+            self.root.after(0, lambda count=loaded: self.update_status(f"Загружены вариации {count} из {total} товаров..."))
+        
+        if failed:
+            raise RuntimeError(f"не удалось загрузить вариации {failed} товаров")
+    
     def show_about(self):
         """Показать информацию о программе"""
         about_text = """
@@ -872,7 +1238,7 @@ class ProductManagerGUI:
                 
                 # Пытаемся подключиться к API
                 self.connect_to_current_profile()
-                
+        
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось открыть настройки подключения:\n{e}")
             logger.error(f"Ошибка открытия настроек: {e}")
@@ -898,7 +1264,7 @@ class ProductManagerGUI:
                         logger.error(f"Ошибка обновления атрибутов: {e}")
                 
                 threading.Thread(target=reload_attributes, daemon=True).start()
-                
+        
         except Exception as e:
             messagebox.showerror("Ошибка", f"Не удалось открыть управление атрибутами:\n{e}")
             logger.error(f"Ошибка открытия управления атрибутами: {e}")
@@ -920,7 +1286,7 @@ class ProductManagerGUI:
             
             # Активируем кнопку тестирования
             self.test_btn.configure(state="normal")
-            
+        
         else:
             self.current_profile_label.configure(text="Не выбран", text_color="gray")
             self.site_url_label.configure(text="Не настроен", text_color="gray")
@@ -969,6 +1335,14 @@ class ProductManagerGUI:
             # Обновляем конфигурацию менеджера
             self.wc_manager._setup_api_with_config(config)
             
+            # Кэш привязан к магазину (адрес и ключ API), а не к имени профиля: после
+            # переименования профиля или смены магазина не покажутся чужие товары
+            self.product_mirror = None
+            profile_key = self.wc_manager.profile_key
+            if self.product_cache and profile_key:
+                self.product_mirror = ProductMirror(profile_key, self.product_cache)
+                threading.Thread(target=self.product_cache.evict, args=(profile_key,), daemon=True).start()
+            
             self.connection_status.configure(text="✅ Подключено", text_color="green")
             
             # Активируем кнопки управления товарами
@@ -977,6 +1351,12 @@ class ProductManagerGUI:
             
             self.update_status(f"Успешно подключен к {config['site_url']}")
             
+            # Показываем товары из кэша, не дожидаясь сайта
+            self.load_cached_products()
+            
+            # Предлагаем продолжить отправку, прерванную при прошлом запуске
+            self.root.after(0, self.check_interrupted_syncs)
+        
         except Exception as e:
             self.connection_status.configure(text="❌ Ошибка подключения", text_color="red")
             messagebox.showerror("Ошибка подключения", f"Не удалось подключиться к API:\n{e}")
@@ -0,0 +1,732 @@
+"""
+Локальный имитатор WooCommerce REST API (wc/v3) для тестов и замеров производительности
+
+Поддерживает товары, вариации, пакетные операции, атрибуты, значения
+атрибутов и категории с заголовками X-WP-Total / X-WP-TotalPages, а также
+задержку ответа, случайные ошибки 500 и ограничение частоты (429 с Retry-After).
+Авторизация не проверяется: подходят любые ключи и любой способ подписи.
+
+Запуск:
+    python mock_woocommerce_server.py --port 8080 --products 10000 --latency 0.05
+"""
+import re
+import json
+import time
+import random
+import hashlib
+import logging
+import argparse
+import threading
+from datetime import datetime, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+from typing import List, Dict, Any, Optional, Tuple, Callable
+
+logger = logging.getLogger(__name__)
+
+class ApiError(Exception):
+    """Ошибка в формате WooCommerce REST API"""
+    
+    def __init__(self, status: int, code: str, message: str):
+        super().__init__(message)
+        self.status = status
+        self.code = code
+        self.message = message
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {"code": self.code, "message": self.message, "data": {"status": self.status}}
+
+class MockWooCommerceServer:
+    """
+    Имитатор магазина WooCommerce в памяти процесса
+    
+    Использование:
+        with MockWooCommerceServer(latency=0.02) as server:
+            server.populate(products=1000)
+            manager = WooCommerceManager({"site_url": server.url, ...})
+    """
+    
+    API_PREFIX = "/wp-json/wc/v3/"
+    
+    # Ограничения WooCommerce
+    MAX_PER_PAGE = 100
+    MAX_BATCH_ITEMS = 100
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0, latency: float = 0.0,
+                 error_rate: float = 0.0, throttle_rate: float = 0.0, retry_after: float = 1.0,
+                 etags: bool = False, seed: Optional[int] = None):
+        """
+        Инициализация имитатора
+        
+        Args:
+            host: Адрес для прослушивания
+            port: Порт (0 - любой свободный)
+            latency: Задержка каждого ответа в секундах
+            error_rate: Доля запросов, завершающихся ответом 500
+            throttle_rate: Доля запросов, получающих 429 с Retry-After
+            retry_after: Значение Retry-After для ответов 429, в секундах
+            etags: Отдавать ETag и отвечать 304 на If-None-Match
+            seed: Начальное значение генератора случайных ошибок
+        """
+        self.host = host
+        self.port = port
+        self.latency = latency
+        self.error_rate = error_rate
+        self.throttle_rate = throttle_rate
+        self.retry_after = retry_after
+        self.etags = etags
+        
+        self.products: Dict[int, Dict[str, Any]] = {}
+        self.variations: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        self.categories: Dict[int, Dict[str, Any]] = {}
+        self.attributes: Dict[int, Dict[str, Any]] = {}
+        self.terms: Dict[int, Dict[int, Dict[str, Any]]] = {}
+        
+        self.stats: Dict[str, int] = {"requests": 0, "errors_injected": 0, "throttled": 0,
+                                      "not_modified": 0, "bytes_sent": 0}
+        
+        self._skus: Dict[str, int] = {}
+        self._product_order: Optional[List[int]] = None
+        self._next_id = 1
+        self._random = random.Random(seed)
+        self._lock = threading.RLock()
+        self._httpd: Optional[ThreadingHTTPServer] = None
+        self._thread: Optional[threading.Thread] = None
+        self._routes = self._build_routes()
+    
+    @property
+    def url(self) -> str:
+        """Адрес сайта для профиля подключения"""
+        return f"http://{self.host}:{self.port}"
+    
+    def start(self) -> 'MockWooCommerceServer':
+        """Запуск сервера в фоновом потоке"""
+        handler = type("MockHandler", (_RequestHandler,), {"mock": self})
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        logger.info(f"Имитатор WooCommerce запущен: {self.url}")
+        return self
+    
+    def stop(self):
+        """Остановка сервера"""
+        if self._httpd:
+            self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+    
+    def __enter__(self) -> 'MockWooCommerceServer':
+        return self.start()
+    
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+    
+    def populate(self, products: int = 1000, variable_ratio: float = 0.1, variations_per_product: int = 5,
+                 categories: int = 50, attributes: int = 10, terms_per_attribute: int = 20,
+                 seed: int = 0):
+        """
+        Заполнение магазина простым синтетическим каталогом
+        
+        Args:
+            products: Количество товаров
+            variable_ratio: Доля вариативных товаров
+            variations_per_product: Вариаций у вариативного товара
+            categories: Количество категорий
+            attributes: Количество атрибутов
+            terms_per_attribute: Значений у каждого атрибута
+            seed: Начальное значение генератора
+        """
+        rng = random.Random(seed)
+        category_ids = [
+            self.create_category({"name": f"Категория {index + 1}"})["id"]
+            for index in range(categories)
+        ]
+        
+        attribute_terms = []
+        for index in range(attributes):
+            attribute = self.create_attribute({"name": f"Атрибут {index + 1}", "slug": f"pa_attr_{index + 1}"})
+            names = [self.create_term(attribute["id"], {"name": f"Значение {term + 1}"})["name"]
+                     for term in range(terms_per_attribute)]
+            attribute_terms.append((attribute, names))
+        
+        for index in range(products):
+            variable = bool(attribute_terms) and rng.random() < variable_ratio
+            data = {
+                "name": f"Товар {index + 1}",
+                "type": "variable" if variable else "simple",
+                "sku": f"MOCK-{index + 1:07d}",
+                "regular_price": "" if variable else f"{rng.randint(100, 99999) / 100:.2f}",
+                "description": "<p>" + "Описание товара. " * rng.randint(5, 40) + "</p>",
+                "short_description": "<p>Краткое описание</p>",
+                "manage_stock": True,
+                "stock_quantity": rng.randint(0, 500),
+                "categories": [{"id": rng.choice(category_ids)}] if category_ids else [],
+                "images": [{"src": f"https://example.com/images/{index + 1}-{image}.jpg"}
+                           for image in range(rng.randint(1, 3))],
+                "meta_data": [{"key": "_mock_index", "value": str(index)}]
+            }
+            if variable:
+                attribute, names = rng.choice(attribute_terms)
+                options = names[:max(1, min(variations_per_product, len(names)))]
+                data["attributes"] = [{"id": attribute["id"], "name": attribute["name"],
+                                       "options": options, "visible": True, "variation": True}]
+            product = self.create_product(data)
+            
+            if variable:
+                for option in options:
+                    self.create_variation(product["id"], {
+                        "sku": f"{product['sku']}-{option}",
+                        "regular_price": f"{rng.randint(100, 99999) / 100:.2f}",
+                        "stock_quantity": rng.randint(0, 100),
+                        "attributes": [{"id": attribute["id"], "name": attribute["name"], "option": option}]
+                    })
+        
+        logger.info(f"Имитатор заполнен: {len(self.products)} товаров, {len(self.categories)} категорий, "
+                    f"{len(self.attributes)} атрибутов")
+    
+    def _new_id(self) -> int:
+        with self._lock:
+            new_id = self._next_id
+            self._next_id += 1
+            return new_id
+    
+    def _now(self) -> Tuple[str, str]:
+        """Текущее время (местное и GMT) в формате WooCommerce"""
+        now = datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        return now, now
+    
+    def create_product(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Создание товара"""
+        if not data.get("name"):
+            raise ApiError(400, "rest_missing_callback_param", "Отсутствует параметр: name")
+        
+        with self._lock:
+            sku = data.get("sku") or ""
+            if sku and sku in self._skus:
+                raise ApiError(400, "product_invalid_sku",
+                               "Неверный или повторяющийся артикул.")
+            
+            product_id = self._new_id()
+            created, created_gmt = self._now()
+            product = {
+                "id": product_id, "name": "", "slug": "", "type": "simple", "status": "publish",
+                "featured": False, "description": "", "short_description": "", "sku": "",
+                "price": "", "regular_price": "", "sale_price": "", "virtual": False, "downloadable": False,
+                "manage_stock": False, "stock_quantity": None, "stock_status": "instock", "weight": "",
+                "dimensions": {"length": "", "width": "", "height": ""}, "categories": [], "images": [],
+                "attributes": [], "variations": [], "meta_data": [],
+                "date_created": created, "date_created_gmt": created_gmt
+            }
+            self._apply_product_data(product, data)
+            self.products[product_id] = product
+            self._product_order = None
+            return product
+    
+    def update_product(self, product_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Обновление товара"""
+        with self._lock:
+            product = self.products.get(product_id)
+            if product is None:
+                raise ApiError(404, "woocommerce_rest_product_invalid_id", "Неверный ID.")
+            
+            sku = data.get("sku")
+            if sku and sku != product["sku"] and sku in self._skus:
+                raise ApiError(400, "product_invalid_sku", "Неверный или повторяющийся артикул.")
+            self._apply_product_data(product, data)
+            return product
+    
+    def delete_product(self, product_id: int) -> Dict[str, Any]:
+        """Удаление товара вместе с вариациями"""
+        with self._lock:
+            product = self.products.pop(product_id, None)
+            if product is None:
+                raise ApiError(404, "woocommerce_rest_product_invalid_id", "Неверный ID.")
+            
+            if product["sku"]:
+                self._skus.pop(product["sku"], None)
+            self.variations.pop(product_id, None)
+            self._product_order = None
+            return product
+    
+    def _apply_product_data(self, product: Dict[str, Any], data: Dict[str, Any]):
+        """Запись полей товара с разрешением категорий и обновлением дат (под блокировкой)"""
+        old_sku = product.get("sku")
+        for key, value in data.items():
+            if key in ("id", "date_created", "date_created_gmt", "variations"):
+                continue
+            if key == "categories":
+                value = [self._category_ref(item.get("id")) for item in value]
+            elif key == "images":
+                value = [dict(image, id=image.get("id") or self._new_id()) for image in value]
+            elif key == "meta_data":
+                value = [dict(item, id=item.get("id") or self._new_id()) for item in value]
+            product[key] = value
+        
+        if old_sku != product["sku"]:
+            if old_sku:
+                self._skus.pop(old_sku, None)
+            if product["sku"]:
+                self._skus[product["sku"]] = product["id"]
+        
+        product["slug"] = product["slug"] or f"product-{product['id']}"
+        product["price"] = product.get("sale_price") or product.get("regular_price") or ""
+        product["date_modified"], product["date_modified_gmt"] = self._now()
+    
+    def _category_ref(self, category_id: Optional[int]) -> Dict[str, Any]:
+        category = self.categories.get(category_id)
+        if category is None:
+            raise ApiError(400, "woocommerce_rest_invalid_term", f"Категория {category_id} не найдена.")
+        return {"id": category["id"], "name": category["name"], "slug": category["slug"]}
+    
+    def create_variation(self, parent_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Создание вариации"""
+        with self._lock:
+            parent = self.products.get(parent_id)
+            if parent is None:
+                raise ApiError(404, "woocommerce_rest_product_invalid_id", "Неверный ID.")
+            
+            variation_id = self._new_id()
+            created, created_gmt = self._now()
+            variation = {
+                "id": variation_id, "parent_id": parent_id, "sku": "", "price": "", "regular_price": "",
+                "sale_price": "", "manage_stock": False, "stock_quantity": None, "stock_status": "instock",
+                "attributes": [], "image": None, "date_created": created, "date_created_gmt": created_gmt
+            }
+            self._apply_variation_data(variation, data)
+            self.variations.setdefault(parent_id, {})[variation_id] = variation
+            parent["variations"].append(variation_id)
+            return variation
+    
+    def update_variation(self, parent_id: int, variation_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Обновление вариации"""
+        with self._lock:
+            variation = self.variations.get(parent_id, {}).get(variation_id)
+            if variation is None:
+                raise ApiError(404, "woocommerce_rest_product_variation_invalid_id", "Неверный ID вариации.")
+            self._apply_variation_data(variation, data)
+            return variation
+    
+    def delete_variation(self, parent_id: int, variation_id: int) -> Dict[str, Any]:
+        """Удаление вариации"""
+        with self._lock:
+            variation = self.variations.get(parent_id, {}).pop(variation_id, None)
+            if variation is None:
+                raise ApiError(404, "woocommerce_rest_product_variation_invalid_id", "Неверный ID вариации.")
+            parent = self.products.get(parent_id)
+            if parent and variation_id in parent["variations"]:
+                parent["variations"].remove(variation_id)
+            return variation
+    
+    def _apply_variation_data(self, variation: Dict[str, Any], data: Dict[str, Any]):
+        for key, value in data.items():
+            if key not in ("id", "parent_id", "date_created", "date_created_gmt"):
+                variation[key] = value
+        variation["price"] = variation.get("sale_price") or variation.get("regular_price") or ""
+        variation["date_modified"], variation["date_modified_gmt"] = self._now()
+    
+    def create_category(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Создание категории"""
+        with self._lock:
+            category_id = self._new_id()
+            category = {"id": category_id, "name": data.get("name", ""), "slug": data.get("slug") or f"cat-{category_id}",
+                        "parent": data.get("parent", 0), "description": data.get("description", ""), "count": 0}
+            self.categories[category_id] = category
+            return category
+    
+    def create_attribute(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Создание атрибута"""
+        with self._lock:
+            attribute_id = self._new_id()
+            attribute = {"id": attribute_id, "name": data.get("name", ""),
+                         "slug": data.get("slug") or f"pa_{attribute_id}", "type": data.get("type", "select"),
+                         "order_by": data.get("order_by", "menu_order"),
+                         "has_archives": data.get("has_archives", False)}
+            self.attributes[attribute_id] = attribute
+            self.terms[attribute_id] = {}
+            return attribute
+    
+    def create_term(self, attribute_id: int, data: Dict[str, Any]) -> Dict[str, Any]:
+        """Создание значения атрибута"""
+        with self._lock:
+            if attribute_id not in self.attributes:
+                raise ApiError(404, "woocommerce_rest_taxonomy_invalid", "Ресурс не существует.")
+            term_id = self._new_id()
+            term = {"id": term_id, "name": data.get("name", ""), "slug": data.get("slug") or f"term-{term_id}",
+                    "description": data.get("description", ""), "menu_order": 0, "count": 0}
+            self.terms[attribute_id][term_id] = term
+            return term
+    
+    def _build_routes(self) -> List[Tuple['re.Pattern', Dict[str, Callable]]]:
+        """Таблица маршрутов: шаблон пути -> обработчики по методам"""
+        return [
+            (re.compile(r"^products$"), {"GET": self._list_products, "POST": self._post_product}),
+            (re.compile(r"^products/batch$"), {"POST": self._batch_products}),
+            (re.compile(r"^products/categories$"), {"GET": self._list_categories, "POST": self._post_category}),
+            (re.compile(r"^products/categories/(\d+)$"), {"GET": self._get_category, "DELETE": self._delete_category}),
+            (re.compile(r"^products/attributes$"), {"GET": self._list_attributes, "POST": self._post_attribute}),
+            (re.compile(r"^products/attributes/(\d+)$"), {"GET": self._get_attribute, "PUT": self._put_attribute,
+                                                          "DELETE": self._delete_attribute}),
+            (re.compile(r"^products/attributes/(\d+)/terms$"), {"GET": self._list_terms, "POST": self._post_term}),
+            (re.compile(r"^products/attributes/(\d+)/terms/(\d+)$"), {"GET": self._get_term,
+                                                                      "DELETE": self._delete_term}),
+            (re.compile(r"^products/(\d+)$"), {"GET": self._get_product, "PUT": self._put_product,
+                                               "DELETE": self._delete_product}),
+            (re.compile(r"^products/(\d+)/variations$"), {"GET": self._list_variations,
+                                                          "POST": self._post_variation}),
+            (re.compile(r"^products/(\d+)/variations/batch$"), {"POST": self._batch_variations}),
+            (re.compile(r"^products/(\d+)/variations/(\d+)$"), {"GET": self._get_variation,
+                                                                "PUT": self._put_variation,
+                                                                "DELETE": self._delete_variation}),
+        ]
+    
+    def handle(self, method: str, path: str, query: Dict[str, str], body: Any) -> Tuple[int, bytes, Dict[str, str]]:
+        """
+        Обработка одного запроса
+        
+        Задержка выдерживается параллельно, а сама операция и сериализация
+        ответа выполняются под блокировкой, чтобы ответ не менялся во время записи.
+        
+        Returns:
+            Tuple: (код ответа, тело JSON, дополнительные заголовки)
+        """
+        with self._lock:
+            self.stats["requests"] += 1
+            roll = self._random.random()
+        
+        if self.latency:
+            time.sleep(self.latency)
+        
+        if roll < self.throttle_rate:
+            with self._lock:
+                self.stats["throttled"] += 1
+            error = ApiError(429, "rest_too_many_requests", "Слишком много запросов.")
+            return 429, self._encode(error.to_dict()), {"Retry-After": f"{self.retry_after:g}"}
+        if roll < self.throttle_rate + self.error_rate:
+            with self._lock:
+                self.stats["errors_injected"] += 1
+            error = ApiError(500, "internal_server_error", "Внутренняя ошибка сервера (имитация).")
+            return 500, self._encode(error.to_dict()), {}
+        
+        with self._lock:
+            status, payload, headers = self._route(method, path, query, body)
+            return status, self._encode(payload), headers
+    
+    def _route(self, method: str, path: str, query: Dict[str, str], body: Any) -> Tuple[int, Any, Dict[str, str]]:
+        """Выбор обработчика по пути и методу"""
+        if not path.startswith(self.API_PREFIX):
+            return 404, ApiError(404, "rest_no_route", "Маршрут не найден.").to_dict(), {}
+        route = path[len(self.API_PREFIX):].strip("/")
+        
+        for pattern, handlers in self._routes:
+            match = pattern.match(route)
+            if not match:
+                continue
+            handler = handlers.get(method)
+            if handler is None:
+                return 404, ApiError(404, "rest_no_route", "Метод не поддерживается.").to_dict(), {}
+            try:
+                ids = [int(group) for group in match.groups()]
+                return handler(*ids, query=query, body=body or {})
+            except ApiError as e:
+                return e.status, e.to_dict(), {}
+        
+        return 404, ApiError(404, "rest_no_route", "Маршрут не найден.").to_dict(), {}
+    
+    def _encode(self, payload: Any) -> bytes:
+        return json.dumps(payload, ensure_ascii=False).encode("utf-8")
+    
+    def _paginate(self, items: List[Dict[str, Any]], query: Dict[str, str]) -> Tuple[int, Any, Dict[str, str]]:
+        """Страница коллекции с заголовками X-WP-Total / X-WP-TotalPages и проекцией _fields"""
+        try:
+            per_page = int(query.get("per_page", 10))
+            page = int(query.get("page", 1))
+        except ValueError:
+            raise ApiError(400, "rest_invalid_param", "Неверный параметр: per_page или page")
+        if not 1 <= per_page <= self.MAX_PER_PAGE:
+            raise ApiError(400, "rest_invalid_param", f"per_page должен быть от 1 до {self.MAX_PER_PAGE}")
+        if page < 1:
+            raise ApiError(400, "rest_invalid_param", "page должен быть не меньше 1")
+        
+        total = len(items)
+        total_pages = -(-total // per_page)
+        if page > max(total_pages, 1):
+            raise ApiError(400, "rest_post_invalid_page_number", "Номер страницы больше числа страниц.")
+        
+        page_items = [self._project(item, query) for item in items[(page - 1) * per_page:page * per_page]]
+        return 200, page_items, {"X-WP-Total": str(total), "X-WP-TotalPages": str(total_pages)}
+    
+    def _project(self, item: Dict[str, Any], query: Dict[str, str]) -> Dict[str, Any]:
+        fields = query.get("_fields")
+        if not fields:
+            return item
+        return {key: item[key] for key in fields.split(",") if key in item}
+    
+    def _product_ids(self) -> List[int]:
+        """ID товаров в порядке WooCommerce по умолчанию (новые первыми)"""
+        with self._lock:
+            if self._product_order is None:
+                self._product_order = sorted(self.products, reverse=True)
+            return self._product_order
+    
+    def _list_products(self, query, body):
+        ids = self._product_ids()
+        if "include" in query:
+            include = {int(value) for value in query["include"].split(",") if value}
+            ids = [product_id for product_id in ids if product_id in include]
+        if "sku" in query:
+            skus = query["sku"].split(",")
+            ids = sorted({self._skus[sku] for sku in skus if sku in self._skus}, reverse=True)
+        
+        items = [self.products[product_id] for product_id in ids if product_id in self.products]
+        if "modified_after" in query:
+            items = [item for item in items if item["date_modified_gmt"] > query["modified_after"]]
+        for key in ("status", "type"):
+            if key in query and query[key] != "any":
+                items = [item for item in items if item[key] == query[key]]
+        if "search" in query:
+            needle = query["search"].lower()
+            items = [item for item in items if needle in item["name"].lower()]
+        return self._paginate(items, query)
+    
+    def _post_product(self, query, body):
+        return 201, self.create_product(body), {}
+    
+    def _get_product(self, product_id, query, body):
+        product = self.products.get(product_id)
+        if product is None:
+            raise ApiError(404, "woocommerce_rest_product_invalid_id", "Неверный ID.")
+        return 200, self._project(product, query), {}
+    
+    def _put_product(self, product_id, query, body):
+        return 200, self.update_product(product_id, body), {}
+    
+    def _delete_product(self, product_id, query, body):
+        return 200, self.delete_product(product_id), {}
+    
+    def _run_batch(self, body: Dict[str, Any], create: Callable, update: Callable,
+                   delete: Callable) -> Tuple[int, Any, Dict[str, str]]:
+        """Пакетная операция: ошибки отдельных элементов возвращаются в их позициях"""
+        total = sum(len(body.get(kind) or []) for kind in ("create", "update", "delete"))
+        if total > self.MAX_BATCH_ITEMS:
+            raise ApiError(413, "rest_request_entity_too_large",
+                           f"Не более {self.MAX_BATCH_ITEMS} объектов в пакете.")
+        
+        def run(func, *args):
+            try:
+                return func(*args)
+            except ApiError as e:
+                return {"id": 0, "error": e.to_dict()}
+        
+        result = {}
+        if "create" in body:
+            result["create"] = [run(create, item) for item in body["create"]]
+        if "update" in body:
+            result["update"] = [run(update, int(item.get("id") or 0), item) for item in body["update"]]
+        if "delete" in body:
+            result["delete"] = [run(delete, int(item)) for item in body["delete"]]
+        return 200, result, {}
+    
+    def _batch_products(self, query, body):
+        return self._run_batch(body, self.create_product, self.update_product, self.delete_product)
+    
+    def _list_variations(self, parent_id, query, body):
+        if parent_id not in self.products:
+            raise ApiError(404, "woocommerce_rest_product_invalid_id", "Неверный ID.")
+        variations = self.variations.get(parent_id, {})
+        return self._paginate([variations[key] for key in sorted(variations, reverse=True)], query)
+    
+    def _post_variation(self, parent_id, query, body):
+        return 201, self.create_variation(parent_id, body), {}
+    
+    def _get_variation(self, parent_id, variation_id, query, body):
+        variation = self.variations.get(parent_id, {}).get(variation_id)
+        if variation is None:
+            raise ApiError(404, "woocommerce_rest_product_variation_invalid_id", "Неверный ID вариации.")
+        return 200, variation, {}
+    
+    def _put_variation(self, parent_id, variation_id, query, body):
+        return 200, self.update_variation(parent_id, variation_id, body), {}
+    
+    def _delete_variation(self, parent_id, variation_id, query, body):
+        return 200, self.delete_variation(parent_id, variation_id), {}
+    
+    def _batch_variations(self, parent_id, query, body):
+        if parent_id not in self.products:
+            raise ApiError(404, "woocommerce_rest_product_invalid_id", "Неверный ID.")
+        return self._run_batch(
+            body,
+            lambda data: self.create_variation(parent_id, data),
+            lambda variation_id, data: self.update_variation(parent_id, variation_id, data),
+            lambda variation_id: self.delete_variation(parent_id, variation_id)
+        )
+    
+    def _list_categories(self, query, body):
+        return self._paginate([self.categories[key] for key in sorted(self.categories)], query)
+    
+    def _post_category(self, query, body):
+        return 201, self.create_category(body), {}
+    
+    def _get_category(self, category_id, query, body):
+        category = self.categories.get(category_id)
+        if category is None:
+            raise ApiError(404, "woocommerce_rest_term_invalid", "Ресурс не существует.")
+        return 200, category, {}
+    
+    def _delete_category(self, category_id, query, body):
+        with self._lock:
+            category = self.categories.pop(category_id, None)
+        if category is None:
+            raise ApiError(404, "woocommerce_rest_term_invalid", "Ресурс не существует.")
+        return 200, category, {}
+    
+    def _list_attributes(self, query, body):
+        # Как и в WooCommerce, атрибуты отдаются все сразу, без постраничного вывода
+        return 200, [self._project(self.attributes[key], query) for key in sorted(self.attributes)], {}
+    
+    def _post_attribute(self, query, body):
+        return 201, self.create_attribute(body), {}
+    
+    def _get_attribute(self, attribute_id, query, body):
+        attribute = self.attributes.get(attribute_id)
+        if attribute is None:
+            raise ApiError(404, "woocommerce_rest_taxonomy_invalid", "Ресурс не существует.")
+        return 200, attribute, {}
+    
+    def _put_attribute(self, attribute_id, query, body):
+        with self._lock:
+            attribute = self.attributes.get(attribute_id)
+            if attribute is None:
+                raise ApiError(404, "woocommerce_rest_taxonomy_invalid", "Ресурс не существует.")
+            attribute.update({key: value for key, value in body.items() if key != "id"})
+            return 200, attribute, {}
+    
+    def _delete_attribute(self, attribute_id, query, body):
+        with self._lock:
+            attribute = self.attributes.pop(attribute_id, None)
+            self.terms.pop(attribute_id, None)
+        if attribute is None:
+            raise ApiError(404, "woocommerce_rest_taxonomy_invalid", "Ресурс не существует.")
+        return 200, attribute, {}
+    
+    def _list_terms(self, attribute_id, query, body):
+        terms = self.terms.get(attribute_id)
+        if terms is None:
+            raise ApiError(404, "woocommerce_rest_taxonomy_invalid", "Ресурс не существует.")
+        return self._paginate([terms[key] for key in sorted(terms)], query)
+    
+    def _post_term(self, attribute_id, query, body):
+        return 201, self.create_term(attribute_id, body), {}
+    
+    def _get_term(self, attribute_id, term_id, query, body):
+        term = self.terms.get(attribute_id, {}).get(term_id)
+        if term is None:
+            raise ApiError(404, "woocommerce_rest_term_invalid", "Ресурс не существует.")
+        return 200, term, {}
+    
+    def _delete_term(self, attribute_id, term_id, query, body):
+        with self._lock:
+            term = self.terms.get(attribute_id, {}).pop(term_id, None)
+        if term is None:
+            raise ApiError(404, "woocommerce_rest_term_invalid", "Ресурс не существует.")
+        return 200, term, {}
+
+class _RequestHandler(BaseHTTPRequestHandler):
+    """HTTP-обработчик, передающий запросы имитатору (атрибут mock задается при запуске)"""
+    
+    protocol_version = "HTTP/1.1"
+    # Заголовки и тело пишутся отдельно; без этого keep-alive ответы ждут отложенного ACK
+    disable_nagle_algorithm = True
+    mock: MockWooCommerceServer = None
+    
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+    
+    def handle(self):
+        try:
+            super().handle()
+        except (BrokenPipeError, ConnectionResetError):
+            # Клиент отменил запрос и закрыл соединение, не дождавшись ответа
+            self.close_connection = True
+    
+    def _dispatch(self, method: str):
+        parsed = urlparse(self.path)
+        query = {key: values[-1] for key, values in parse_qs(parsed.query).items()}
+        
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        try:
+            body = json.loads(raw) if raw else None
+        except ValueError:
+            self._send(400, self.mock._encode(ApiError(400, "rest_invalid_json", "Неверное тело JSON.").to_dict()), {})
+            return
+        
+        # Клиенты без поддержки PUT/DELETE передают метод в параметре _method
+        method = query.pop("_method", method).upper()
+        status, payload, headers = self.mock.handle(method, parsed.path, query, body)
+        self._send(status, payload, headers)
+    
+    def _send(self, status: int, data: bytes, headers: Dict[str, str]):
+        if self.mock.etags and status == 200 and self.command == "GET":
+            etag = '"' + hashlib.md5(data).hexdigest() + '"'
+            headers = dict(headers, ETag=etag)
+            if self.headers.get("If-None-Match") == etag:
+                with self.mock._lock:
+                    self.mock.stats["not_modified"] += 1
+                status, data = 304, b""
+        
+        with self.mock._lock:
+            self.mock.stats["bytes_sent"] += len(data)
+        
+        self.send_response(status)
+        if status != 304:
+            self.send_header("Content-Type", "application/json; charset=UTF-8")
+        self.send_header("Content-Length", str(len(data)))
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.end_headers()
+        if data:
+            self.wfile.write(data)
+    
+    def do_GET(self):
+        self._dispatch("GET")
+    
+    def do_POST(self):
+        self._dispatch("POST")
+    
+    def do_PUT(self):
+        self._dispatch("PUT")
+    
+    def do_DELETE(self):
+        self._dispatch("DELETE")
+
+def main():
+    """Запуск имитатора из командной строки"""
+    parser = argparse.ArgumentParser(description="Локальный имитатор WooCommerce REST API")
+    parser.add_argument("--host", default="127.0.0.1", help="Адрес для прослушивания")
+    parser.add_argument("--port", type=int, default=8080, help="Порт")
+    parser.add_argument("--products", type=int, default=1000, help="Количество товаров")
+    parser.add_argument("--latency", type=float, default=0.0, help="Задержка ответа, сек")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Доля ответов 500")
+    parser.add_argument("--throttle-rate", type=float, default=0.0, help="Доля ответов 429")
+    parser.add_argument("--etags", action="store_true", help="Поддержка ETag / 304")
+    parser.add_argument("--seed", type=int, default=0, help="Начальное значение генератора")
+    args = parser.parse_args()
+    
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    
+    server = MockWooCommerceServer(args.host, args.port, latency=args.latency, error_rate=args.error_rate,
+                                   throttle_rate=args.throttle_rate, etags=args.etags, seed=args.seed)
+    server.populate(products=args.products, seed=args.seed)
+    server.start()
+    print(f"🛒 Имитатор WooCommerce: {server.url} (любые ключи API)")
+    print("Нажмите Ctrl+C для остановки")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        server.stop()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+"""
+Отправка одного набора изменений в несколько магазинов (профилей подключения)
+Товары сопоставляются с магазинами по SKU: ID, категории и глобальные атрибуты
+у каждого магазина свои, поэтому они подбираются по каждому магазину отдельно.
+Каждый магазин обрабатывается своим менеджером - со своими ограничением частоты,
+числом параллельных запросов и размером пакета из настроек профиля.
+"""
+import time
+import json
+import logging
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Optional, Callable, Iterable, Tuple
+
+from config import config_manager
+from operation_journal import OperationJournal
+from product_models import Product
+from request_scheduler import ContextThreadPoolExecutor
+from sync_planner import SyncPlan
+from woocommerce_manager import WooCommerceManager
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class ChangeSet:
+    """Набор изменений, не привязанный к ID конкретного магазина"""
+    create: List[Product] = field(default_factory=list)
+    update: List[Product] = field(default_factory=list)
+    delete: List[Product] = field(default_factory=list)
+    # Обновление должно содержать все данные товара (иначе - только измененные поля)
+    full_update: bool = False
+    
+    @classmethod
+    def from_plan(cls, plan: SyncPlan) -> 'ChangeSet':
+        """Изменения из плана сохранения текущего магазина"""
+        return cls(create=list(plan.create), update=list(plan.update), delete=list(plan.delete))
+    
+    @classmethod
+    def upsert(cls, products: Iterable[Product]) -> 'ChangeSet':
+        """Создание или полное обновление товаров (например, после импорта CSV)"""
+        return cls(create=list(products), full_update=True)
+    
+    def total(self) -> int:
+        """Количество товаров в наборе"""
+        return len(self.create) + len(self.update) + len(self.delete)
+
+@dataclass
+class StoreReport:
+    """Результат отправки в один магазин"""
+    profile: str
+    site_url: str = ""
+    created: int = 0
+    updated: int = 0
+    deleted: int = 0
+    # Товары, которые не отправлялись: {"sku", "name", "reason"}
+    skipped: List[Dict[str, str]] = field(default_factory=list)
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    # Замечания: категории, которых нет в магазине, и т.п.
+    warnings: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+    # Ошибка, из-за которой магазин не обработан целиком (нет подключения и т.п.)
+    fatal: Optional[str] = None
+    # Товары, изменения которых магазин подтвердил: (товар, ID в магазине; None - товара в магазине нет)
+    acknowledged: List[Tuple[Product, Optional[int]]] = field(default_factory=list, repr=False)
+    
+    @property
+    def status(self) -> str:
+        """ok - без ошибок, partial - часть товаров с ошибками, failed - магазин не обработан"""
+        if self.fatal:
+            return "failed"
+        return "partial" if self.errors else "ok"
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Представление для JSON"""
+        return {
+            "profile": self.profile,
+            "site_url": self.site_url,
+            "status": self.status,
+            "created": self.created,
+            "updated": self.updated,
+            "deleted": self.deleted,
+            "skipped": self.skipped,
+            "errors": self.errors,
+            "warnings": self.warnings,
+            "seconds": round(self.seconds, 3),
+            "fatal": self.fatal
+        }
+
+@dataclass
+class MultiStoreReport:
+    """Результат отправки во все магазины"""
+    stores: List[StoreReport] = field(default_factory=list)
+    
+    def summary(self) -> str:
+        """Краткий отчет по магазинам для показа пользователю"""
+        icons = {"ok": "✅", "partial": "⚠️", "failed": "❌"}
+        lines = []
+        for store in self.stores:
+            if store.fatal:
+                lines.append(f"{icons[store.status]} {store.profile}: {store.fatal}")
+                continue
+            line = (f"{icons[store.status]} {store.profile}: создано {store.created}, обновлено {store.updated}, "
+                    f"удалено {store.deleted}")
+            if store.skipped:
+                line += f", пропущено {len(store.skipped)}"
+            if store.errors:
+                line += f", ошибок {len(store.errors)}"
+            lines.append(f"{line} ({store.seconds:.1f} с)")
+        return "\n".join(lines)
+    
+    def save(self, path: str) -> bool:
+        """Сохранение отчета в JSON"""
+        try:
+            with open(path, "w", encoding="utf-8") as f:
+                json.dump({"stores": [store.to_dict() for store in self.stores]}, f, ensure_ascii=False, indent=2)
+            return True
+        except OSError as e:
+            logger.error(f"Ошибка сохранения отчета: {e}")
+            return False
+
+class MultiStorePush:
+    """
+    Отправка набора изменений в несколько магазинов параллельно
+    
+    Для каждого магазина:
+        - SKU товаров ищутся на сайте (WooCommerceManager.resolve_skus);
+        - новый товар, SKU которого уже есть в магазине, обновляется, а не создается;
+        - обновляемый товар, которого нет в магазине, создается (create_missing) или пропускается;
+        - удаляемый товар, которого нет в магазине, пропускается;
+        - категории подбираются по названию, глобальные атрибуты - по названию
+          (не найденный атрибут отправляется как атрибут товара).
+    Вариации не отправляются, как и при обычном сохранении.
+    """
+    
+    def __init__(self, journal: Optional[OperationJournal] = None, create_missing: bool = True,
+                 max_parallel_stores: int = 4):
+        """
+        Args:
+            journal: Журнал операций (результат каждого пакета фиксируется по каждому магазину)
+            create_missing: Создавать обновляемые товары, которых нет в магазине
+            max_parallel_stores: Сколько магазинов обрабатывается одновременно
+        """
+        self.journal = journal
+        self.create_missing = create_missing
+        self.max_parallel_stores = max(1, max_parallel_stores)
+    
+    def push(self, changes: ChangeSet, profiles: List[str],
+             overrides: Optional[Dict[str, Dict[str, Any]]] = None,
+             on_store_done: Optional[Callable[[StoreReport], None]] = None) -> MultiStoreReport:
+        """
+        Отправка изменений в магазины
+        
+        Args:
+            changes: Набор изменений
+            profiles: Имена профилей подключения
+            overrides: Настройки отдельных магазинов поверх профиля, например
+                       {"shop2": {"max_workers": 2, "rate_limit": 5}}
+            on_store_done: Вызывается по завершении каждого магазина (из рабочего потока)
+        
+        Returns:
+            MultiStoreReport: Отчеты в порядке profiles
+        """
+        overrides = overrides or {}
+        
+        def run(profile):
+            config = config_manager.get_profile_config(profile)
+            if config:
+                config.update(overrides.get(profile, {}))
+            report = self._push_store(profile, config, changes)
+            if on_store_done:
+                on_store_done(report)
+            return report
+        
+        with ContextThreadPoolExecutor(max_workers=min(self.max_parallel_stores, max(1, len(profiles)))) as executor:
+            reports = list(executor.map(run, profiles))
+        
+        report = MultiStoreReport(reports)
+        logger.info(f"Отправка в {len(profiles)} магазинов завершена:\n{report.summary()}")
+        return report
+    
+    def push_config(self, profile: str, config: Dict[str, Any], changes: ChangeSet) -> StoreReport:
+        """Отправка в один магазин с явными настройками подключения (без профиля)"""
+        return self._push_store(profile, config, changes)
+    
+    def _push_store(self, profile: str, config: Dict[str, Any], changes: ChangeSet) -> StoreReport:
+        """Отправка изменений в один магазин"""
+        report = StoreReport(profile=profile, site_url=config.get("site_url", ""))
+        started = time.monotonic()
+        try:
+            if not config:
+                report.fatal = "Профиль подключения не найден"
+                return report
+            
+            manager = WooCommerceManager(config)
+            if not manager.api:
+                report.fatal = "Не удалось инициализировать подключение"
+                return report
+            
+            self._send(manager, changes, report)
+        except Exception as e:
+            report.fatal = f"Ошибка отправки: {e}"
+            logger.error(f"Магазин {profile}: {report.fatal}")
+        finally:
+            report.seconds = time.monotonic() - started
+        return report
+    
+    def _send(self, manager: WooCommerceManager, changes: ChangeSet, report: StoreReport):
+        """Сопоставление товаров с магазином и отправка пакетами"""
+        all_products = changes.create + changes.update + changes.delete
+        for product in all_products:
+            if not product.sku:
+                report.skipped.append({"sku": "", "name": product.name, "reason": "Нет артикула для сопоставления"})
+        
+        skus = {product.sku for product in all_products if product.sku}
+        resolved = manager.resolve_skus(skus)
+        if skus and len(resolved["failed"]) == len(skus):
+            report.fatal = "Магазин недоступен: не удалось проверить ни один SKU"
+            return
+        failed = set(resolved["failed"])
+        if resolved["duplicates"]:
+            report.warnings.append(f"Артикулы встречаются в магазине несколько раз: "
+                                   f"{', '.join(sorted(resolved['duplicates'])[:10])}")
+        
+        def store_id(product):
+            ids = resolved["duplicates"].get(product.sku)
+            return ids[0] if ids else resolved["found"].get(product.sku)
+        
+        taxonomy = self._taxonomy(manager, all_products)
+        new_products = {id(product) for product in changes.create}
+        operations = {"create": [], "update": [], "delete": []}
+        sent: Dict[str, List[Product]] = {"create": [], "update": [], "delete": []}
+        
+        def add(kind, product, payload):
+            operations[kind].append(payload)
+            sent[kind].append(product)
+        
+        for product in changes.create + changes.update:
+            if not product.sku:
+                continue
+            if product.sku in failed:
+                report.errors.append({"sku": product.sku, "name": product.name,
+                                      "error": "Не удалось проверить SKU на сайте"})
+                continue
+            
+            product_id = store_id(product)
+            is_new = id(product) in new_products
+            full = changes.full_update or is_new or not product_id
+            payload = self._localize(product.to_woocommerce_dict() if full else product.get_changes(),
+                                     product, taxonomy, report)
+            if product_id:
+                payload["id"] = product_id
+                add("update", product, payload)
+            elif is_new or self.create_missing:
+                add("create", product, payload)
+            else:
+                report.skipped.append({"sku": product.sku, "name": product.name, "reason": "Нет в магазине"})
+        
+        for product in changes.delete:
+            if not product.sku:
+                continue
+            product_id = store_id(product)
+            if product_id:
+                add("delete", product, product_id)
+            elif product.sku in failed:
+                report.errors.append({"sku": product.sku, "name": product.name,
+                                      "error": "Не удалось проверить SKU на сайте"})
+            else:
+                report.skipped.append({"sku": product.sku, "name": product.name, "reason": "Уже отсутствует в магазине"})
+                report.acknowledged.append((product, None))
+        
+        if not any(operations.values()):
+            return
+        
+        sync_id = None
+        if self.journal:
+            sync_id = self.journal.begin(manager.profile_key, {
+                kind: [{"sku": product.sku, "name": product.name,
+                        "product_id": payload.get("id") if isinstance(payload, dict) else payload,
+                        "payload": payload}
+                       for product, payload in zip(sent[kind], operations[kind])]
+                for kind in operations
+            })
+        
+        summary = manager.batch_products(
+            create=operations["create"],
+            update=operations["update"],
+            delete=operations["delete"],
+            on_chunk=(lambda entries: self.journal.acknowledge(sync_id, entries)) if sync_id else None
+        )
+        if sync_id:
+            self.journal.finish(sync_id)
+        
+        counters = {"create": "created", "update": "updated", "delete": "deleted"}
+        for kind in operations:
+            for product, item in zip(sent[kind], summary[kind]["items"]):
+                error = item.get("error")
+                if kind == "delete" and OperationJournal.is_already_deleted(error):
+                    # Товар удалили на сайте, пока шла отправка
+                    report.skipped.append({"sku": product.sku, "name": product.name,
+                                           "reason": "Уже отсутствует в магазине"})
+                    report.acknowledged.append((product, None))
+                elif error:
+                    message = error.get("message", "") if isinstance(error, dict) else str(error)
+                    report.errors.append({"sku": product.sku, "name": product.name, "error": message})
+                else:
+                    setattr(report, counters[kind], getattr(report, counters[kind]) + 1)
+                    store_product_id = None
+                    if kind == "create":
+                        store_product_id = (item.get("data") or {}).get("id")
+                    elif kind == "update":
+                        store_product_id = item["input"].get("id")
+                    report.acknowledged.append((product, store_product_id))
+    
+    def _taxonomy(self, manager: WooCommerceManager, products: List[Product]) -> Dict[str, Any]:
+        """Категории и глобальные атрибуты магазина: {название в нижнем регистре: ID}"""
+        taxonomy = {"categories": {}, "attributes": {}}
+        if any(product.categories for product in products):
+            taxonomy["categories"] = {
+                item.get("name", "").strip().lower(): item["id"] for item in manager.get_categories()
+            }
+        if any(product.attributes for product in products):
+            taxonomy["attributes"] = {
+                item.get("name", "").strip().lower(): item["id"] for item in manager.get_attributes()
+            }
+        # Категории, о которых уже предупредили
+        taxonomy["missing_categories"] = set()
+        return taxonomy
+    
+    def _localize(self, payload: Dict[str, Any], product: Product, taxonomy: Dict[str, Any],
+                  report: StoreReport) -> Dict[str, Any]:
+        """Замена ID категорий и атрибутов исходного магазина на ID магазина назначения"""
+        payload = dict(payload)
+        payload.pop("id", None)
+        
+        if "categories" in payload:
+            categories = []
+            for category in product.categories:
+                category_id = taxonomy["categories"].get(category.name.strip().lower())
+                if category_id:
+                    categories.append({"id": category_id})
+                elif category.name not in taxonomy["missing_categories"]:
+                    taxonomy["missing_categories"].add(category.name)
+                    report.warnings.append(f"Категории «{category.name}» нет в магазине")
+            payload["categories"] = categories
+        
+        if "attributes" in payload:
+            payload["attributes"] = [
+                # Атрибут, которого нет среди глобальных, сохраняется как атрибут товара (id 0)
+                dict(attribute, id=taxonomy["attributes"].get(str(attribute.get("name", "")).strip().lower(), 0))
+                for attribute in payload["attributes"]
+            ]
+        return payload
@@ -0,0 +1,87 @@
+"""
+Диалог выбора магазинов для отправки изменений в несколько магазинов
+"""
+import customtkinter as ctk
+from tkinter import messagebox
+from typing import List, Optional
+
+class MultiStoreDialog:
+    """Выбор профилей подключения и параметров отправки"""
+    
+    def __init__(self, parent, profiles: List[str], description: str, current_profile: Optional[str] = None,
+                 create_missing: bool = True):
+        """
+        Инициализация диалога
+        
+        Args:
+            parent: Родительское окно
+            profiles: Имена профилей подключения
+            description: Что будет отправлено (количество операций)
+            current_profile: Текущий профиль (отмечается по умолчанию)
+            create_missing: Начальное значение флага создания отсутствующих товаров
+        """
+        self.parent = parent
+        self.profiles = profiles
+        self.description = description
+        self.result = None
+        
+        self.profile_vars = {name: ctk.BooleanVar(value=name == current_profile) for name in profiles}
+        self.create_missing_var = ctk.BooleanVar(value=create_missing)
+        
+        self.setup_dialog()
+    
+    def setup_dialog(self):
+        """Настройка диалогового окна"""
+        height = min(600, 280 + 30 * len(self.profiles))
+        self.dialog = ctk.CTkToplevel(self.parent)
+        self.dialog.title("Отправка в несколько магазинов")
+        self.dialog.geometry(f"460x{height}")
+        self.dialog.transient(self.parent)
+        self.dialog.grab_set()
+        
+        # Центрируем окно
+        self.dialog.update_idletasks()
+        x = (self.dialog.winfo_screenwidth() // 2) - (460 // 2)
+        y = (self.dialog.winfo_screenheight() // 2) - (height // 2)
+        self.dialog.geometry(f"460x{height}+{x}+{y}")
+        
+        self.setup_ui()
+    
+    def setup_ui(self):
+        """Настройка интерфейса"""
+        ctk.CTkLabel(self.dialog, text="Отправка в несколько магазинов",
+                     font=ctk.CTkFont(size=18, weight="bold")).pack(pady=10)
+        ctk.CTkLabel(self.dialog, text=self.description, justify="left",
+                     font=ctk.CTkFont(size=12)).pack(pady=5)
+        
+        # Список профилей
+        profiles_frame = ctk.CTkScrollableFrame(self.dialog, label_text="Магазины")
+        profiles_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        for name in self.profiles:
+            ctk.CTkCheckBox(profiles_frame, text=name, variable=self.profile_vars[name]).pack(anchor="w", pady=2)
+        
+        ctk.CTkCheckBox(self.dialog, text="Создавать товары, которых нет в магазине",
+                        variable=self.create_missing_var).pack(anchor="w", padx=20, pady=5)
+        ctk.CTkLabel(self.dialog, text="Товары сопоставляются по артикулу (SKU)",
+                     font=ctk.CTkFont(size=11), text_color="gray").pack(anchor="w", padx=20)
+        
+        # Кнопки действий
+        action_frame = ctk.CTkFrame(self.dialog)
+        action_frame.pack(fill="x", padx=20, pady=10)
+        ctk.CTkButton(action_frame, text="Отмена", command=self.cancel).pack(side="left", padx=5)
+        ctk.CTkButton(action_frame, text="Отправить", command=self.confirm).pack(side="right", padx=5)
+    
+    def confirm(self):
+        """Подтверждение выбора"""
+        selected = [name for name in self.profiles if self.profile_vars[name].get()]
+        if not selected:
+            messagebox.showwarning("Предупреждение", "Выберите хотя бы один магазин", parent=self.dialog)
+            return
+        
+        self.result = {"profiles": selected, "create_missing": self.create_missing_var.get()}
+        self.dialog.destroy()
+    
+    def cancel(self):
+        """Отмена отправки"""
+        self.result = None
+        self.dialog.destroy()
@@ -0,0 +1,330 @@
+"""
+Журнал пакетных операций сохранения (write-ahead)
+Перед отправкой план записывается в журнал, а результат каждого пакета
+фиксируется сразу по его завершении. После сбоя или обрыва связи по журналу
+видно, какие операции не подтверждены сервером: прерванную синхронизацию
+можно продолжить, а созданные, но не подтвержденные товары найти по SKU.
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Tuple, Iterable, NamedTuple
+
+logger = logging.getLogger(__name__)
+
+class JournalOperation(NamedTuple):
+    """Операция из журнала"""
+    sync_id: int
+    kind: str
+    position: int
+    sku: str
+    name: str
+    product_id: Optional[int]
+    payload: Any
+    status: str
+    error: Optional[str]
+
+class OperationJournal:
+    """Журнал синхронизаций в SQLite"""
+    
+    DEFAULT_PATH = os.path.join("cache", "journal.db")
+    
+    # Завершенные синхронизации хранятся столько дней
+    RETENTION_DAYS = 7
+    
+    # Состояния операций
+    PENDING = "pending"    # записана до отправки; результат не получен
+    DONE = "done"          # подтверждена сервером
+    FAILED = "failed"      # отклонена сервером, изменений на сайте нет
+    
+    # Состояния синхронизаций
+    RUNNING = "running"        # выполняется или прервана сбоем приложения
+    INCOMPLETE = "incomplete"  # завершена, но часть операций не подтверждена
+    COMPLETED = "completed"
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS syncs (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            profile TEXT NOT NULL,
+            status TEXT NOT NULL,
+            started_at REAL NOT NULL,
+            finished_at REAL
+        );
+        CREATE TABLE IF NOT EXISTS operations (
+            sync_id INTEGER NOT NULL REFERENCES syncs (id) ON DELETE CASCADE,
+            kind TEXT NOT NULL,
+            position INTEGER NOT NULL,
+            sku TEXT NOT NULL DEFAULT '',
+            name TEXT NOT NULL DEFAULT '',
+            product_id INTEGER,
+            payload TEXT NOT NULL,
+            status TEXT NOT NULL,
+            result_id INTEGER,
+            error TEXT,
+            PRIMARY KEY (sync_id, kind, position)
+        );
+        CREATE INDEX IF NOT EXISTS idx_operations_pending ON operations (status, kind, sku);
+    """
+    
+    # Коды ошибок пакета, при которых неизвестно, выполнил ли сервер операции
+    UNCERTAIN_CODES = ("request_failed", "missing_result")
+    
+    def __init__(self, path: str = DEFAULT_PATH):
+        """
+        Инициализация журнала
+        
+        Args:
+            path: Путь к файлу базы данных
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        # Запись должна пережить сбой приложения, поэтому synchronous=FULL
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=FULL")
+        self._conn.execute("PRAGMA foreign_keys=ON")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+    
+    def close(self):
+        """Закрытие соединения с базой"""
+        with self._lock:
+            self._conn.close()
+    
+    def begin(self, profile: str, operations: Dict[str, List[Dict[str, Any]]]) -> Optional[int]:
+        """
+        Запись плана до отправки
+        
+        Args:
+            profile: Ключ профиля подключения
+            operations: {"create" | "update" | "delete": [{"sku", "name", "product_id", "payload"}, ...]};
+                        позиция операции - ее индекс в списке вида
+        
+        Returns:
+            int: ID синхронизации или None, если журнал недоступен
+        """
+        try:
+            with self._lock, self._conn:
+                self._prune()
+                sync_id = self._conn.execute(
+                    "INSERT INTO syncs (profile, status, started_at) VALUES (?, ?, ?)",
+                    (profile, self.RUNNING, time.time())
+                ).lastrowid
+                self._conn.executemany(
+                    "INSERT INTO operations (sync_id, kind, position, sku, name, product_id, payload, status) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (sync_id, kind, position, item.get("sku") or "", item.get("name") or "",
+                         item.get("product_id"), json.dumps(item.get("payload"), ensure_ascii=False), self.PENDING)
+                        for kind, items in operations.items()
+                        for position, item in enumerate(items)
+                    ]
+                )
+            return sync_id
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка записи плана в журнал: {e}")
+            return None
+    
+    def acknowledge(self, sync_id: int, entries: List[Tuple[str, Dict[str, Any]]],
+                    positions: Optional[Dict[str, List[int]]] = None):
+        """
+        Фиксация результата одного пакета
+        
+        Args:
+            sync_id: ID синхронизации
+            entries: (вид, результат элемента) из WooCommerceManager._run_batch
+            positions: Соответствие индекса отправленного элемента позиции в журнале
+                       (при продолжении синхронизации отправляется только часть операций)
+        """
+        updates = []
+        for kind, entry in entries:
+            position = positions[kind][entry["index"]] if positions else entry["index"]
+            error = entry["error"]
+            if not error:
+                data = entry["data"] if isinstance(entry["data"], dict) else {}
+                updates.append((self.DONE, data.get("id"), None, sync_id, kind, position))
+            elif self.is_uncertain(error):
+                # Операция могла выполниться: остается неподтвержденной
+                updates.append((self.PENDING, None, self._error_text(error), sync_id, kind, position))
+            elif kind == "delete" and self.is_already_deleted(error):
+                # Товара уже нет на сайте - цель удаления достигнута
+                updates.append((self.DONE, None, None, sync_id, kind, position))
+            else:
+                updates.append((self.FAILED, None, self._error_text(error), sync_id, kind, position))
+        
+        try:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "UPDATE operations SET status = ?, result_id = ?, error = ? "
+                    "WHERE sync_id = ? AND kind = ? AND position = ?", updates
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка записи результата пакета в журнал: {e}")
+    
+    def resolve(self, sync_id: int, kind: str, position: int, status: str,
+                result_id: Optional[int] = None, error: Optional[str] = None):
+        """Изменение состояния одной операции (например, после сверки по SKU)"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE operations SET status = ?, result_id = ?, error = ? "
+                    "WHERE sync_id = ? AND kind = ? AND position = ?",
+                    (status, result_id, error, sync_id, kind, position)
+                )
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка записи в журнал: {e}")
+    
+    def finish(self, sync_id: int) -> str:
+        """
+        Завершение синхронизации
+        
+        Returns:
+            str: COMPLETED, если все операции подтверждены или отклонены, иначе INCOMPLETE
+        """
+        try:
+            with self._lock, self._conn:
+                pending = self._conn.execute(
+                    "SELECT COUNT(*) FROM operations WHERE sync_id = ? AND status = ?", (sync_id, self.PENDING)
+                ).fetchone()[0]
+                status = self.INCOMPLETE if pending else self.COMPLETED
+                self._conn.execute("UPDATE syncs SET status = ?, finished_at = ? WHERE id = ?",
+                                   (status, time.time(), sync_id))
+            if pending:
+                logger.warning(f"Синхронизация {sync_id}: не подтверждено операций: {pending}")
+            return status
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка записи в журнал: {e}")
+            return self.INCOMPLETE
+    
+    def abandon(self, sync_id: int):
+        """Отказ от продолжения: неподтвержденные операции помечаются отклоненными"""
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(
+                    "UPDATE operations SET status = ?, error = ? WHERE sync_id = ? AND status = ?",
+                    (self.FAILED, "Продолжение отменено пользователем", sync_id, self.PENDING)
+                )
+                self._conn.execute("UPDATE syncs SET status = ?, finished_at = ? WHERE id = ?",
+                                   (self.COMPLETED, time.time(), sync_id))
+        except sqlite3.Error as e:
+            logger.error(f"Ошибка записи в журнал: {e}")
+    
+    def unfinished(self, profile: str) -> List[Dict[str, Any]]:
+        """
+        Прерванные синхронизации профиля
+        
+        Returns:
+            List[Dict]: {"id", "status", "started_at", "pending": {вид: количество}}, от старых к новым
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT s.id, s.status, s.started_at, o.kind, COUNT(*) FROM syncs s "
+                "JOIN operations o ON o.sync_id = s.id AND o.status = ? "
+                "WHERE s.profile = ? AND s.status IN (?, ?) GROUP BY s.id, o.kind ORDER BY s.id",
+                (self.PENDING, profile, self.RUNNING, self.INCOMPLETE)
+            ).fetchall()
+        
+        syncs: Dict[int, Dict[str, Any]] = {}
+        for sync_id, status, started_at, kind, count in rows:
+            sync = syncs.setdefault(sync_id, {"id": sync_id, "status": status, "started_at": started_at, "pending": {}})
+            sync["pending"][kind] = count
+        return list(syncs.values())
+    
+    def pending_operations(self, sync_id: int) -> List[JournalOperation]:
+        """Неподтвержденные операции синхронизации в порядке плана"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sync_id, kind, position, sku, name, product_id, payload, status, error FROM operations "
+                "WHERE sync_id = ? AND status = ? ORDER BY kind, position", (sync_id, self.PENDING)
+            ).fetchall()
+        return [self._operation(row) for row in rows]
+    
+    def pending_creates(self, profile: str, skus: Iterable[str]) -> Dict[str, List[JournalOperation]]:
+        """
+        Неподтвержденные создания товаров с данными SKU в прерванных синхронизациях
+        
+        Args:
+            profile: Ключ профиля подключения
+            skus: Артикулы товаров, которые собираются создать
+        
+        Returns:
+            Dict: {sku: [операции]}
+        """
+        wanted = list(dict.fromkeys(sku for sku in skus if sku))
+        found: Dict[str, List[JournalOperation]] = {}
+        with self._lock:
+            # Ограничение SQLite на число параметров запроса
+            for start in range(0, len(wanted), 500):
+                chunk = wanted[start:start + 500]
+                rows = self._conn.execute(
+                    "SELECT o.sync_id, o.kind, o.position, o.sku, o.name, o.product_id, o.payload, o.status, o.error "
+                    "FROM operations o JOIN syncs s ON s.id = o.sync_id "
+                    f"WHERE s.profile = ? AND o.kind = 'create' AND o.status = ? AND o.sku IN ({','.join('?' * len(chunk))})",
+                    (profile, self.PENDING, *chunk)
+                ).fetchall()
+                for row in rows:
+                    found.setdefault(row[3], []).append(self._operation(row))
+        return found
+    
+    @classmethod
+    def is_uncertain(cls, error: Any) -> bool:
+        """Ошибка, после которой неизвестно, выполнил ли сервер операцию (обрыв связи, 5xx)"""
+        code = cls._error_code(error)
+        return code in cls.UNCERTAIN_CODES or code.startswith("http_5")
+    
+    @classmethod
+    def is_already_deleted(cls, error: Any) -> bool:
+        """Ошибка удаления из-за неверного ID: товара (вариации) уже нет на сайте, цель удаления достигнута"""
+        return cls._error_code(error).endswith("_invalid_id")
+    
+    @staticmethod
+    def _error_code(error: Any) -> str:
+        return str(error.get("code", "")) if isinstance(error, dict) else ""
+    
+    @staticmethod
+    def _error_text(error: Any) -> str:
+        return str(error.get("message", "")) if isinstance(error, dict) else str(error)
+    
+    def _operation(self, row: Tuple) -> JournalOperation:
+        return JournalOperation(row[0], row[1], row[2], row[3], row[4], row[5], json.loads(row[6]), row[7], row[8])
+    
+    def _prune(self):
+        """Удаление старых завершенных синхронизаций (под блокировкой)"""
+        now = time.time()
+        # Синхронизации, у которых не осталось неподтвержденных операций (например, сбой после последнего пакета)
+        self._conn.execute(
+            "UPDATE syncs SET status = ?, finished_at = COALESCE(finished_at, ?) WHERE status != ? AND NOT EXISTS "
+            "(SELECT 1 FROM operations o WHERE o.sync_id = syncs.id AND o.status = ?)",
+            (self.COMPLETED, now, self.COMPLETED, self.PENDING)
+        )
+        self._conn.execute("DELETE FROM syncs WHERE status = ? AND finished_at < ?",
+                           (self.COMPLETED, now - self.RETENTION_DAYS * 86400))
+
+# Общий журнал приложения (синхронизации хранят ключ профиля)
+_journal: Optional[OperationJournal] = None
+_journal_lock = threading.Lock()
+
+def get_operation_journal() -> Optional[OperationJournal]:
+    """
+    Получение общего журнала операций
+    
+    Returns:
+        OperationJournal: Журнал или None, если он недоступен
+    """
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            try:
+                _journal = OperationJournal()
+            except sqlite3.Error as e:
+                logger.error(f"Журнал операций недоступен: {e}")
+                return None
+        return _journal
@@ -0,0 +1,369 @@
+"""
+Постоянный кэш данных WooCommerce в SQLite
+Хранит исходный JSON товаров, вариаций, категорий и атрибутов отдельно для каждого
+профиля подключения (ключ профиля - адрес сайта и ключ API)
+"""
+import os
+import json
+import time
+import sqlite3
+import logging
+import threading
+from typing import List, Dict, Any, Optional, Iterable, Set
+
+logger = logging.getLogger(__name__)
+
+class ProductCache:
+    """Кэш товаров и таксономий в SQLite с политикой вытеснения по возрасту и размеру"""
+    
+    DEFAULT_PATH = os.path.join("cache", "products.db")
+    
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS products (
+            profile TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            sku TEXT,
+            status TEXT,
+            date_modified TEXT,
+            data TEXT NOT NULL,
+            PRIMARY KEY (profile, id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_products_sku ON products (profile, sku);
+        CREATE INDEX IF NOT EXISTS idx_products_status ON products (profile, status);
+        CREATE INDEX IF NOT EXISTS idx_products_modified ON products (profile, date_modified);
+        
+        CREATE TABLE IF NOT EXISTS variations (
+            profile TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            parent_id INTEGER NOT NULL,
+            sku TEXT,
+            data TEXT NOT NULL,
+            PRIMARY KEY (profile, id)
+        );
+        CREATE INDEX IF NOT EXISTS idx_variations_parent ON variations (profile, parent_id);
+        
+        CREATE TABLE IF NOT EXISTS categories (
+            profile TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (profile, id)
+        );
+        
+        CREATE TABLE IF NOT EXISTS attributes (
+            profile TEXT NOT NULL,
+            id INTEGER NOT NULL,
+            data TEXT NOT NULL,
+            PRIMARY KEY (profile, id)
+        );
+        
+        CREATE TABLE IF NOT EXISTS sync_state (
+            profile TEXT PRIMARY KEY,
+            high_water_mark TEXT,
+            synced_at REAL,
+            last_used REAL
+        );
+    """
+    
+    PROFILE_TABLES = ("products", "variations", "categories", "attributes", "sync_state")
+    
+    def __init__(self, path: str = DEFAULT_PATH, max_age_days: int = 30, max_size_mb: int = 500):
+        """
+        Инициализация кэша
+        
+        Args:
+            path: Путь к файлу базы данных
+            max_age_days: Профили, не использовавшиеся дольше, вытесняются
+            max_size_mb: Максимальный размер файла кэша
+        """
+        self.path = path
+        self.max_age_days = max_age_days
+        self.max_size_mb = max_size_mb
+        self._lock = threading.RLock()
+        
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(self.SCHEMA)
+        self._conn.commit()
+    
+    def close(self):
+        """Закрытие соединения с базой"""
+        with self._lock:
+            self._conn.close()
+    
+    def get_products(self, profile: str) -> List[Dict[str, Any]]:
+        """Получение всех товаров профиля (по убыванию ID, как в WooCommerce)"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM products WHERE profile = ? ORDER BY id DESC", (profile,)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def get_product(self, profile: str, product_id: int) -> Optional[Dict[str, Any]]:
+        """Получение товара по ID"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT data FROM products WHERE profile = ? AND id = ?", (profile, product_id)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+    
+    def get_product_ids(self, profile: str) -> Set[int]:
+        """Получение ID всех товаров профиля"""
+        with self._lock:
+            rows = self._conn.execute("SELECT id FROM products WHERE profile = ?", (profile,)).fetchall()
+        return {row[0] for row in rows}
+    
+    def get_sku_index(self, profile: str) -> Dict[str, List[int]]:
+        """Соответствие SKU -> ID товаров профиля (по индексу (profile, sku))"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT sku, id FROM products WHERE profile = ? AND sku != '' ORDER BY id", (profile,)
+            ).fetchall()
+        
+        index = {}
+        for sku, product_id in rows:
+            index.setdefault(sku, []).append(product_id)
+        return index
+    
+    def count_products(self, profile: str) -> int:
+        """Количество товаров профиля в кэше"""
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM products WHERE profile = ?", (profile,)).fetchone()[0]
+    
+    def upsert_products(self, profile: str, products: Iterable[Dict[str, Any]]) -> int:
+        """
+        Добавление или обновление товаров
+        
+        Args:
+            profile: Ключ профиля
+            products: Данные товаров из API
+        
+        Returns:
+            int: Количество записанных товаров
+        """
+        rows = [self._product_row(profile, product) for product in products]
+        with self._lock, self._conn:
+            self._write_products(rows)
+        return len(rows)
+    
+    def delete_products(self, profile: str, product_ids: Iterable[int]) -> int:
+        """Удаление товаров из кэша"""
+        ids = [(profile, int(product_id)) for product_id in product_ids]
+        with self._lock, self._conn:
+            self._delete_products(ids)
+        return len(ids)
+    
+    def replace_products(self, profile: str, products: Iterable[Dict[str, Any]]) -> int:
+        """Полная замена товаров профиля одной транзакцией"""
+        rows = [self._product_row(profile, product) for product in products]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM products WHERE profile = ?", (profile,))
+            self._write_products(rows)
+        return len(rows)
+    
+    def commit_sync(self, profile: str, products: Iterable[Dict[str, Any]], deleted_ids: Iterable[int] = (),
+                    high_water_mark: Optional[str] = None, replace: bool = False) -> Dict[str, int]:
+        """
+        Запись результата синхронизации одной транзакцией
+        
+        Товары и отметка синхронизации записываются вместе: при сбое посередине
+        в кэше остается предыдущее согласованное состояние.
+        
+        Args:
+            profile: Ключ профиля
+            products: Новые и измененные товары (при replace - все товары профиля)
+            deleted_ids: ID товаров, удаленных на сайте
+            high_water_mark: Новая отметка синхронизации
+            replace: Заменить все товары профиля
+        
+        Returns:
+            Dict: Количество записанных и удаленных товаров
+        """
+        rows = [self._product_row(profile, product) for product in products]
+        ids = [(profile, int(product_id)) for product_id in deleted_ids]
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute("DELETE FROM products WHERE profile = ?", (profile,))
+            self._write_products(rows)
+            self._delete_products(ids)
+            self._write_high_water_mark(profile, high_water_mark)
+        return {"updated": len(rows), "deleted": len(ids)}
+    
+    def _write_products(self, rows: List[tuple]):
+        """Запись строк товаров (в транзакции вызывающего)"""
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO products (profile, id, sku, status, date_modified, data) "
+            "VALUES (?, ?, ?, ?, ?, ?)", rows
+        )
+    
+    def _delete_products(self, ids: List[tuple]):
+        """Удаление товаров и их вариаций по (профиль, ID) (в транзакции вызывающего)"""
+        self._conn.executemany("DELETE FROM products WHERE profile = ? AND id = ?", ids)
+        self._conn.executemany("DELETE FROM variations WHERE profile = ? AND parent_id = ?", ids)
+    
+    def _product_row(self, profile: str, product: Dict[str, Any]) -> tuple:
+        """Строка таблицы products из данных API"""
+        return (
+            profile,
+            int(product["id"]),
+            product.get("sku") or None,
+            product.get("status"),
+            product.get("date_modified_gmt") or product.get("date_modified"),
+            json.dumps(product, ensure_ascii=False)
+        )
+    
+    def get_variations(self, profile: str, parent_id: int) -> List[Dict[str, Any]]:
+        """Получение вариаций товара"""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT data FROM variations WHERE profile = ? AND parent_id = ? ORDER BY id", (profile, parent_id)
+            ).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def set_variations(self, profile: str, parent_id: int, variations: Iterable[Dict[str, Any]]):
+        """Замена вариаций товара"""
+        rows = [
+            (profile, int(variation["id"]), parent_id, variation.get("sku") or None,
+             json.dumps(variation, ensure_ascii=False))
+            for variation in variations
+        ]
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM variations WHERE profile = ? AND parent_id = ?", (profile, parent_id))
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO variations (profile, id, parent_id, sku, data) VALUES (?, ?, ?, ?, ?)", rows
+            )
+    
+    def get_categories(self, profile: str) -> List[Dict[str, Any]]:
+        """Получение категорий профиля"""
+        return self._get_collection("categories", profile)
+    
+    def set_categories(self, profile: str, categories: Iterable[Dict[str, Any]]):
+        """Замена категорий профиля"""
+        self._set_collection("categories", profile, categories)
+    
+    def get_attributes(self, profile: str) -> List[Dict[str, Any]]:
+        """Получение атрибутов профиля"""
+        return self._get_collection("attributes", profile)
+    
+    def set_attributes(self, profile: str, attributes: Iterable[Dict[str, Any]]):
+        """Замена атрибутов профиля"""
+        self._set_collection("attributes", profile, attributes)
+    
+    def _get_collection(self, table: str, profile: str) -> List[Dict[str, Any]]:
+        """Чтение простой коллекции (категории, атрибуты)"""
+        with self._lock:
+            rows = self._conn.execute(f"SELECT data FROM {table} WHERE profile = ? ORDER BY id", (profile,)).fetchall()
+        return [json.loads(row[0]) for row in rows]
+    
+    def _set_collection(self, table: str, profile: str, items: Iterable[Dict[str, Any]]):
+        """Замена простой коллекции (категории, атрибуты)"""
+        rows = [(profile, int(item["id"]), json.dumps(item, ensure_ascii=False)) for item in items]
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {table} WHERE profile = ?", (profile,))
+            self._conn.executemany(f"INSERT OR REPLACE INTO {table} (profile, id, data) VALUES (?, ?, ?)", rows)
+    
+    def get_high_water_mark(self, profile: str) -> Optional[str]:
+        """Отметка последней синхронизации профиля"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT high_water_mark FROM sync_state WHERE profile = ?", (profile,)
+            ).fetchone()
+        return row[0] if row else None
+    
+    def set_high_water_mark(self, profile: str, high_water_mark: Optional[str]):
+        """Сохранение отметки последней синхронизации"""
+        with self._lock, self._conn:
+            self._write_high_water_mark(profile, high_water_mark)
+    
+    def _write_high_water_mark(self, profile: str, high_water_mark: Optional[str]):
+        """Запись отметки синхронизации (в транзакции вызывающего)"""
+        now = time.time()
+        self._conn.execute(
+            "INSERT INTO sync_state (profile, high_water_mark, synced_at, last_used) VALUES (?, ?, ?, ?) "
+            "ON CONFLICT(profile) DO UPDATE SET high_water_mark = excluded.high_water_mark, "
+            "synced_at = excluded.synced_at, last_used = excluded.last_used",
+            (profile, high_water_mark, now, now)
+        )
+    
+    def touch(self, profile: str):
+        """Отметка использования профиля (для вытеснения по возрасту)"""
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO sync_state (profile, last_used) VALUES (?, ?) "
+                "ON CONFLICT(profile) DO UPDATE SET last_used = excluded.last_used",
+                (profile, time.time())
+            )
+    
+    def invalidate(self, profile: Optional[str] = None):
+        """
+        Полная очистка кэша профиля
+        
+        Args:
+            profile: Ключ профиля (None - очистить кэш всех профилей)
+        """
+        with self._lock, self._conn:
+            for table in self.PROFILE_TABLES:
+                if profile is None:
+                    self._conn.execute(f"DELETE FROM {table}")
+                else:
+                    self._conn.execute(f"DELETE FROM {table} WHERE profile = ?", (profile,))
+        logger.info(f"Кэш очищен: {profile or 'все профили'}")
+    
+    def get_size_mb(self) -> float:
+        """Размер файлов кэша в мегабайтах"""
+        size = 0
+        for suffix in ("", "-wal"):
+            if os.path.exists(self.path + suffix):
+                size += os.path.getsize(self.path + suffix)
+        return size / (1024 * 1024)
+    
+    def evict(self, keep_profile: Optional[str] = None) -> List[str]:
+        """
+        Вытеснение устаревших данных
+        
+        Сначала удаляются профили, не использовавшиеся дольше max_age_days,
+        затем, пока кэш больше max_size_mb, - наименее давно использованные.
+        
+        Args:
+            keep_profile: Профиль, который нельзя вытеснять (текущий)
+        
+        Returns:
+            List[str]: Вытесненные профили
+        """
+        evicted = []
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT profile, COALESCE(last_used, 0) FROM sync_state ORDER BY COALESCE(last_used, 0)"
+            ).fetchall()
+            
+            cutoff = time.time() - self.max_age_days * 86400
+            for profile, last_used in rows:
+                if profile != keep_profile and last_used < cutoff:
+                    self.invalidate(profile)
+                    evicted.append(profile)
+            
+            if evicted:
+                self._compact()
+            
+            # Файл уменьшается только после VACUUM, поэтому сжимаем после каждого профиля
+            for profile, _ in rows:
+                if self.get_size_mb() <= self.max_size_mb:
+                    break
+                if profile == keep_profile or profile in evicted:
+                    continue
+                self.invalidate(profile)
+                self._compact()
+                evicted.append(profile)
+        
+        if evicted:
+            logger.info(f"Из кэша вытеснены профили: {', '.join(evicted)}")
+        return evicted
+    
+    def _compact(self):
+        """Сжатие файла базы после удаления данных"""
+        self._conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        self._conn.execute("VACUUM")
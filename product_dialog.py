@@ -10,6 +10,7 @@ import threading
 
 from product_models import Product, ProductCategory, ProductImage, ProductAttribute
 from meta_fields_dialog import MetaFieldsDialog
+from request_scheduler import INTERACTIVE, prioritized
 
 
 class AttributeSelectionDialog:
@@ -523,6 +524,8 @@ class ProductDialog:
                 product.id = self.product.id
                 product.date_created = self.product.date_created
                 product.date_modified = self.product.date_modified
+                # Исходные данные нужны, чтобы отправить на сайт только изменения
+                product._original_data = self.product._original_data
             
             # Количество на складе
             if self.manage_stock_var.get():
@@ -757,7 +760,8 @@ class ProductDialog:
                 # В случае ошибки показываем пустой список
                 self.window.after(0, lambda: self.update_attribute_terms_ui(attr_id, []))
         
-        threading.Thread(target=load_terms_thread, daemon=True).start()
+        # Пользователь ждет значения в открытом окне - запросы идут вне очереди массовых операций
+        threading.Thread(target=prioritized(INTERACTIVE, load_terms_thread), daemon=True).start()
     
     def update_attribute_terms_ui(self, attr_id: int, terms: List[Dict]):
         """Обновление интерфейса с терминами атрибута"""
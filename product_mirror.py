@@ -0,0 +1,106 @@
+"""
+Локальная копия каталога товаров для инкрементальной синхронизации
+"""
+import logging
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Iterable
+
+from product_cache import ProductCache
+
+logger = logging.getLogger(__name__)
+
+class ProductMirror:
+    """Локальная копия товаров одного профиля подключения с отметкой последней синхронизации"""
+    
+    # Запас при запросе modified_after: modified_after строгий, а даты
+    # в WooCommerce хранятся с точностью до секунды
+    OVERLAP_SECONDS = 1
+    
+    def __init__(self, profile_key: str, cache: ProductCache):
+        """
+        Инициализация локальной копии
+        
+        Args:
+            profile_key: Ключ профиля подключения (адрес сайта и ключ API, WooCommerceManager.profile_key):
+                         после переименования профиля или смены магазина копия не перепутается
+            cache: Постоянный кэш, в котором хранится копия
+        """
+        self.profile_key = profile_key
+        self.cache = cache
+        self.cache.touch(profile_key)
+    
+    @property
+    def high_water_mark(self) -> Optional[str]:
+        """Дата изменения самого нового синхронизированного товара (GMT)"""
+        return self.cache.get_high_water_mark(self.profile_key)
+    
+    def clear(self):
+        """Удаление локальной копии"""
+        self.cache.invalidate(self.profile_key)
+    
+    def count(self) -> int:
+        """Количество товаров в локальной копии"""
+        return self.cache.count_products(self.profile_key)
+    
+    def is_empty(self) -> bool:
+        """Проверка, есть ли данные для инкрементальной синхронизации"""
+        return not self.high_water_mark or self.count() == 0
+    
+    def get_products(self) -> List[Dict[str, Any]]:
+        """Получение товаров локальной копии в порядке ID (по убыванию, как в WooCommerce)"""
+        return self.cache.get_products(self.profile_key)
+    
+    def get_sku_index(self) -> Dict[str, List[int]]:
+        """Соответствие SKU -> ID товаров локальной копии"""
+        return self.cache.get_sku_index(self.profile_key)
+    
+    def get_modified_after(self) -> Optional[str]:
+        """Значение для параметра modified_after (GMT) с учетом запаса"""
+        high_water_mark = self.high_water_mark
+        if not high_water_mark:
+            return None
+        
+        try:
+            since = datetime.fromisoformat(high_water_mark) - timedelta(seconds=self.OVERLAP_SECONDS)
+            return since.strftime("%Y-%m-%dT%H:%M:%S")
+        except ValueError:
+            return high_water_mark
+    
+    def replace_all(self, products: List[Dict[str, Any]]):
+        """
+        Полная замена содержимого (после полной загрузки каталога)
+        
+        Args:
+            products: Все товары сайта
+        """
+        self.cache.commit_sync(self.profile_key, products, high_water_mark=self._newest_modified(products, None),
+                               replace=True)
+    
+    def apply_changes(self, changed: List[Dict[str, Any]], existing_ids: Optional[Iterable[int]] = None) -> Dict[str, int]:
+        """
+        Применение изменений к локальной копии
+        
+        Args:
+            changed: Измененные и новые товары
+            existing_ids: Все ID товаров на сайте; отсутствующие в нем товары удаляются
+        
+        Returns:
+            Dict: Количество обновленных и удаленных товаров
+        """
+        missing_ids = set()
+        if existing_ids is not None:
+            changed_ids = {int(product["id"]) for product in changed}
+            missing_ids = (self.cache.get_product_ids(self.profile_key) | changed_ids) - set(existing_ids)
+        
+        # Товары и отметка записываются вместе, чтобы отметка не опередила данные
+        return self.cache.commit_sync(self.profile_key, changed, deleted_ids=missing_ids,
+                                      high_water_mark=self._newest_modified(changed, self.high_water_mark))
+    
+    def _newest_modified(self, products: Iterable[Dict[str, Any]], current: Optional[str]) -> Optional[str]:
+        """Самая поздняя дата изменения среди товаров и текущей отметки"""
+        newest = current
+        for product in products:
+            modified = product.get("date_modified_gmt") or product.get("date_modified")
+            if modified and (not newest or modified > newest):
+                newest = modified
+        return newest
@@ -1,6 +1,7 @@
 """
 Модели данных для товаров WooCommerce
 """
+import copy
 from dataclasses import dataclass, field
 from typing import List, Dict, Any, Optional
 
@@ -35,10 +36,53 @@ class ProductVariation:
     stock_quantity: Optional[int] = None
     attributes: List[Dict[str, Any]] = field(default_factory=list)
     image: Optional[ProductImage] = None
+    id: Optional[int] = None
+    
+    @classmethod
+    def from_woocommerce_dict(cls, data: Dict[str, Any]) -> 'ProductVariation':
+        """Создание объекта ProductVariation из данных WooCommerce API"""
+        image = None
+        image_data = data.get("image")
+        if image_data and image_data.get("src"):
+            image = ProductImage(
+                src=image_data.get("src", ""),
+                name=image_data.get("name", ""),
+                alt=image_data.get("alt", "")
+            )
+        
+        return cls(
+            regular_price=str(data.get("regular_price", "")),
+            sale_price=str(data.get("sale_price", "")),
+            sku=data.get("sku", ""),
+            stock_quantity=data.get("stock_quantity"),
+            attributes=[
+                {"id": attr.get("id", 0), "name": attr.get("name", ""), "option": attr.get("option", "")}
+                for attr in data.get("attributes", [])
+            ],
+            image=image,
+            id=data.get("id")
+        )
 
 @dataclass
 class Product:
     """Основная модель товара"""
+    
+    # Поля, достаточные для таблицы товаров (запрашиваются через _fields)
+    LIST_FIELDS = ("id", "name", "sku", "type", "regular_price", "status", "stock_quantity",
+                   "categories", "date_modified", "date_modified_gmt")
+    
+    # Поля, отсутствие которых означает неполные данные товара
+    DETAIL_FIELDS = ("description", "short_description", "attributes", "meta_data")
+    
+    # Значения для очистки полей, которые to_woocommerce_dict пропускает, когда они пусты
+    CLEARED_VALUES = {
+        "weight": "",
+        "dimensions": {"length": "", "width": "", "height": ""},
+        "categories": [],
+        "images": [],
+        "attributes": []
+    }
+    
     name: str
     type: str = "simple"  # simple, variable, grouped, external
     sku: str = ""
@@ -72,6 +116,9 @@ class Product:
     _is_deleted: bool = field(default=False, init=False)
     _original_data: Optional[Dict[str, Any]] = field(default=None, init=False)
     
+    # Товар загружен из списка с _fields, полные данные еще не получены
+    _is_partial: bool = field(default=False, init=False)
+    
     def to_woocommerce_dict(self) -> Dict[str, Any]:
         """Преобразование в формат WooCommerce API"""
         data = {
@@ -198,6 +245,7 @@ class Product:
         
         # Сохраняем оригинальные данные для отслеживания изменений
         product.save_original_data()
+        product._is_partial = not all(key in data for key in cls.DETAIL_FIELDS)
         
         return product
     
@@ -234,6 +282,32 @@ class Product:
         """Сохранить оригинальные данные для отслеживания изменений"""
         self._original_data = self.to_woocommerce_dict()
     
+    def get_changes(self) -> Dict[str, Any]:
+        """
+        Получить только изменившиеся поля для частичного обновления
+        
+        Сравнивает текущие данные с сохраненными при загрузке (_original_data).
+        Очищенные поля передаются пустыми значениями, чтобы сайт их тоже очистил.
+        Если исходных данных нет, возвращаются все поля.
+        
+        Returns:
+            Dict: Изменившиеся поля в формате WooCommerce API
+        """
+        current = self.to_woocommerce_dict()
+        if self._original_data is None:
+            return current
+        
+        changes = {key: value for key, value in current.items() if self._original_data.get(key) != value}
+        for key in self._original_data.keys() - current.keys():
+            if key in self.CLEARED_VALUES:
+                changes[key] = copy.deepcopy(self.CLEARED_VALUES[key])
+        
+        return changes
+    
+    def is_partial(self) -> bool:
+        """Проверить, загружены ли только поля для таблицы (перед редактированием нужны полные данные)"""
+        return self._is_partial
+    
     def is_changed(self) -> bool:
         """Проверить, был ли товар изменен"""
         return self._is_new or self._is_modified or self._is_deleted
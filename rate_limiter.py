@@ -0,0 +1,179 @@
+"""
+Адаптивное ограничение частоты запросов к API (token bucket)
+Один ограничитель на профиль подключения, общий для всех потоков
+"""
+import logging
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class AdaptiveRateLimiter:
+    """
+    Ограничитель частоты запросов с адаптацией под сервер
+    
+    Скорость растет линейно, пока сервер отвечает быстро и без ошибок, и
+    уменьшается вдвое при ответах 429/503 (AIMD). Заметный рост задержки
+    ответов тоже снижает скорость, но мягче. Заголовок Retry-After
+    приостанавливает все запросы профиля на указанное время.
+    """
+    
+    # Коды ответа, означающие перегрузку сервера
+    THROTTLE_STATUSES = (429, 503)
+    
+    # Во сколько раз задержка ответа должна превысить обычную, чтобы снизить скорость
+    LATENCY_FACTOR = 3.0
+    
+    def __init__(self, max_rate: float = 20.0, min_rate: float = 0.5):
+        """
+        Инициализация ограничителя
+        
+        Args:
+            max_rate: Максимальная (и начальная) скорость, запросов в секунду
+            min_rate: Скорость, ниже которой ограничитель не опускается
+        """
+        self.max_rate = max(max_rate, min_rate)
+        self.min_rate = min_rate
+        self.rate = self.max_rate
+        self.tokens = 1.0
+        self.updated_at = time.monotonic()
+        self.blocked_until = 0.0
+        self.latency = None
+        self.base_latency = None
+        self._lock = threading.Lock()
+    
+    def configure(self, max_rate: float):
+        """Изменение максимальной скорости (при изменении настроек профиля)"""
+        with self._lock:
+            self.max_rate = max(max_rate, self.min_rate)
+            self.rate = min(self.rate, self.max_rate)
+    
+    def acquire(self, borrow: bool = False):
+        """
+        Ожидание разрешения на отправку запроса
+        
+        Args:
+            borrow: Разрешить взять токен в долг (для интерактивных запросов)
+        """
+        while True:
+            wait = self.reserve(borrow)
+            if wait <= 0:
+                return
+            time.sleep(wait)
+    
+    def reserve(self, borrow: bool = False) -> float:
+        """
+        Попытка получить разрешение без ожидания (для asyncio)
+        
+        Args:
+            borrow: Разрешить взять токен в долг: запрос уходит сразу, а следующие
+                    ждут дольше; в долг берется не больше одного токена, пауза
+                    Retry-After соблюдается
+        
+        Returns:
+            float: 0, если разрешение получено, иначе время ожидания в секундах
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._refill(now)
+            
+            wait = self.blocked_until - now
+            if wait > 0:
+                return wait
+            if self.tokens >= 1.0 or (borrow and self.tokens >= 0.0):
+                self.tokens -= 1.0
+                return 0.0
+            return (1.0 - self.tokens) / self.rate
+    
+    def on_response(self, status_code: int, latency: float, retry_after: Optional[float] = None):
+        """
+        Учет ответа сервера для подстройки скорости
+        
+        Args:
+            status_code: Код ответа
+            latency: Время выполнения запроса в секундах
+            retry_after: Пауза из заголовка Retry-After в секундах
+        """
+        with self._lock:
+            if status_code in self.THROTTLE_STATUSES:
+                self.rate = max(self.min_rate, self.rate / 2)
+                self.tokens = min(self.tokens, 0.0)
+                if retry_after:
+                    self.blocked_until = max(self.blocked_until, time.monotonic() + retry_after)
+                logger.warning(f"Сервер ограничивает запросы ({status_code}), скорость снижена до {self.rate:.1f} запр/с")
+                return
+            
+            if status_code >= 500:
+                return
+            
+            self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+            if self.base_latency is None or self.latency < self.base_latency:
+                self.base_latency = self.latency
+            
+            if latency > self.base_latency * self.LATENCY_FACTOR:
+                self.rate = max(self.min_rate, self.rate * 0.9)
+            else:
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 50)
+    
+    def on_error(self):
+        """Учет ошибки соединения (сброс, таймаут)"""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate * 0.75)
+    
+    def _refill(self, now: float):
+        """Пополнение корзины токенов; емкость - запросы за одну секунду"""
+        capacity = max(1.0, self.rate)
+        self.tokens = min(capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """
+    Разбор заголовка Retry-After
+    
+    Args:
+        value: Число секунд или HTTP-дата
+    
+    Returns:
+        float: Пауза в секундах или None
+    """
+    if not value:
+        return None
+    
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    
+    try:
+        retry_at = parsedate_to_datetime(value)
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+# Ограничители по профилям подключения
+_limiters: Dict[str, AdaptiveRateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+def get_rate_limiter(key: str, max_rate: float = 20.0) -> AdaptiveRateLimiter:
+    """
+    Получение общего ограничителя для профиля подключения
+    
+    Args:
+        key: Ключ профиля (адрес сайта и ключ API)
+        max_rate: Максимальная скорость, запросов в секунду
+    
+    Returns:
+        AdaptiveRateLimiter: Ограничитель, общий для всех менеджеров профиля
+    """
+    with _limiters_lock:
+        limiter = _limiters.get(key)
+        if limiter is None:
+            limiter = _limiters[key] = AdaptiveRateLimiter(max_rate)
+        else:
+            limiter.configure(max_rate)
+        return limiter
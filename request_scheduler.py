@@ -0,0 +1,198 @@
+"""
+Планировщик запросов к API с классами приоритета
+Интерактивные действия (проверка соединения, значения атрибутов в окне товара)
+не ждут в общей очереди за массовой загрузкой или отправкой: для них
+зарезервирован слот, а массовые и фоновые запросы делят остальные слоты честно,
+в пропорции весов классов.
+
+Класс приоритета задается для потока выполнения через request_priority()
+и передается в потоки пулов ContextThreadPoolExecutor.
+"""
+import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from contextvars import ContextVar, copy_context
+from typing import Any, Callable, Deque, Dict, List
+
+logger = logging.getLogger(__name__)
+
+# Классы приоритета (меньше - важнее)
+INTERACTIVE = 0   # действия пользователя, ответ на которые он ждет
+FOREGROUND = 1    # массовые операции, запущенные пользователем (загрузка, сохранение, импорт)
+BACKGROUND = 2    # фоновая сверка и предзагрузка
+
+PRIORITY_NAMES = {INTERACTIVE: "interactive", FOREGROUND: "foreground", BACKGROUND: "background"}
+
+_current_priority: ContextVar[int] = ContextVar("request_priority", default=FOREGROUND)
+
+def current_priority() -> int:
+    """Класс приоритета запросов текущего потока выполнения"""
+    return _current_priority.get()
+
+@contextmanager
+def request_priority(priority: int):
+    """
+    Выполнение запросов блока с заданным классом приоритета
+    
+    Example:
+        with request_priority(INTERACTIVE):
+            wc_manager.get_attribute_terms(attribute_id)
+    """
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+def prioritized(priority: int, func: Callable[..., Any]) -> Callable[..., Any]:
+    """Обертка функции потока: запросы внутри нее выполняются с заданным приоритетом"""
+    def run(*args, **kwargs):
+        with request_priority(priority):
+            return func(*args, **kwargs)
+    return run
+
+class ContextThreadPoolExecutor(ThreadPoolExecutor):
+    """Пул потоков, задачи которого выполняются в контексте (и с приоритетом) вызывающего потока"""
+    
+    def submit(self, fn, /, *args, **kwargs):
+        return super().submit(copy_context().run, fn, *args, **kwargs)
+
+class _Waiter:
+    """Запрос, ожидающий слота"""
+    
+    __slots__ = ("priority", "granted")
+    
+    def __init__(self, priority: int):
+        self.priority = priority
+        self.granted = False
+
+class RequestScheduler:
+    """
+    Ограничение одновременных запросов профиля с очередями по классам приоритета
+    
+    Интерактивные запросы получают слот первыми, и для них зарезервированы
+    RESERVED слотов, которые не занимают остальные классы. Между массовыми
+    и фоновыми запросами слоты распределяются взвешенно-честно (stride
+    scheduling): при общей очереди фоновые получают 1 слот из WEIGHTS-суммы,
+    но не простаивают, если массовых нет. Внутри класса - порядок поступления.
+    """
+    
+    WEIGHTS = {FOREGROUND: 4, BACKGROUND: 1}
+    RESERVED = 1
+    
+    def __init__(self, max_concurrent: int = 4):
+        """
+        Args:
+            max_concurrent: Одновременных запросов массовых и фоновых классов
+                            (интерактивным доступно еще RESERVED)
+        """
+        self.max_concurrent = max(1, max_concurrent)
+        self._cond = threading.Condition()
+        self._queues: Dict[int, Deque[_Waiter]] = {priority: deque() for priority in PRIORITY_NAMES}
+        self._active: Dict[int, int] = {priority: 0 for priority in PRIORITY_NAMES}
+        self._pass: Dict[int, float] = {priority: 0.0 for priority in self.WEIGHTS}
+        self._virtual_time = 0.0
+    
+    def configure(self, max_concurrent: int):
+        """Изменение числа слотов (при изменении настроек профиля)"""
+        with self._cond:
+            self.max_concurrent = max(1, max_concurrent)
+            self._dispatch()
+    
+    @contextmanager
+    def slot(self, priority: int = None):
+        """
+        Занятие слота на время запроса
+        
+        Args:
+            priority: Класс приоритета (по умолчанию - класс текущего потока)
+        """
+        priority = current_priority() if priority is None else priority
+        self.acquire(priority)
+        try:
+            yield
+        finally:
+            self.release(priority)
+    
+    def acquire(self, priority: int):
+        """Ожидание слота"""
+        waiter = _Waiter(priority)
+        with self._cond:
+            if priority in self._pass and not self._queues[priority]:
+                # Класс, долго не отправлявший запросов, не копит право на внеочередной слот
+                self._pass[priority] = max(self._pass[priority], self._virtual_time)
+            self._queues[priority].append(waiter)
+            self._dispatch()
+            while not waiter.granted:
+                self._cond.wait()
+    
+    def release(self, priority: int):
+        """Освобождение слота"""
+        with self._cond:
+            self._active[priority] -= 1
+            self._dispatch()
+    
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """Выполняющиеся и ожидающие запросы по классам"""
+        with self._cond:
+            return {
+                PRIORITY_NAMES[priority]: {"active": self._active[priority], "waiting": len(self._queues[priority])}
+                for priority in PRIORITY_NAMES
+            }
+    
+    def _dispatch(self):
+        """Выдача свободных слотов ожидающим запросам (под блокировкой)"""
+        granted = False
+        while True:
+            priority = self._next_priority()
+            if priority is None:
+                break
+            waiter = self._queues[priority].popleft()
+            waiter.granted = True
+            self._active[priority] += 1
+            if priority in self._pass:
+                self._virtual_time = self._pass[priority]
+                self._pass[priority] += 1.0 / self.WEIGHTS[priority]
+            granted = True
+        if granted:
+            self._cond.notify_all()
+    
+    def _next_priority(self):
+        """Класс, которому достается следующий слот, или None"""
+        active = sum(self._active.values())
+        if self._queues[INTERACTIVE] and active < self.max_concurrent + self.RESERVED:
+            return INTERACTIVE
+        
+        bulk_active = active - self._active[INTERACTIVE]
+        if bulk_active >= self.max_concurrent or active >= self.max_concurrent + self.RESERVED:
+            return None
+        
+        waiting: List[int] = [priority for priority in self.WEIGHTS if self._queues[priority]]
+        if not waiting:
+            return None
+        return min(waiting, key=lambda priority: self._pass[priority])
+
+# Планировщики по профилям подключения
+_schedulers: Dict[str, RequestScheduler] = {}
+_schedulers_lock = threading.Lock()
+
+def get_request_scheduler(key: str, max_concurrent: int = 4) -> RequestScheduler:
+    """
+    Получение общего планировщика для профиля подключения
+    
+    Args:
+        key: Ключ профиля (адрес сайта и ключ API)
+        max_concurrent: Одновременных массовых и фоновых запросов
+    
+    Returns:
+        RequestScheduler: Планировщик, общий для всех менеджеров профиля
+    """
+    with _schedulers_lock:
+        scheduler = _schedulers.get(key)
+        if scheduler is None:
+            scheduler = _schedulers[key] = RequestScheduler(max_concurrent)
+        else:
+            scheduler.configure(max_concurrent)
+        return scheduler
@@ -0,0 +1,94 @@
+"""
+Объединение одновременных одинаковых запросов (single-flight)
+Пока запрос выполняется, такие же запросы из других потоков не отправляются,
+а ждут и получают его результат
+"""
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class _Call:
+    """Выполняющийся запрос и его результат"""
+    
+    __slots__ = ("done", "result", "error", "waiters")
+    
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.waiters = 0
+
+class SingleFlight:
+    """
+    Группа объединяемых вызовов
+    
+    Первый поток с данным ключом выполняет функцию; потоки, пришедшие с тем же
+    ключом до ее завершения, получают тот же результат (или то же исключение).
+    После завершения ключ освобождается - результаты не кэшируются.
+    """
+    
+    def __init__(self):
+        self._calls: Dict[Hashable, _Call] = {}
+        self._lock = threading.Lock()
+    
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """
+        Выполнение функции с объединением по ключу
+        
+        Args:
+            key: Ключ запроса
+            func: Функция, выполняющая запрос
+        
+        Returns:
+            Tuple: (результат, True если результат получен от чужого вызова)
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            if call is None:
+                call = self._calls[key] = _Call()
+                leader = True
+            else:
+                call.waiters += 1
+                leader = False
+        
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+        
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            if call.waiters:
+                logger.debug(f"Результат запроса {key} передан еще {call.waiters} ожидающим")
+            call.done.set()
+        
+        return call.result, False
+
+# Группы по профилям подключения
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+def get_single_flight(key: str) -> SingleFlight:
+    """
+    Получение общей группы объединения запросов для профиля подключения
+    
+    Args:
+        key: Ключ профиля (адрес сайта и ключ API)
+    
+    Returns:
+        SingleFlight: Группа, общая для всех менеджеров профиля
+    """
+    with _groups_lock:
+        group = _groups.get(key)
+        if group is None:
+            group = _groups[key] = SingleFlight()
+        return group
@@ -0,0 +1,313 @@
+"""
+Планировщик синхронизации - объединяет локальные изменения товаров
+в смешанные пакетные запросы create/update/delete
+"""
+import logging
+from dataclasses import dataclass, field
+from typing import List, Dict, Any, Iterable, Optional
+
+from operation_journal import OperationJournal
+from product_models import Product
+
+logger = logging.getLogger(__name__)
+
+@dataclass
+class SyncPlan:
+    """План отправки изменений на сайт"""
+    create: List[Product] = field(default_factory=list)
+    update: List[Product] = field(default_factory=list)
+    delete: List[Product] = field(default_factory=list)
+    # Новые товары, удаленные до отправки: на сайте их нет, достаточно убрать из списка
+    discard: List[Product] = field(default_factory=list)
+    
+    def total(self) -> int:
+        """Количество операций, которые нужно выполнить на сайте"""
+        return len(self.create) + len(self.update) + len(self.delete)
+    
+    def is_empty(self) -> bool:
+        """Проверка отсутствия изменений"""
+        return self.total() == 0 and not self.discard
+
+@dataclass
+class SyncResult:
+    """Результат выполнения плана синхронизации"""
+    created: List[Product] = field(default_factory=list)
+    updated: List[Product] = field(default_factory=list)
+    deleted: List[Product] = field(default_factory=list)
+    failed: List[Product] = field(default_factory=list)
+    errors: List[Dict[str, str]] = field(default_factory=list)
+    
+    def success_count(self) -> int:
+        """Количество успешных операций"""
+        return len(self.created) + len(self.updated) + len(self.deleted)
+
+class SyncPlanner:
+    """Построение и выполнение плана синхронизации товаров"""
+    
+    def __init__(self, wc_manager, journal: Optional[OperationJournal] = None):
+        """
+        Инициализация планировщика
+        
+        Args:
+            wc_manager: Менеджер WooCommerce API
+            journal: Журнал операций; без него прерванную отправку нельзя продолжить
+        """
+        self.wc_manager = wc_manager
+        self.journal = journal
+    
+    def plan(self, products: Iterable[Product]) -> SyncPlan:
+        """
+        Распределение измененных товаров по видам операций
+        
+        Args:
+            products: Товары (неизмененные пропускаются)
+        
+        Returns:
+            SyncPlan: План отправки
+        """
+        plan = SyncPlan()
+        for product in products:
+            if product._is_deleted:
+                if product.id:
+                    plan.delete.append(product)
+                else:
+                    plan.discard.append(product)
+            elif product._is_new:
+                plan.create.append(product)
+            elif product._is_modified:
+                plan.update.append(product)
+        return plan
+    
+    def request_count(self, plan: SyncPlan) -> int:
+        """Количество пакетных запросов, которые потребуются для плана"""
+        batch_size = max(1, min(self.wc_manager._config_value('batch_size', self.wc_manager.BATCH_LIMIT),
+                                self.wc_manager.BATCH_LIMIT))
+        return -(-plan.total() // batch_size)
+    
+    def execute(self, plan: SyncPlan) -> SyncResult:
+        """
+        Отправка плана смешанными пакетными запросами
+        
+        Успешно сохраненные товары получают ID и сбрасывают флаги изменений;
+        товары с ошибками сохраняют флаги, чтобы их можно было отправить повторно.
+        
+        С журналом план записывается до отправки, а результат каждого пакета
+        фиксируется по его завершении. Новые товары, чье создание в прерванной
+        синхронизации осталось неподтвержденным, сначала ищутся на сайте по SKU,
+        чтобы повторная отправка не создала дубликаты.
+        
+        Args:
+            plan: План отправки
+        
+        Returns:
+            SyncResult: Результат по каждому товару
+        """
+        result = SyncResult(deleted=list(plan.discard))
+        if plan.total() == 0:
+            return result
+        
+        # Для обновления отправляются только изменившиеся поля
+        update_products = []
+        update_data = []
+        for product in plan.update:
+            changes = product.get_changes()
+            if not changes:
+                # Товар отредактирован, но данные совпадают с сайтом - запрос не нужен
+                product.reset_change_flags()
+                result.updated.append(product)
+                continue
+            changes["id"] = product.id
+            update_products.append(product)
+            update_data.append(changes)
+        
+        create_products = self._reconcile_creates(plan.create, result) if self.journal else list(plan.create)
+        if not create_products and not update_data and not plan.delete:
+            return result
+        
+        create_data = [product.to_woocommerce_dict() for product in create_products]
+        delete_ids = [product.id for product in plan.delete]
+        
+        sync_id = None
+        if self.journal:
+            sync_id = self.journal.begin(self.wc_manager.profile_key, {
+                "create": [self._journal_item(product, data) for product, data in zip(create_products, create_data)],
+                "update": [self._journal_item(product, data) for product, data in zip(update_products, update_data)],
+                "delete": [self._journal_item(product, product.id) for product in plan.delete]
+            })
+        
+        summary = self.wc_manager.batch_products(
+            create=create_data,
+            update=update_data,
+            delete=delete_ids,
+            on_chunk=(lambda entries: self.journal.acknowledge(sync_id, entries)) if sync_id else None
+        )
+        if sync_id:
+            self.journal.finish(sync_id)
+        
+        for product, item in zip(create_products, summary["create"]["items"]):
+            if self._register_failure(result, product, item):
+                continue
+            product.id = item["data"]["id"]
+            product.reset_change_flags()
+            result.created.append(product)
+        
+        for product, item in zip(update_products, summary["update"]["items"]):
+            if self._register_failure(result, product, item):
+                continue
+            product.reset_change_flags()
+            result.updated.append(product)
+        
+        for product, item in zip(plan.delete, summary["delete"]["items"]):
+            if OperationJournal.is_already_deleted(item.get("error")):
+                # Товар уже удален на сайте
+                result.deleted.append(product)
+                continue
+            if self._register_failure(result, product, item):
+                continue
+            result.deleted.append(product)
+        
+        # Товары, для которых сервер ничего не вернул (например, API не подключен)
+        for products, kind in ((create_products, "create"), (update_products, "update"), (plan.delete, "delete")):
+            for product in products[len(summary[kind]["items"]):]:
+                self._register_failure(result, product, {"error": {"message": "Операция не выполнена"}})
+        
+        logger.info(f"Синхронизация: создано {len(result.created)}, обновлено {len(result.updated)}, "
+                    f"удалено {len(result.deleted)}, ошибок {len(result.failed)}")
+        return result
+    
+    def resume(self, sync_id: int) -> SyncResult:
+        """
+        Продолжение прерванной синхронизации по журналу
+        
+        Неподтвержденные создания сверяются с сайтом по SKU: найденные товары
+        считаются созданными, остальные отправляются повторно. Создания без SKU
+        проверить нельзя, поэтому они не повторяются и попадают в ошибки.
+        Обновления и удаления повторяются как есть (повтор не меняет результат).
+        
+        Args:
+            sync_id: ID синхронизации из OperationJournal.unfinished()
+        
+        Returns:
+            SyncResult: Результат; товары восстановлены из журнала (название, SKU, ID)
+        """
+        result = SyncResult()
+        if not self.journal:
+            return result
+        
+        operations = self.journal.pending_operations(sync_id)
+        creates = [operation for operation in operations if operation.kind == "create"]
+        resend = {kind: [operation for operation in operations if operation.kind == kind] for kind in ("update", "delete")}
+        
+        unverifiable = [operation for operation in creates if not operation.sku]
+        for operation in unverifiable:
+            message = "Товар без артикула: проверьте на сайте, был ли он создан"
+            self.journal.resolve(sync_id, "create", operation.position, OperationJournal.FAILED, error=message)
+            self._register_failure(result, self._journal_product(operation), {"error": {"message": message}})
+        
+        resend["create"] = []
+        creates = [operation for operation in creates if operation.sku]
+        if creates:
+            resolved = self.wc_manager.resolve_skus(operation.sku for operation in creates)
+            for operation in creates:
+                product = self._journal_product(operation)
+                product_id = resolved["found"].get(operation.sku) or (resolved["duplicates"].get(operation.sku) or [None])[0]
+                if product_id:
+                    self.journal.resolve(sync_id, "create", operation.position, OperationJournal.DONE, product_id)
+                    product.id = product_id
+                    result.created.append(product)
+                elif operation.sku in resolved["failed"]:
+                    self._register_failure(result, product, {"error": {"message": "Не удалось проверить SKU на сайте"}})
+                else:
+                    resend["create"].append(operation)
+        
+        if any(resend.values()):
+            positions = {kind: [operation.position for operation in resend[kind]] for kind in resend}
+            summary = self.wc_manager.batch_products(
+                create=[operation.payload for operation in resend["create"]],
+                update=[operation.payload for operation in resend["update"]],
+                delete=[operation.payload for operation in resend["delete"]],
+                on_chunk=lambda entries: self.journal.acknowledge(sync_id, entries, positions)
+            )
+            
+            for kind, completed in (("create", result.created), ("update", result.updated), ("delete", result.deleted)):
+                for operation, item in zip(resend[kind], summary[kind]["items"]):
+                    product = self._journal_product(operation)
+                    error = item.get("error")
+                    if kind == "delete" and OperationJournal.is_already_deleted(error):
+                        # Товар уже удален до сбоя
+                        error = None
+                    if self._register_failure(result, product, {"error": error}):
+                        continue
+                    if kind == "create":
+                        product.id = item["data"]["id"]
+                    completed.append(product)
+        
+        status = self.journal.finish(sync_id)
+        logger.info(f"Продолжение синхронизации {sync_id}: создано {len(result.created)}, "
+                    f"обновлено {len(result.updated)}, удалено {len(result.deleted)}, "
+                    f"ошибок {len(result.failed)}, состояние {status}")
+        return result
+    
+    def _reconcile_creates(self, products: List[Product], result: SyncResult) -> List[Product]:
+        """
+        Сверка новых товаров с неподтвержденными созданиями из прерванных синхронизаций
+        
+        Returns:
+            List[Product]: Товары, которые нужно создать
+        """
+        pending = self.journal.pending_creates(self.wc_manager.profile_key, (product.sku for product in products))
+        if not pending:
+            return list(products)
+        
+        logger.info(f"Сверка по SKU неподтвержденных созданий: {len(pending)}")
+        resolved = self.wc_manager.resolve_skus(pending)
+        
+        to_create = []
+        for product in products:
+            operations = pending.get(product.sku)
+            if not operations:
+                to_create.append(product)
+                continue
+            
+            product_id = resolved["found"].get(product.sku) or (resolved["duplicates"].get(product.sku) or [None])[0]
+            if product.sku in resolved["failed"]:
+                self._register_failure(result, product, {"error": {"message": "Не удалось проверить SKU на сайте"}})
+                continue
+            
+            for operation in operations:
+                if product_id:
+                    self.journal.resolve(operation.sync_id, "create", operation.position, OperationJournal.DONE, product_id)
+                else:
+                    self.journal.resolve(operation.sync_id, "create", operation.position, OperationJournal.FAILED,
+                                         error="Товар не создан, отправлен повторно")
+            
+            if product_id:
+                # Товар был создан, но ответ не дошел
+                product.id = product_id
+                product.reset_change_flags()
+                result.created.append(product)
+            else:
+                to_create.append(product)
+        
+        for sync_id in {operation.sync_id for operations in pending.values() for operation in operations}:
+            self.journal.finish(sync_id)
+        return to_create
+    
+    def _journal_item(self, product: Product, payload: Any) -> Dict[str, Any]:
+        """Запись операции для журнала"""
+        return {"sku": product.sku, "name": product.name, "product_id": product.id, "payload": payload}
+    
+    def _journal_product(self, operation) -> Product:
+        """Товар для отчета о продолжении синхронизации"""
+        return Product(name=operation.name, sku=operation.sku, id=operation.product_id)
+    
+    def _register_failure(self, result: SyncResult, product: Product, item: Dict[str, Any]) -> bool:
+        """Учет ошибки элемента пакета; возвращает True, если операция не удалась"""
+        error = item.get("error")
+        if not error:
+            return False
+        
+        message = error.get("message", "") if isinstance(error, dict) else str(error)
+        result.failed.append(product)
+        result.errors.append({"product": product.name, "error": message})
+        return True
@@ -0,0 +1,119 @@
+"""
+Кэш таксономий (категории, атрибуты, значения атрибутов) с ограниченным временем жизни
+Один кэш на профиль подключения, общий для главного окна и всех диалогов
+"""
+import logging
+import threading
+import time
+from typing import List, Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+class TaxonomyCache:
+    """
+    Кэш коллекций таксономий в памяти
+    
+    Ключ - эндпоинт коллекции ("products/categories", "products/attributes",
+    "products/attributes/{id}/terms"). Записи устаревают через ttl секунд.
+    Менеджер API обновляет кэш при создании, изменении и удалении атрибутов
+    и значений (write-through), поэтому после собственных изменений повторная
+    загрузка с сервера не нужна.
+    """
+    
+    def __init__(self, ttl: float = 600.0):
+        """
+        Инициализация кэша
+        
+        Args:
+            ttl: Время жизни записи в секундах (0 - кэш отключен)
+        """
+        self.ttl = ttl
+        self._entries: Dict[str, Tuple[float, List[Dict[str, Any]]]] = {}
+        self._lock = threading.Lock()
+    
+    def configure(self, ttl: float):
+        """Изменение времени жизни (при изменении настроек профиля)"""
+        with self._lock:
+            self.ttl = ttl
+    
+    def get(self, key: str) -> Optional[List[Dict[str, Any]]]:
+        """
+        Получение коллекции
+        
+        Returns:
+            List[Dict]: Копия коллекции или None, если ее нет или она устарела
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            
+            stored_at, items = entry
+            if time.monotonic() - stored_at > self.ttl:
+                del self._entries[key]
+                return None
+            return [dict(item) for item in items]
+    
+    def set(self, key: str, items: List[Dict[str, Any]]):
+        """Сохранение загруженной коллекции"""
+        with self._lock:
+            if self.ttl > 0:
+                self._entries[key] = (time.monotonic(), [dict(item) for item in items])
+    
+    def upsert(self, key: str, item: Dict[str, Any]):
+        """Добавление или замена элемента в закэшированной коллекции"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            
+            stored_at, items = entry
+            items = [existing for existing in items if existing.get("id") != item.get("id")]
+            items.append(dict(item))
+            self._entries[key] = (stored_at, items)
+    
+    def remove(self, key: str, item_id: int):
+        """Удаление элемента из закэшированной коллекции"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return
+            
+            stored_at, items = entry
+            self._entries[key] = (stored_at, [item for item in items if item.get("id") != item_id])
+    
+    def invalidate(self, key: Optional[str] = None):
+        """
+        Сброс кэша
+        
+        Args:
+            key: Эндпоинт коллекции; если не указан, сбрасывается весь кэш
+        """
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+# Кэши по профилям подключения
+_caches: Dict[str, TaxonomyCache] = {}
+_caches_lock = threading.Lock()
+
+def get_taxonomy_cache(key: str, ttl: float = 600.0) -> TaxonomyCache:
+    """
+    Получение общего кэша таксономий для профиля подключения
+    
+    Args:
+        key: Ключ профиля (адрес сайта и ключ API)
+        ttl: Время жизни записи в секундах
+    
+    Returns:
+        TaxonomyCache: Кэш, общий для всех менеджеров профиля
+    """
+    with _caches_lock:
+        cache = _caches.get(key)
+        if cache is None:
+            cache = _caches[key] = TaxonomyCache(ttl)
+        else:
+            cache.configure(ttl)
+        return cache
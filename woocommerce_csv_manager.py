@@ -4,7 +4,7 @@
 """
 import pandas as pd
 import logging
-from typing import List, Dict, Any, Optional, Tuple
+from typing import List, Dict, Any, Optional, Tuple, Iterable
 from product_models import Product, ProductCategory, ProductImage, ProductAttribute, ProductVariation
 import json
 import re
@@ -14,6 +14,9 @@ logger = logging.getLogger(__name__)
 class WooCommerceCSVManager:
     """Класс для работы с CSV файлами в формате WooCommerce"""
     
+    # Количество строк, записываемых в файл за один раз при экспорте
+    EXPORT_CHUNK_SIZE = 1000
+    
     def __init__(self):
         """Инициализация менеджера WooCommerce CSV"""
         
@@ -388,12 +391,15 @@ class WooCommerceCSVManager:
         
         return meta_data
     
-    def export_to_woocommerce_csv(self, products: List[Product], filename: str) -> bool:
+    def export_to_woocommerce_csv(self, products: Iterable[Product], filename: str) -> bool:
         """
         Экспорт товаров в формат WooCommerce CSV
         
+        Строки записываются блоками по EXPORT_CHUNK_SIZE, поэтому вместо списка
+        можно передать генератор товаров и не держать каталог в памяти.
+        
         Args:
-            products: Список товаров
+            products: Список или итератор товаров
             filename: Имя файла для сохранения
             
         Returns:
@@ -403,26 +409,31 @@ class WooCommerceCSVManager:
             # Создаем заголовки WooCommerce
             headers = self._get_woocommerce_headers()
             
-            # Подготавливаем данные
+            rows_count = 0
             rows = []
-            for product in products:
-                # Основной товар
-                row = self._product_to_wc_row(product)
-                rows.append(row)
-                
-                # Вариации товара
-                if product.variations:
-                    for variation in product.variations:
-                        var_row = self._variation_to_wc_row(variation, product)
-                        rows.append(var_row)
             
-            # Создаем DataFrame
-            df = pd.DataFrame(rows, columns=headers)
-            
-            # Сохраняем в CSV
-            df.to_csv(filename, index=False, encoding='utf-8-sig')
+            with open(filename, 'w', encoding='utf-8-sig', newline='') as csv_file:
+                for product in products:
+                    # Основной товар
+                    rows.append(self._product_to_wc_row(product))
+                    
+                    # Вариации товара
+                    if product.variations:
+                        for variation in product.variations:
+                            rows.append(self._variation_to_wc_row(variation, product))
+                    
+                    if len(rows) >= self.EXPORT_CHUNK_SIZE:
+                        pd.DataFrame(rows, columns=headers).to_csv(
+                            csv_file, index=False, header=rows_count == 0)
+                        rows_count += len(rows)
+                        rows = []
+                
+                if rows or rows_count == 0:
+                    pd.DataFrame(rows, columns=headers).to_csv(
+                        csv_file, index=False, header=rows_count == 0)
+                    rows_count += len(rows)
             
-            logger.info(f"Экспорт в WooCommerce CSV завершен: {len(rows)} строк в файл {filename}")
+            logger.info(f"Экспорт в WooCommerce CSV завершен: {rows_count} строк в файл {filename}")
             return True
             
         except Exception as e:
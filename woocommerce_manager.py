@@ -2,20 +2,183 @@
 WooCommerce Product Manager - основной класс для работы с API
 """
 import logging
-from typing import List, Dict, Any, Optional
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, as_completed, wait
+from itertools import islice
+from typing import List, Dict, Any, Optional, Tuple, Iterator, Iterable, Callable
+from urllib.parse import urlencode
 from woocommerce import API
+from woocommerce.oauth import OAuth
 from config import config_manager
+from product_mirror import ProductMirror
+from rate_limiter import AdaptiveRateLimiter, get_rate_limiter, parse_retry_after
+from taxonomy_cache import TaxonomyCache, get_taxonomy_cache
+from single_flight import SingleFlight, get_single_flight
+from http_cache import HttpCache, get_http_cache
+from api_metrics import api_metrics
+from request_scheduler import (RequestScheduler, ContextThreadPoolExecutor, INTERACTIVE, current_priority,
+                               get_request_scheduler, request_priority)
 import requests
 from requests.adapters import HTTPAdapter
+from requests.auth import HTTPBasicAuth
 from urllib3.util.retry import Retry
 
 # Настройка логирования
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Максимальное число операций в одном пакетном запросе WooCommerce
+BATCH_LIMIT = 100
+BATCH_KINDS = ("create", "update", "delete")
+
+def sign_request(api: API, method: str, endpoint: str,
+                 params: Optional[Dict[str, Any]] = None) -> Tuple[str, Dict[str, Any], bool]:
+    """
+    Подготовка адреса и параметров запроса с авторизацией
+    
+    Авторизация такая же, как в woocommerce.API: Basic Auth для https
+    и подпись OAuth 1.0a для http (подпись одноразовая - ее нужно создавать
+    заново для каждой попытки).
+    
+    Args:
+        api: Объект woocommerce.API с настройками подключения
+        method: HTTP-метод
+        endpoint: Эндпоинт API (например, "products")
+        params: Параметры строки запроса
+    
+    Returns:
+        Tuple: (адрес, параметры строки запроса, нужна ли Basic Auth)
+    """
+    # Логические значения передаются так, как их понимает WordPress
+    params = {
+        key: ("true" if value else "false") if isinstance(value, bool) else value
+        for key, value in (params or {}).items()
+    }
+    
+    url = api.url if api.url.endswith("/") else f"{api.url}/"
+    url = f"{url}{'wp-json' if api.wp_api else 'wc-api'}/{api.version}/{endpoint}"
+    
+    if api.is_ssl and not api.query_string_auth:
+        return url, params, True
+    
+    if api.is_ssl:
+        params.update({
+            "consumer_key": api.consumer_key,
+            "consumer_secret": api.consumer_secret
+        })
+        return url, params, False
+    
+    oauth = OAuth(
+        url=f"{url}?{urlencode(params)}" if params else url,
+        consumer_key=api.consumer_key,
+        consumer_secret=api.consumer_secret,
+        version=api.version,
+        method=method,
+        oauth_timestamp=int(time.time())
+    )
+    return oauth.get_oauth_url(), {}, False
+
+def split_batch(operations: Dict[str, List[Any]], batch_size: int) -> Tuple[List[List[Tuple[str, int, Any]]], Dict[str, List[Any]]]:
+    """
+    Разбиение пакетных операций на части
+    
+    Args:
+        operations: Словарь {"create": [...], "update": [...], "delete": [...]}
+        batch_size: Размер части (не больше BATCH_LIMIT)
+    
+    Returns:
+        Tuple: (части из элементов (вид, индекс, данные), заготовка результатов по видам)
+    """
+    batch_size = max(1, min(batch_size, BATCH_LIMIT))
+    queue = [
+        (kind, index, item)
+        for kind in BATCH_KINDS
+        for index, item in enumerate(operations.get(kind) or [])
+    ]
+    results = {kind: [None] * len(operations.get(kind) or []) for kind in BATCH_KINDS}
+    chunks = [queue[i:i + batch_size] for i in range(0, len(queue), batch_size)]
+    return chunks, results
+
+def batch_payload(chunk: List[Tuple[str, int, Any]], extra: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Тело пакетного запроса для одной части"""
+    payload = dict(extra or {})
+    for kind, _, item in chunk:
+        payload.setdefault(kind, []).append(item)
+    return payload
+
+def collect_batch_results(results: Dict[str, List[Any]], chunk: List[Tuple[str, int, Any]],
+                          response_data: Optional[Dict[str, Any]], chunk_error: Optional[Dict[str, Any]]):
+    """
+    Сопоставление ответа пакетного запроса с входными элементами части
+    
+    Каждый элемент ответа, включая объекты "error" внутри ответа 200,
+    записывается в results[вид][индекс] как {"index", "input", "data", "error"}.
+    """
+    positions = {kind: 0 for kind in BATCH_KINDS}
+    for kind, index, item in chunk:
+        position = positions[kind]
+        positions[kind] += 1
+        
+        entry = {"index": index, "input": item, "data": None, "error": None}
+        if chunk_error:
+            entry["error"] = chunk_error
+        else:
+            returned = response_data.get(kind) or []
+            data = returned[position] if position < len(returned) else None
+            if data is None:
+                entry["error"] = {"code": "missing_result", "message": "Сервер не вернул результат для элемента"}
+            elif isinstance(data, dict) and data.get("error"):
+                entry["error"] = data["error"]
+            else:
+                entry["data"] = data
+        
+        results[kind][index] = entry
+
+def batch_summary(entries: List[Dict[str, Any]], operation: str) -> Dict[str, Any]:
+    """
+    Сводка по результатам одного вида пакетной операции
+    
+    Args:
+        entries: Результаты элементов из collect_batch_results
+        operation: Название операции для журнала
+    
+    Returns:
+        Dict: {"success": [...], "errors": [...], "items": [...]}
+    """
+    success = [entry["data"] for entry in entries if not entry["error"]]
+    errors = []
+    for entry in entries:
+        if entry["error"]:
+            item = entry["input"]
+            error = entry["error"] if isinstance(entry["error"], dict) else {"message": str(entry["error"])}
+            errors.append({
+                "index": entry["index"],
+                "id": item.get("id") if isinstance(item, dict) else item,
+                "code": error.get("code", ""),
+                "error": error.get("message", "")
+            })
+    
+    logger.info(f"Пакетное {operation}: успешно {len(success)}, ошибок {len(errors)}")
+    return {"success": success, "errors": errors, "items": entries}
+
 class WooCommerceManager:
     """Класс для управления товарами через WooCommerce REST API"""
     
+    BATCH_LIMIT = BATCH_LIMIT
+    BATCH_KINDS = BATCH_KINDS
+    
+    # Коды ответа, при которых запрос повторяется; 429 и 503 (перегрузка)
+    # обрабатываются отдельно с учетом Retry-After и ограничителя частоты
+    RETRY_STATUSES = (500, 502, 504)
+    
+    # Методы, которые можно безопасно отправить повторно
+    IDEMPOTENT_METHODS = frozenset(["GET", "HEAD", "OPTIONS", "PUT", "DELETE"])
+    
+    # Сколько SKU запрашивается у сайта одним запросом (через запятую)
+    SKU_LOOKUP_CHUNK = 50
+    
     def __init__(self, config: Dict[str, Any] = None):
         """
         Инициализация менеджера WooCommerce
@@ -24,8 +187,19 @@ class WooCommerceManager:
             config: Словарь с настройками подключения (опционально)
         """
         self.api = None
+        self.session = None
+        self.rate_limiter: Optional[AdaptiveRateLimiter] = None
+        self.taxonomy_cache: Optional[TaxonomyCache] = None
+        self.single_flight: Optional[SingleFlight] = None
+        self.http_cache: Optional[HttpCache] = None
+        self.request_scheduler: Optional[RequestScheduler] = None
+        self.profile_key: Optional[str] = None
         self.current_config = None
         
+        # Индекс SKU -> ID, заполняется при загрузке товаров
+        self._sku_index: Dict[str, List[int]] = {}
+        self._sku_lock = threading.Lock()
+        
         if config:
             self._setup_api_with_config(config)
         else:
@@ -57,12 +231,208 @@ class WooCommerceManager:
                 version=config.get('api_version', 'wc/v3'),
                 timeout=config.get('timeout', 30)
             )
+            self._setup_session()
             logger.info(f"API инициализирован для {config.get('site_url', 'неизвестный сайт')}")
         except Exception as e:
             logger.error(f"Ошибка инициализации API: {e}")
             self.api = None
             self.current_config = None
     
+    def _setup_session(self):
+        """
+        Создание HTTP-сессии с пулом соединений и политикой повторов
+        
+        Пул keep-alive соединений рассчитан на max_workers параллельных запросов,
+        поэтому параллельная загрузка не тратит время на новые TCP и TLS рукопожатия.
+        Повторы с экспоненциальной паузой выполняются при ошибках соединения
+        и ответах 5xx; запросы, изменяющие данные (POST), повторяются только
+        при ошибке установки соединения, когда запрос гарантированно не был отправлен.
+        """
+        if self.session:
+            self.session.close()
+        
+        max_workers = max(1, self._config_value('max_workers', 4))
+        max_retries = max(0, self._config_value('max_retries', 3))
+        
+        # Подпись OAuth (http) одноразовая: повторно отправленный запрос сервер
+        # отклонит, поэтому для http повторяются только неудачные подключения
+        resend_allowed = self.api.is_ssl
+        
+        retry = Retry(
+            total=max_retries,
+            connect=max_retries,
+            read=max_retries if resend_allowed else 0,
+            status=max_retries if resend_allowed else 0,
+            other=0,
+            backoff_factor=self._config_value('retry_backoff', 0.5),
+            status_forcelist=self.RETRY_STATUSES,
+            allowed_methods=self.IDEMPOTENT_METHODS,
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        # Еще одно соединение - для интерактивных запросов, которым зарезервирован слот планировщика
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers + RequestScheduler.RESERVED,
+                              max_retries=retry)
+        
+        self.session = requests.Session()
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.verify = self.api.verify_ssl
+        self.session.headers.update({
+            "user-agent": self.api.user_agent,
+            "accept": "application/json"
+        })
+        
+        # Ограничитель, кэши и объединение запросов общие для всех менеджеров,
+        # работающих с этим магазином
+        profile_key = self.profile_key = f"{self.api.url}|{self.api.consumer_key}"
+        self.rate_limiter = get_rate_limiter(profile_key, self._config_value('rate_limit', 20.0))
+        self.taxonomy_cache = get_taxonomy_cache(profile_key, self._config_value('taxonomy_ttl', 600))
+        self.single_flight = get_single_flight(profile_key)
+        self.http_cache = get_http_cache(profile_key, self._config_value('http_cache_mb', 50))
+        self.request_scheduler = get_request_scheduler(profile_key, max_workers)
+    
+    def _request(self, method: str, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                 data: Any = None) -> requests.Response:
+        """
+        Выполнение запроса к API через общую HTTP-сессию
+        
+        Запрос проходит через ограничитель частоты профиля. Ответы 429 и 503
+        замедляют ограничитель и повторяются после паузы из Retry-After
+        (или экспоненциальной паузы); запросы POST при 503 повторяются, только
+        если сервер прислал Retry-After, то есть явно не выполнил запрос.
+        
+        Одновременные одинаковые GET-запросы профиля (например, значения одного
+        атрибута из нескольких окон) объединяются: по сети уходит один запрос,
+        и все вызывающие получают его ответ. Объединяются только запросы
+        одного класса приоритета, чтобы интерактивный запрос не ждал фоновый.
+        
+        Каждая попытка занимает слот планировщика профиля в классе приоритета
+        текущего потока (см. request_scheduler.request_priority).
+        
+        Args:
+            method: HTTP-метод
+            endpoint: Эндпоинт API (например, "products")
+            params: Параметры строки запроса
+            data: Тело запроса (сериализуется в JSON)
+        
+        Returns:
+            requests.Response: Ответ сервера
+        """
+        if not self.api or not self.session:
+            raise RuntimeError("API не инициализирован")
+        
+        if method == "GET" and data is None:
+            key = (current_priority(), endpoint,
+                   tuple(sorted((name, str(value)) for name, value in (params or {}).items())))
+            response, _ = self.single_flight.do(key, lambda: self._request_with_retries(method, endpoint, params, data))
+            return response
+        
+        return self._request_with_retries(method, endpoint, params, data)
+    
+    def _request_with_retries(self, method: str, endpoint: str, params: Optional[Dict[str, Any]],
+                              data: Any) -> requests.Response:
+        """
+        Отправка запроса с учетом ограничителя частоты и повторами 429/503
+        
+        На http-профилях urllib3 не повторяет ответы 5xx (подпись OAuth одноразовая),
+        поэтому 500/502/504 для идемпотентных методов повторяются здесь: каждая
+        попытка подписывается заново.
+        """
+        max_retries = max(0, self._config_value('max_retries', 3))
+        backoff = self._config_value('retry_backoff', 0.5)
+        page = (params or {}).get("page")
+        priority = current_priority()
+        call_started = time.monotonic()
+        resign_retries = not self.api.is_ssl and method in self.IDEMPOTENT_METHODS
+        
+        for attempt in range(max_retries + 1):
+            with self.request_scheduler.slot(priority):
+                self.rate_limiter.acquire(borrow=priority == INTERACTIVE)
+                started = time.monotonic()
+                try:
+                    response = self._send(method, endpoint, params, data)
+                except requests.RequestException:
+                    self.rate_limiter.on_error()
+                    finished = time.monotonic()
+                    api_metrics.record(method, endpoint, None, finished - started, finished - call_started,
+                                       retries=attempt, page=page)
+                    raise
+            
+            latency = time.monotonic() - started
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            self.rate_limiter.on_response(response.status_code, latency, retry_after)
+            
+            retryable = (response.status_code in AdaptiveRateLimiter.THROTTLE_STATUSES
+                         or (resign_retries and response.status_code in self.RETRY_STATUSES))
+            if not retryable or attempt == max_retries:
+                break
+            if response.status_code == 503 and method not in self.IDEMPOTENT_METHODS and retry_after is None:
+                break
+            
+            # Пауза Retry-After выдерживается ограничителем (для всех потоков профиля)
+            if retry_after is None:
+                time.sleep(backoff * (2 ** attempt))
+            logger.warning(f"Ответ {response.status_code} для {endpoint}, повтор {attempt + 1} из {max_retries}")
+        
+        self._record_metrics(method, endpoint, response, latency, time.monotonic() - call_started, attempt, page)
+        return response
+    
+    def _record_metrics(self, method: str, endpoint: str, response: requests.Response, latency: float,
+                        duration: float, retries: int, page: Optional[int]):
+        """Учет вызова в метриках API (повторы urllib3 при 5xx и обрывах тоже учитываются)"""
+        from_cache = getattr(response, "from_cache", False)
+        transport_retries = getattr(getattr(response.raw, "retries", None), "history", ())
+        body = response.request.body if response.request is not None else None
+        api_metrics.record(
+            method, endpoint, response.status_code, latency, duration,
+            request_bytes=len(body) if body else 0,
+            response_bytes=0 if from_cache else len(response.content),
+            retries=retries + len(transport_retries),
+            page=page,
+            from_cache=from_cache
+        )
+    
+    def _send(self, method: str, endpoint: str, params: Optional[Dict[str, Any]], data: Any) -> requests.Response:
+        """
+        Отправка одного запроса с авторизацией (подпись создается заново для каждой попытки)
+        
+        GET-запросы, ответ на которые сохранен в HTTP-кэше, отправляются условными
+        (If-None-Match / If-Modified-Since); ответ 304 заменяется сохраненной копией.
+        """
+        cache_key = cached = None
+        headers = None
+        if method == "GET" and self.http_cache:
+            cache_key = self._http_cache_key(endpoint, params)
+            cached = self.http_cache.get(cache_key)
+            if cached:
+                headers = self.http_cache.conditional_headers(cached)
+        
+        url, query, basic_auth = sign_request(self.api, method, endpoint, params)
+        auth = HTTPBasicAuth(self.api.consumer_key, self.api.consumer_secret) if basic_auth else None
+        
+        response = self.session.request(
+            method=method,
+            url=url,
+            params=query,
+            json=data,
+            headers=headers,
+            auth=auth,
+            timeout=self.api.timeout
+        )
+        
+        if cache_key is None:
+            return response
+        if response.status_code == 304 and cached:
+            return self.http_cache.revalidated(cache_key, cached, response)
+        self.http_cache.store(cache_key, response)
+        return response
+    
+    def _http_cache_key(self, endpoint: str, params: Optional[Dict[str, Any]]) -> str:
+        """Ключ HTTP-кэша: профиль, эндпоинт и параметры без учета порядка"""
+        query = urlencode(sorted((name, str(value)) for name, value in (params or {}).items()))
+        return f"{self.api.url}|{self.api.consumer_key}|{endpoint}?{query}"
+    
     def update_config(self, config: Dict[str, Any]):
         """
         Обновление конфигурации подключения
@@ -87,7 +457,8 @@ class WooCommerceManager:
             return False
         
         try:
-            response = self.api.get("products", params={"per_page": 1})
+            with request_priority(INTERACTIVE):
+                response = self._request("GET", "products", params={"per_page": 1})
             if response.status_code == 200:
                 logger.info("Подключение к WooCommerce API успешно!")
                 return True
@@ -98,10 +469,194 @@ class WooCommerceManager:
             logger.error(f"Ошибка тестирования подключения: {e}")
             return False
     
-    def get_all_products(self) -> List[Dict[str, Any]]:
+    def _config_value(self, key: str, default: Any) -> Any:
+        """Получение параметра из конфигурации подключения"""
+        if not self.current_config:
+            return default
+        value = self.current_config.get(key)
+        return default if value is None else value
+    
+    def _get_page(self, endpoint: str, params: Dict[str, Any], page: int) -> Optional[Tuple[List[Dict[str, Any]], Optional[int]]]:
+        """
+        Получение одной страницы коллекции
+        
+        Args:
+            endpoint: Эндпоинт коллекции (например, "products")
+            params: Параметры запроса без номера страницы
+            page: Номер страницы
+        
+        Returns:
+            Tuple: (элементы страницы, всего страниц из X-WP-TotalPages) или None при ошибке
+        """
+        logger.info(f"Загрузка страницы {page} ({endpoint})...")
+        response = self._request("GET", endpoint, params=dict(params, page=page))
+        
+        if response.status_code != 200:
+            logger.error(f"Ошибка получения страницы {page} ({endpoint}): {response.status_code}")
+            return None
+        
+        total_pages = response.headers.get("X-WP-TotalPages")
+        return response.json(), int(total_pages) if total_pages else None
+    
+    def _iter_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                    per_page: Optional[int] = None, strict: bool = False,
+                    max_workers: Optional[int] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Постраничный обход коллекции
+        
+        Первая страница запрашивается отдельно: по заголовку X-WP-TotalPages
+        определяется число страниц, остальные загружаются параллельно пулом
+        из max_workers потоков. Страницы отдаются строго по порядку, а вперед
+        запрашивается не больше 2 * max_workers страниц, поэтому потребитель
+        обрабатывает каталог любого размера в ограниченной памяти.
+        Если сервер не вернул заголовок, страницы загружаются последовательно.
+        
+        Args:
+            endpoint: Эндпоинт коллекции (например, "products")
+            params: Дополнительные параметры запроса
+            per_page: Размер страницы (по умолчанию products_per_page профиля)
+            strict: Выбрасывать RuntimeError, если страницу не удалось загрузить,
+                    вместо молчаливой остановки обхода
+            max_workers: Число потоков загрузки (по умолчанию max_workers профиля)
+        
+        Yields:
+            List[Dict]: Элементы очередной страницы
+        """
+        per_page = per_page or self._config_value('products_per_page', 100)
+        params = dict(params or {}, per_page=per_page)
+        
+        first = self._get_page(endpoint, params, 1)
+        if first is None:
+            if strict:
+                raise RuntimeError(f"Не удалось загрузить страницу 1 ({endpoint})")
+            return
+        
+        items, total_pages = first
+        if items:
+            yield items
+        
+        if total_pages is None:
+            # Сервер не сообщил число страниц - идем последовательно
+            page = 2
+            while len(items) >= per_page:
+                page_result = self._get_page(endpoint, params, page)
+                if page_result is None and strict:
+                    raise RuntimeError(f"Не удалось загрузить страницу {page} ({endpoint})")
+                if page_result is None or not page_result[0]:
+                    break
+                if page_result[0][:1] == items[:1]:
+                    # Эндпоинт не поддерживает page и отдает всю коллекцию сразу
+                    # (например, products/attributes)
+                    break
+                items = page_result[0]
+                yield items
+                page += 1
+            return
+        
+        if total_pages < 2:
+            return
+        
+        pages = iter(range(2, total_pages + 1))
+        max_workers = max(1, min(max_workers or self._config_value('max_workers', 4), total_pages - 1))
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            window = deque(
+                executor.submit(self._get_page, endpoint, params, page)
+                for page in islice(pages, max_workers * 2)
+            )
+            try:
+                page = 1
+                while window:
+                    page += 1
+                    page_result = window.popleft().result()
+                    if page_result is None:
+                        if strict:
+                            raise RuntimeError(f"Не удалось загрузить страницу {page} ({endpoint})")
+                        # Пропуск страницы нарушил бы порядок - останавливаемся на ней
+                        break
+                    
+                    next_page = next(pages, None)
+                    if next_page is not None:
+                        window.append(executor.submit(self._get_page, endpoint, params, next_page))
+                    
+                    if page_result[0]:
+                        yield page_result[0]
+            finally:
+                for future in window:
+                    future.cancel()
+    
+    def _fetch_all_pages(self, endpoint: str, params: Optional[Dict[str, Any]] = None,
+                         per_page: Optional[int] = None, strict: bool = False,
+                         max_workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Получение всех страниц коллекции одним списком
+        
+        Args:
+            endpoint: Эндпоинт коллекции
+            params: Дополнительные параметры запроса
+            per_page: Размер страницы
+            strict: Выбрасывать RuntimeError при ошибке загрузки страницы
+            max_workers: Число потоков загрузки страниц
+        
+        Returns:
+            List[Dict]: Элементы всех успешно загруженных страниц
+        """
+        results = []
+        for items in self._iter_pages(endpoint, params, per_page, strict, max_workers):
+            results.extend(items)
+        return results
+    
+    def _fields_params(self, fields: Optional[Iterable[str]]) -> Dict[str, Any]:
+        """Параметр _fields для запроса только нужных полей"""
+        return {"_fields": ",".join(fields)} if fields else {}
+    
+    def iter_product_pages(self, fields: Optional[Iterable[str]] = None) -> Iterator[List[Dict[str, Any]]]:
+        """
+        Постраничная загрузка товаров с сайта
+        
+        Каждая страница отдается сразу после получения, поэтому первые
+        товары доступны через один запрос, а память не зависит от размера каталога.
+        
+        Args:
+            fields: Запрашиваемые поля (например, Product.LIST_FIELDS); по умолчанию все
+        
+        Yields:
+            List[Dict]: Товары очередной страницы
+        """
+        if not self.api:
+            logger.error("API не инициализирован")
+            return
+        
+        try:
+            self._reset_sku_index()
+            for page in self._iter_pages("products", self._fields_params(fields)):
+                self._index_products(page)
+                yield page
+        except Exception as e:
+            logger.error(f"Ошибка при получении товаров: {e}")
+    
+    def iter_products(self, fields: Optional[Iterable[str]] = None) -> Iterator[Dict[str, Any]]:
+        """
+        Потоковая загрузка товаров с сайта по одному
+        
+        Args:
+            fields: Запрашиваемые поля; по умолчанию все
+        
+        Yields:
+            Dict: Данные товара
+        """
+        for page in self.iter_product_pages(fields):
+            yield from page
+    
+    def get_all_products(self, fields: Optional[Iterable[str]] = None) -> List[Dict[str, Any]]:
         """
         Получение всех товаров с сайта
         
+        Страницы загружаются параллельно (см. max_workers в профиле подключения).
+        Для больших каталогов используйте iter_product_pages().
+        
+        Args:
+            fields: Запрашиваемые поля (например, Product.LIST_FIELDS); по умолчанию все
+        
         Returns:
             List[Dict]: Список всех товаров
         """
@@ -109,37 +664,219 @@ class WooCommerceManager:
             logger.error("API не инициализирован")
             return []
         
-        products = []
-        page = 1
+        try:
+            products = self._fetch_all_pages("products", self._fields_params(fields))
+            self._reset_sku_index(products)
+            logger.info(f"Загружено {len(products)} товаров")
+            return products
+        
+        except Exception as e:
+            logger.error(f"Ошибка при получении товаров: {e}")
+            return []
+    
+    def sync_products(self, mirror: ProductMirror, full: bool = False,
+                      on_page: Optional[Callable[[List[Dict[str, Any]]], None]] = None,
+                      fields: Optional[Iterable[str]] = None) -> Optional[Dict[str, Any]]:
+        """
+        Синхронизация локальной копии каталога с сайтом
+        
+        Если копия пуста (или full=True), каталог загружается полностью.
+        Иначе запрашиваются только товары с modified_after не раньше отметки
+        последней синхронизации, а удаленные товары находятся по дешевому
+        списку ID (_fields=id). Копия изменяется только при успешной загрузке.
+        
+        Args:
+            mirror: Локальная копия товаров профиля
+            full: Принудительная полная загрузка
+            on_page: Обработчик страниц при полной загрузке (для постепенного отображения)
+            fields: Запрашиваемые поля товаров; по умолчанию все
+        
+        Returns:
+            Dict: Статистика синхронизации или None в случае ошибки
+        """
+        if not self.api:
+            logger.error("API не инициализирован")
+            return None
         
         try:
-            while True:
-                logger.info(f"Загрузка страницы {page}...")
-                response = self.api.get("products", params={
-                    "per_page": config_manager.get_current_config().get('products_per_page', 10),
-                    "page": page
-                })
-                
-                if response.status_code != 200:
-                    logger.error(f"Ошибка получения товаров: {response.status_code}")
-                    break
+            if full or mirror.is_empty():
+                products = []
+                for page in self._iter_pages("products", self._fields_params(fields), strict=True):
+                    products.extend(page)
+                    if on_page:
+                        on_page(page)
                 
-                batch = response.json()
-                if not batch:
-                    break
-                
-                products.extend(batch)
-                page += 1
-                
-                # Проверяем, есть ли еще страницы
-                if len(batch) < config_manager.get_current_config().get('products_per_page', 10):
-                    break
+                mirror.replace_all(products)
+                self._reset_sku_index(products)
+                logger.info(f"Полная синхронизация: {len(products)} товаров")
+                return {"full": True, "updated": len(products), "deleted": 0, "total": mirror.count()}
             
-            logger.info(f"Загружено {len(products)} товаров")
-            return products
+            changed = self._fetch_all_pages("products", dict(
+                self._fields_params(fields),
+                modified_after=mirror.get_modified_after(),
+                dates_are_gmt=True
+            ), strict=True)
             
+            existing_ids = []
+            for page in self._iter_pages("products", {"_fields": "id"}, strict=True):
+                existing_ids.extend(product["id"] for product in page)
+            
+            stats = mirror.apply_changes(changed, existing_ids)
+            with self._sku_lock:
+                self._sku_index = mirror.get_sku_index()
+            logger.info(f"Инкрементальная синхронизация: обновлено {stats['updated']}, удалено {stats['deleted']}")
+            return {"full": False, "updated": stats["updated"], "deleted": stats["deleted"], "total": mirror.count()}
+        
         except Exception as e:
-            logger.error(f"Ошибка при получении товаров: {e}")
+            logger.error(f"Ошибка синхронизации товаров: {e}")
+            return None
+    
+    def _reset_sku_index(self, products: Iterable[Dict[str, Any]] = ()):
+        """Перестроение индекса SKU по новому списку товаров"""
+        with self._sku_lock:
+            self._sku_index = {}
+        self._index_products(products)
+    
+    def _index_products(self, products: Iterable[Dict[str, Any]]):
+        """Добавление товаров в индекс SKU"""
+        with self._sku_lock:
+            for product in products:
+                sku = product.get("sku")
+                if not sku:
+                    continue
+                ids = self._sku_index.setdefault(sku, [])
+                if product["id"] not in ids:
+                    ids.append(product["id"])
+    
+    def resolve_skus(self, skus: Iterable[str]) -> Dict[str, Any]:
+        """
+        Поиск ID товаров по списку SKU за один проход
+        
+        Ответ берется из локального индекса, построенного при загрузке товаров.
+        У сайта запрашиваются только отсутствующие в индексе SKU - группами
+        по SKU_LOOKUP_CHUNK через запятую, группы параллельно. SKU, содержащие
+        запятую, так запросить нельзя - они ищутся только в индексе.
+        
+        Args:
+            skus: Список SKU (например, из файла поставщика)
+        
+        Returns:
+            Dict: {"found": {sku: id}, "missing": [sku, ...], "duplicates": {sku: [id, ...]},
+                   "failed": [sku, ...]} - в "failed" SKU, которые не удалось проверить на сайте
+        """
+        wanted = list(dict.fromkeys(sku.strip() for sku in skus if sku and sku.strip()))
+        
+        with self._sku_lock:
+            misses = [sku for sku in wanted if sku not in self._sku_index]
+        
+        lookup = [sku for sku in misses if "," not in sku]
+        failed = set()
+        if lookup and self.api:
+            chunks = [lookup[i:i + self.SKU_LOOKUP_CHUNK] for i in range(0, len(lookup), self.SKU_LOOKUP_CHUNK)]
+            
+            def fetch_chunk(chunk):
+                return self._fetch_all_pages("products", {"sku": ",".join(chunk), "_fields": "id,sku"},
+                                             per_page=100, strict=True)
+            
+            try:
+                max_workers = max(1, min(self._config_value('max_workers', 4), len(chunks)))
+                with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+                    for products in executor.map(fetch_chunk, chunks):
+                        self._index_products(products)
+            except Exception as e:
+                logger.error(f"Ошибка при поиске товаров по SKU: {e}")
+                failed = set(lookup)
+        
+        found = {}
+        duplicates = {}
+        missing = []
+        unchecked = []
+        with self._sku_lock:
+            for sku in wanted:
+                ids = self._sku_index.get(sku)
+                if not ids:
+                    if sku in failed:
+                        unchecked.append(sku)
+                    else:
+                        missing.append(sku)
+                elif len(ids) > 1:
+                    duplicates[sku] = list(ids)
+                else:
+                    found[sku] = ids[0]
+        
+        logger.info(f"Поиск по SKU: найдено {len(found)}, не найдено {len(missing)}, дубликатов {len(duplicates)} "
+                    f"(запрошено у сайта {len(lookup)})")
+        return {"found": found, "missing": missing, "duplicates": duplicates, "failed": unchecked}
+    
+    def get_product(self, product_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Получение полных данных товара
+        
+        Args:
+            product_id: ID товара
+        
+        Returns:
+            Dict: Данные товара или None в случае ошибки
+        """
+        if not self.api:
+            logger.error("API не инициализирован")
+            return None
+        
+        try:
+            response = self._request("GET", f"products/{product_id}")
+            if response.status_code == 200:
+                return response.json()
+            else:
+                logger.error(f"Ошибка получения товара {product_id}: {response.status_code}")
+                return None
+        
+        except Exception as e:
+            logger.error(f"Ошибка при получении товара {product_id}: {e}")
+            return None
+    
+    def hydrate_products(self, product_ids: Iterable[int]) -> List[Dict[str, Any]]:
+        """
+        Получение полных данных нескольких товаров
+        
+        ID запрашиваются группами по 100 через параметр include, группы
+        загружаются параллельно.
+        
+        Args:
+            product_ids: ID товаров
+        
+        Returns:
+            List[Dict]: Полные данные найденных товаров
+        """
+        if not self.api:
+            logger.error("API не инициализирован")
+            return []
+        
+        product_ids = list(dict.fromkeys(product_ids))
+        if not product_ids:
+            return []
+        
+        chunks = [product_ids[i:i + 100] for i in range(0, len(product_ids), 100)]
+        
+        def fetch_chunk(chunk):
+            response = self._request("GET", "products", params={
+                "include": ",".join(str(product_id) for product_id in chunk),
+                "per_page": len(chunk)
+            })
+            if response.status_code != 200:
+                raise RuntimeError(f"Ошибка получения товаров: {response.status_code}")
+            return response.json()
+        
+        try:
+            products = []
+            max_workers = max(1, min(self._config_value('max_workers', 4), len(chunks)))
+            with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+                for items in executor.map(fetch_chunk, chunks):
+                    products.extend(items)
+            logger.info(f"Получены полные данные {len(products)} товаров")
+            return products
+        
+        except Exception as e:
+            logger.error(f"Ошибка при получении полных данных товаров: {e}")
             return []
     
     def create_product(self, product_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
@@ -148,7 +885,7 @@ class WooCommerceManager:
         
         Args:
             product_data: Данные товара
-            
+        
         Returns:
             Dict: Созданный товар или None в случае ошибки
         """
@@ -157,14 +894,14 @@ class WooCommerceManager:
             return None
         
         try:
-            response = self.api.post("products", product_data)
+            response = self._request("POST", "products", data=product_data)
             if response.status_code == 201:
                 logger.info(f"Товар создан: {product_data.get('name', 'Без названия')}")
                 return response.json()
             else:
                 logger.error(f"Ошибка создания товара: {response.status_code} - {response.text}")
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при создании товара: {e}")
             return None
@@ -176,7 +913,7 @@ class WooCommerceManager:
         Args:
             product_id: ID товара
             product_data: Новые данные товара
-            
+        
         Returns:
             Dict: Обновленный товар или None в случае ошибки
         """
@@ -185,14 +922,14 @@ class WooCommerceManager:
             return None
         
         try:
-            response = self.api.put(f"products/{product_id}", product_data)
+            response = self._request("PUT", f"products/{product_id}", data=product_data)
             if response.status_code == 200:
                 logger.info(f"Товар обновлен: ID {product_id}")
                 return response.json()
             else:
                 logger.error(f"Ошибка обновления товара: {response.status_code} - {response.text}")
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при обновлении товара: {e}")
             return None
@@ -204,7 +941,7 @@ class WooCommerceManager:
         Args:
             product_id: ID товара
             force: Полное удаление (True) или в корзину (False)
-            
+        
         Returns:
             bool: True если удаление успешно
         """
@@ -213,14 +950,14 @@ class WooCommerceManager:
             return False
         
         try:
-            response = self.api.delete(f"products/{product_id}", params={"force": force})
+            response = self._request("DELETE", f"products/{product_id}", params={"force": force})
             if response.status_code == 200:
                 logger.info(f"Товар удален: ID {product_id}")
                 return True
             else:
                 logger.error(f"Ошибка удаления товара: {response.status_code} - {response.text}")
                 return False
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при удалении товара: {e}")
             return False
@@ -231,7 +968,7 @@ class WooCommerceManager:
         
         Args:
             sku: Артикул товара
-            
+        
         Returns:
             Dict: Найденный товар или None
         """
@@ -240,21 +977,35 @@ class WooCommerceManager:
             return None
         
         try:
-            response = self.api.get("products", params={"sku": sku})
+            response = self._request("GET", "products", params={"sku": sku})
             if response.status_code == 200:
                 products = response.json()
                 if products:
                     return products[0]
             return None
-            
+        
         except Exception as e:
             logger.error(f"Ошибка поиска товара по SKU: {e}")
             return None
     
-    def get_categories(self) -> List[Dict[str, Any]]:
+    def _get_taxonomy(self, endpoint: str, refresh: bool) -> List[Dict[str, Any]]:
+        """Коллекция таксономии из кэша профиля, а при его отсутствии - с сервера"""
+        if not refresh:
+            items = self.taxonomy_cache.get(endpoint)
+            if items is not None:
+                return items
+        
+        items = self._fetch_all_pages(endpoint, per_page=100, strict=True)
+        self.taxonomy_cache.set(endpoint, items)
+        return items
+    
+    def get_categories(self, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Получение всех категорий товаров
         
+        Args:
+            refresh: Загрузить с сервера, даже если в кэше есть актуальные данные
+        
         Returns:
             List[Dict]: Список категорий
         """
@@ -263,21 +1014,19 @@ class WooCommerceManager:
             return []
         
         try:
-            response = self.api.get("products/categories", params={"per_page": 100})
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Ошибка получения категорий: {response.status_code}")
-                return []
-                
+            return self._get_taxonomy("products/categories", refresh)
+        
         except Exception as e:
             logger.error(f"Ошибка при получении категорий: {e}")
             return []
     
-    def get_attributes(self) -> List[Dict[str, Any]]:
+    def get_attributes(self, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Получение всех атрибутов товаров
         
+        Args:
+            refresh: Загрузить с сервера, даже если в кэше есть актуальные данные
+        
         Returns:
             List[Dict]: Список атрибутов
         """
@@ -286,13 +1035,8 @@ class WooCommerceManager:
             return []
         
         try:
-            response = self.api.get("products/attributes", params={"per_page": 100})
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Ошибка получения атрибутов: {response.status_code}")
-                return []
-                
+            return self._get_taxonomy("products/attributes", refresh)
+        
         except Exception as e:
             logger.error(f"Ошибка при получении атрибутов: {e}")
             return []
@@ -303,7 +1047,7 @@ class WooCommerceManager:
         
         Args:
             attribute_data: Данные атрибута (name, slug, type, order_by, has_archives)
-            
+        
         Returns:
             Dict: Созданный атрибут или None в случае ошибки
         """
@@ -312,15 +1056,17 @@ class WooCommerceManager:
             return None
         
         try:
-            response = self.api.post("products/attributes", attribute_data)
+            response = self._request("POST", "products/attributes", data=attribute_data)
             if response.status_code == 201:
                 result = response.json()
                 logger.info(f"Атрибут '{result['name']}' создан с ID {result['id']}")
+                self.taxonomy_cache.upsert("products/attributes", result)
+                self.taxonomy_cache.set(f"products/attributes/{result['id']}/terms", [])
                 return result
             else:
                 logger.error(f"Ошибка создания атрибута: {response.status_code} - {response.text}")
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при создании атрибута: {e}")
             return None
@@ -332,7 +1078,7 @@ class WooCommerceManager:
         Args:
             attribute_id: ID атрибута
             attribute_data: Обновленные данные атрибута
-            
+        
         Returns:
             Dict: Обновленный атрибут или None в случае ошибки
         """
@@ -341,15 +1087,16 @@ class WooCommerceManager:
             return None
         
         try:
-            response = self.api.put(f"products/attributes/{attribute_id}", attribute_data)
+            response = self._request("PUT", f"products/attributes/{attribute_id}", data=attribute_data)
             if response.status_code == 200:
                 result = response.json()
                 logger.info(f"Атрибут ID {attribute_id} обновлен")
+                self.taxonomy_cache.upsert("products/attributes", result)
                 return result
             else:
                 logger.error(f"Ошибка обновления атрибута: {response.status_code} - {response.text}")
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при обновлении атрибута: {e}")
             return None
@@ -360,7 +1107,7 @@ class WooCommerceManager:
         
         Args:
             attribute_id: ID атрибута
-            
+        
         Returns:
             bool: True если удаление прошло успешно
         """
@@ -369,25 +1116,28 @@ class WooCommerceManager:
             return False
         
         try:
-            response = self.api.delete(f"products/attributes/{attribute_id}", params={"force": True})
+            response = self._request("DELETE", f"products/attributes/{attribute_id}", params={"force": True})
             if response.status_code == 200:
                 logger.info(f"Атрибут ID {attribute_id} удален")
+                self.taxonomy_cache.remove("products/attributes", attribute_id)
+                self.taxonomy_cache.invalidate(f"products/attributes/{attribute_id}/terms")
                 return True
             else:
                 logger.error(f"Ошибка удаления атрибута: {response.status_code} - {response.text}")
                 return False
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при удалении атрибута: {e}")
             return False
     
-    def get_attribute_terms(self, attribute_id: int) -> List[Dict[str, Any]]:
+    def get_attribute_terms(self, attribute_id: int, refresh: bool = False) -> List[Dict[str, Any]]:
         """
         Получение терминов (значений) атрибута
         
         Args:
             attribute_id: ID атрибута
-            
+            refresh: Загрузить с сервера, даже если в кэше есть актуальные данные
+        
         Returns:
             List[Dict]: Список терминов атрибута
         """
@@ -396,17 +1146,81 @@ class WooCommerceManager:
             return []
         
         try:
-            response = self.api.get(f"products/attributes/{attribute_id}/terms", params={"per_page": 100})
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Ошибка получения терминов атрибута: {response.status_code}")
-                return []
-                
+            return self._get_taxonomy(f"products/attributes/{attribute_id}/terms", refresh)
+        
         except Exception as e:
             logger.error(f"Ошибка при получении терминов атрибута: {e}")
             return []
     
+    def get_attribute_term_count(self, attribute_id: int) -> Optional[int]:
+        """
+        Количество значений атрибута
+        
+        Берется из кэша таксономий, а если значения не загружены - из заголовка
+        X-WP-Total запроса одной записи, без загрузки самих значений.
+        
+        Args:
+            attribute_id: ID атрибута
+        
+        Returns:
+            int: Количество значений или None в случае ошибки
+        """
+        if not self.api:
+            logger.error("API не инициализирован")
+            return None
+        
+        terms = self.taxonomy_cache.get(f"products/attributes/{attribute_id}/terms")
+        if terms is not None:
+            return len(terms)
+        
+        try:
+            response = self._request("GET", f"products/attributes/{attribute_id}/terms",
+                                     params={"per_page": 1, "_fields": "id"})
+            if response.status_code != 200:
+                logger.error(f"Ошибка получения количества значений атрибута {attribute_id}: {response.status_code}")
+                return None
+            
+            total = response.headers.get("X-WP-Total")
+            if total is not None:
+                return int(total)
+            
+            # Сервер не сообщил количество - считаем полный список
+            return len(self.get_attribute_terms(attribute_id))
+        
+        except Exception as e:
+            logger.error(f"Ошибка при получении количества значений атрибута {attribute_id}: {e}")
+            return None
+    
+    def iter_attribute_term_counts(self, attribute_ids: Iterable[int]) -> Iterator[Tuple[int, Optional[int]]]:
+        """
+        Параллельный подсчет значений многих атрибутов
+        
+        Результаты отдаются по мере готовности (не в порядке attribute_ids),
+        чтобы интерфейс мог показывать их сразу.
+        
+        Args:
+            attribute_ids: ID атрибутов
+        
+        Yields:
+            Tuple: (ID атрибута, количество значений или None при ошибке)
+        """
+        attribute_ids = list(dict.fromkeys(attribute_ids))
+        if not attribute_ids:
+            return
+        
+        max_workers = max(1, min(self._config_value('max_workers', 4), len(attribute_ids)))
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.get_attribute_term_count, attribute_id): attribute_id
+                for attribute_id in attribute_ids
+            }
+            try:
+                for future in as_completed(futures):
+                    yield futures[future], future.result()
+            finally:
+                for future in futures:
+                    future.cancel()
+    
     def create_attribute_term(self, attribute_id: int, term_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Создание термина (значения) атрибута
@@ -414,7 +1228,7 @@ class WooCommerceManager:
         Args:
             attribute_id: ID атрибута
             term_data: Данные термина (name, slug, description)
-            
+        
         Returns:
             Dict: Созданный термин или None в случае ошибки
         """
@@ -423,15 +1237,16 @@ class WooCommerceManager:
             return None
         
         try:
-            response = self.api.post(f"products/attributes/{attribute_id}/terms", term_data)
+            response = self._request("POST", f"products/attributes/{attribute_id}/terms", data=term_data)
             if response.status_code == 201:
                 result = response.json()
                 logger.info(f"Термин '{result['name']}' создан для атрибута ID {attribute_id}")
+                self.taxonomy_cache.upsert(f"products/attributes/{attribute_id}/terms", result)
                 return result
             else:
                 logger.error(f"Ошибка создания термина: {response.status_code} - {response.text}")
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при создании термина: {e}")
             return None
@@ -443,7 +1258,7 @@ class WooCommerceManager:
         Args:
             attribute_id: ID атрибута
             term_id: ID термина
-            
+        
         Returns:
             bool: True если удаление прошло успешно
         """
@@ -452,14 +1267,15 @@ class WooCommerceManager:
             return False
         
         try:
-            response = self.api.delete(f"products/attributes/{attribute_id}/terms/{term_id}", params={"force": True})
+            response = self._request("DELETE", f"products/attributes/{attribute_id}/terms/{term_id}", params={"force": True})
             if response.status_code == 200:
                 logger.info(f"Термин ID {term_id} удален из атрибута ID {attribute_id}")
+                self.taxonomy_cache.remove(f"products/attributes/{attribute_id}/terms", term_id)
                 return True
             else:
                 logger.error(f"Ошибка удаления термина: {response.status_code} - {response.text}")
                 return False
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при удалении термина: {e}")
             return False
@@ -471,7 +1287,7 @@ class WooCommerceManager:
         Args:
             parent_id: ID родительского товара
             variation_data: Данные вариации
-            
+        
         Returns:
             Dict: Созданная вариация или None в случае ошибки
         """
@@ -480,14 +1296,14 @@ class WooCommerceManager:
             return None
         
         try:
-            response = self.api.post(f"products/{parent_id}/variations", variation_data)
+            response = self._request("POST", f"products/{parent_id}/variations", data=variation_data)
             if response.status_code == 201:
                 logger.info(f"Вариация создана для товара ID {parent_id}")
                 return response.json()
             else:
                 logger.error(f"Ошибка создания вариации: {response.status_code} - {response.text}")
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при создании вариации: {e}")
             return None
@@ -498,7 +1314,7 @@ class WooCommerceManager:
         
         Args:
             parent_id: ID родительского товара
-            
+        
         Returns:
             List[Dict]: Список вариаций
         """
@@ -507,17 +1323,75 @@ class WooCommerceManager:
             return []
         
         try:
-            response = self.api.get(f"products/{parent_id}/variations", params={"per_page": 100})
-            if response.status_code == 200:
-                return response.json()
-            else:
-                logger.error(f"Ошибка получения вариаций: {response.status_code}")
-                return []
-                
+            return self._fetch_all_pages(f"products/{parent_id}/variations", per_page=100, strict=True)
         except Exception as e:
             logger.error(f"Ошибка при получении вариаций: {e}")
             return []
     
+    def iter_variations(self, parent_ids: Iterable[int],
+                        fields: Optional[Iterable[str]] = None) -> Iterator[Tuple[int, Optional[List[Dict[str, Any]]]]]:
+        """
+        Загрузка вариаций многих товаров с ограниченной параллельностью
+        
+        Товары обрабатываются пулом из max_workers потоков (страницы одного
+        товара - последовательно), вперед ставится не больше 2 * max_workers
+        товаров. Результаты отдаются по мере готовности, не по порядку.
+        
+        Args:
+            parent_ids: ID вариативных товаров
+            fields: Запрашиваемые поля вариаций; по умолчанию все
+        
+        Yields:
+            Tuple: (ID товара, список вариаций или None, если загрузить не удалось)
+        """
+        if not self.api:
+            logger.error("API не инициализирован")
+            return
+        
+        params = self._fields_params(fields)
+        
+        def fetch(parent_id):
+            return self._fetch_all_pages(f"products/{parent_id}/variations", params,
+                                         per_page=100, strict=True, max_workers=1)
+        
+        parents = iter(dict.fromkeys(parent_ids))
+        max_workers = max(1, self._config_value('max_workers', 4))
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending = {executor.submit(fetch, parent_id): parent_id for parent_id in islice(parents, max_workers * 2)}
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        parent_id = pending.pop(future)
+                        next_parent = next(parents, None)
+                        if next_parent is not None:
+                            pending[executor.submit(fetch, next_parent)] = next_parent
+                        
+                        try:
+                            yield parent_id, future.result()
+                        except Exception as e:
+                            logger.error(f"Ошибка при получении вариаций товара {parent_id}: {e}")
+                            yield parent_id, None
+            finally:
+                for future in pending:
+                    future.cancel()
+    
+    def get_variations_for_products(self, parent_ids: Iterable[int]) -> Dict[int, List[Dict[str, Any]]]:
+        """
+        Получение вариаций многих товаров
+        
+        Args:
+            parent_ids: ID вариативных товаров
+        
+        Returns:
+            Dict: {ID товара: список вариаций} для успешно загруженных товаров
+        """
+        return {
+            parent_id: variations
+            for parent_id, variations in self.iter_variations(parent_ids)
+            if variations is not None
+        }
+    
     def update_variation(self, parent_id: int, variation_id: int, variation_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
         Обновление вариации товара
@@ -526,7 +1400,7 @@ class WooCommerceManager:
             parent_id: ID родительского товара
             variation_id: ID вариации
             variation_data: Новые данные вариации
-            
+        
         Returns:
             Dict: Обновленная вариация или None в случае ошибки
         """
@@ -535,14 +1409,14 @@ class WooCommerceManager:
             return None
         
         try:
-            response = self.api.put(f"products/{parent_id}/variations/{variation_id}", variation_data)
+            response = self._request("PUT", f"products/{parent_id}/variations/{variation_id}", data=variation_data)
             if response.status_code == 200:
                 logger.info(f"Вариация обновлена: ID {variation_id} товара {parent_id}")
                 return response.json()
             else:
                 logger.error(f"Ошибка обновления вариации: {response.status_code} - {response.text}")
                 return None
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при обновлении вариации: {e}")
             return None
@@ -555,7 +1429,7 @@ class WooCommerceManager:
             parent_id: ID родительского товара
             variation_id: ID вариации
             force: Полное удаление
-            
+        
         Returns:
             bool: True если удаление успешно
         """
@@ -564,52 +1438,85 @@ class WooCommerceManager:
             return False
         
         try:
-            response = self.api.delete(f"products/{parent_id}/variations/{variation_id}", params={"force": force})
+            response = self._request("DELETE", f"products/{parent_id}/variations/{variation_id}", params={"force": force})
             if response.status_code == 200:
                 logger.info(f"Вариация удалена: ID {variation_id} товара {parent_id}")
                 return True
             else:
                 logger.error(f"Ошибка удаления вариации: {response.status_code} - {response.text}")
                 return False
-                
+        
         except Exception as e:
             logger.error(f"Ошибка при удалении вариации: {e}")
             return False
     
+    def _run_batch(self, endpoint: str, operations: Dict[str, List[Any]],
+                   extra: Optional[Dict[str, Any]] = None,
+                   on_chunk: Optional[Callable[[List[Tuple[str, Dict[str, Any]]]], None]] = None
+                   ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Выполнение пакетных операций с разбиением на части
+        
+        Операции разбиваются на пакеты не больше batch_size (и не больше
+        BATCH_LIMIT, который допускает WooCommerce) и отправляются параллельно
+        пулом из max_workers потоков. Каждый элемент ответа, включая объекты
+        "error" внутри ответа 200, сопоставляется со своим входным элементом.
+        
+        Args:
+            endpoint: Эндпоинт пакетной операции (например, "products/batch")
+            operations: Словарь {"create": [...], "update": [...], "delete": [...]}
+            extra: Дополнительные поля, добавляемые в каждый пакет
+            on_chunk: Вызывается в вызывающем потоке по завершении каждого пакета
+                      (в порядке завершения) со списком (вид, результат элемента)
+        
+        Returns:
+            Dict: Для каждого вида операции список результатов в порядке входных
+                  элементов: {"index", "input", "data", "error"}
+        """
+        chunks, results = split_batch(operations, self._config_value('batch_size', BATCH_LIMIT))
+        if not chunks:
+            return results
+        
+        def send_chunk(chunk):
+            try:
+                response = self._request("POST", endpoint, data=batch_payload(chunk, extra))
+                if response.status_code == 200:
+                    return response.json(), None
+                logger.error(f"Ошибка пакетного запроса {endpoint}: {response.status_code} - {response.text}")
+                return None, {"code": f"http_{response.status_code}", "message": response.text}
+            except Exception as e:
+                logger.error(f"Ошибка при пакетном запросе {endpoint}: {e}")
+                return None, {"code": "request_failed", "message": str(e)}
+        
+        max_workers = max(1, min(self._config_value('max_workers', 4), len(chunks)))
+        with ContextThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(send_chunk, chunk): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                response_data, chunk_error = future.result()
+                collect_batch_results(results, chunk, response_data, chunk_error)
+                if on_chunk:
+                    on_chunk([(kind, results[kind][index]) for kind, index, _ in chunk])
+        
+        return results
+    
     def batch_create_products(self, products_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
         Пакетное создание товаров
         
         Args:
             products_data: Список данных товаров
-            
+        
         Returns:
-            Dict: Результат операции с успешными и неудачными товарами
+            Dict: Результат операции с успешными и неудачными товарами;
+                  "items" содержит результат для каждого входного элемента по порядку
         """
         if not self.api:
             logger.error("API не инициализирован")
-            return {"success": [], "errors": []}
-        
-        batch_data = {
-            "create": products_data
-        }
+            return {"success": [], "errors": [], "items": []}
         
-        try:
-            response = self.api.post("products/batch", batch_data)
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"Пакетное создание: {len(result.get('create', []))} товаров")
-                return {
-                    "success": result.get('create', []),
-                    "errors": []
-                }
-            else:
-                logger.error(f"Ошибка пакетного создания: {response.status_code} - {response.text}")
-                return {"success": [], "errors": [{"error": response.text}]}
-                
-        except Exception as e:
-            logger.error(f"Ошибка при пакетном создании: {e}")
-            return {"success": [], "errors": [{"error": str(e)}]}
+        results = self._run_batch("products/batch", {"create": products_data})
+        return batch_summary(results["create"], "создание")
     
     def batch_update_products(self, products_data: List[Dict[str, Any]]) -> Dict[str, Any]:
         """
@@ -617,34 +1524,16 @@ class WooCommerceManager:
         
         Args:
             products_data: Список данных товаров с ID
-            
+        
         Returns:
             Dict: Результат операции
         """
         if not self.api:
             logger.error("API не инициализирован")
-            return {"success": [], "errors": []}
-        
-        batch_data = {
-            "update": products_data
-        }
+            return {"success": [], "errors": [], "items": []}
         
-        try:
-            response = self.api.post("products/batch", batch_data)
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"Пакетное обновление: {len(result.get('update', []))} товаров")
-                return {
-                    "success": result.get('update', []),
-                    "errors": []
-                }
-            else:
-                logger.error(f"Ошибка пакетного обновления: {response.status_code} - {response.text}")
-                return {"success": [], "errors": [{"error": response.text}]}
-                
-        except Exception as e:
-            logger.error(f"Ошибка при пакетном обновлении: {e}")
-            return {"success": [], "errors": [{"error": str(e)}]}
+        results = self._run_batch("products/batch", {"update": products_data})
+        return batch_summary(results["update"], "обновление")
     
     def batch_delete_products(self, product_ids: List[int], force: bool = True) -> Dict[str, Any]:
         """
@@ -653,49 +1542,122 @@ class WooCommerceManager:
         Args:
             product_ids: Список ID товаров для удаления
             force: Полное удаление
-            
+        
         Returns:
             Dict: Результат операции
         """
         if not self.api:
             logger.error("API не инициализирован")
-            return {"success": [], "errors": []}
+            return {"success": [], "errors": [], "items": []}
         
-        delete_data = [{"id": pid} for pid in product_ids]
-        batch_data = {
-            "delete": delete_data
-        }
+        # WooCommerce ожидает в "delete" список ID, а не объектов
+        results = self._run_batch("products/batch", {"delete": list(product_ids)},
+                                  extra={"force": True} if force else None)
+        return batch_summary(results["delete"], "удаление")
+    
+    def batch_products(self, create: Optional[List[Dict[str, Any]]] = None,
+                       update: Optional[List[Dict[str, Any]]] = None,
+                       delete: Optional[List[int]] = None,
+                       on_chunk: Optional[Callable[[List[Tuple[str, Dict[str, Any]]]], None]] = None
+                       ) -> Dict[str, Dict[str, Any]]:
+        """
+        Смешанная пакетная операция: создание, обновление и удаление в одних запросах
         
-        if force:
-            batch_data["force"] = True
+        Операции всех видов укладываются в общие пакеты, поэтому сохранение
+        нескольких сотен изменений занимает несколько запросов.
         
-        try:
-            response = self.api.post("products/batch", batch_data)
-            if response.status_code == 200:
-                result = response.json()
-                logger.info(f"Пакетное удаление: {len(result.get('delete', []))} товаров")
-                return {
-                    "success": result.get('delete', []),
-                    "errors": []
-                }
-            else:
-                logger.error(f"Ошибка пакетного удаления: {response.status_code} - {response.text}")
-                return {"success": [], "errors": [{"error": response.text}]}
-                
-        except Exception as e:
-            logger.error(f"Ошибка при пакетном удалении: {e}")
-            return {"success": [], "errors": [{"error": str(e)}]}
+        Args:
+            create: Данные новых товаров
+            update: Данные обновляемых товаров с ID
+            delete: ID удаляемых товаров
+            on_chunk: Обработчик завершения каждого пакета (см. _run_batch)
+        
+        Returns:
+            Dict: Сводка по каждому виду операции {"create": {...}, "update": {...}, "delete": {...}}
+        """
+        if not self.api:
+            logger.error("API не инициализирован")
+            return {kind: {"success": [], "errors": [], "items": []} for kind in self.BATCH_KINDS}
+        
+        results = self._run_batch("products/batch", {
+            "create": create or [],
+            "update": update or [],
+            "delete": list(delete or [])
+        }, extra={"force": True} if delete else None, on_chunk=on_chunk)
+        
+        operations = {"create": "создание", "update": "обновление", "delete": "удаление"}
+        return {kind: batch_summary(results[kind], operations[kind]) for kind in self.BATCH_KINDS}
+    
+    def batch_create_variations(self, parent_id: int, variations_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Пакетное создание вариаций товара
+        
+        Args:
+            parent_id: ID родительского товара
+            variations_data: Список данных вариаций
+        
+        Returns:
+            Dict: Результат операции; "items" содержит результат для каждой вариации по порядку
+        """
+        if not self.api:
+            logger.error("API не инициализирован")
+            return {"success": [], "errors": [], "items": []}
+        
+        results = self._run_batch(f"products/{parent_id}/variations/batch", {"create": variations_data})
+        return batch_summary(results["create"], "создание вариаций")
+    
+    def batch_update_variations(self, parent_id: int, variations_data: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Пакетное обновление вариаций товара
+        
+        Args:
+            parent_id: ID родительского товара
+            variations_data: Список данных вариаций с ID
+        
+        Returns:
+            Dict: Результат операции
+        """
+        if not self.api:
+            logger.error("API не инициализирован")
+            return {"success": [], "errors": [], "items": []}
+        
+        results = self._run_batch(f"products/{parent_id}/variations/batch", {"update": variations_data})
+        return batch_summary(results["update"], "обновление вариаций")
+    
+    def batch_delete_variations(self, parent_id: int, variation_ids: List[int], force: bool = True) -> Dict[str, Any]:
+        """
+        Пакетное удаление вариаций товара
+        
+        Args:
+            parent_id: ID родительского товара
+            variation_ids: Список ID вариаций
+            force: Полное удаление
+        
+        Returns:
+            Dict: Результат операции
+        """
+        if not self.api:
+            logger.error("API не инициализирован")
+            return {"success": [], "errors": [], "items": []}
+        
+        results = self._run_batch(f"products/{parent_id}/variations/batch", {"delete": list(variation_ids)},
+                                  extra={"force": True} if force else None)
+        return batch_summary(results["delete"], "удаление вариаций")
     
     def create_variable_product_with_variations(self, product_data: Dict[str, Any], variations_data: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
         """
         Создание вариативного товара с вариациями
         
+        Вариации создаются пакетными запросами (до 100 в запросе), поэтому
+        товар с 40 вариациями создается за два запроса.
+        
         Args:
             product_data: Данные родительского товара
             variations_data: Список данных вариаций
-            
+        
         Returns:
-            Dict: Созданный товар с вариациями или None в случае ошибки
+            Dict: Созданный товар с вариациями или None в случае ошибки;
+                  ошибки отдельных вариаций - в "variation_errors"
         """
         # Создаем родительский товар
         parent_product = self.create_product(product_data)
@@ -703,15 +1665,14 @@ class WooCommerceManager:
             return None
         
         parent_id = parent_product["id"]
-        created_variations = []
         
         # Создаем вариации
-        for variation_data in variations_data:
-            variation = self.create_variation(parent_id, variation_data)
-            if variation:
-                created_variations.append(variation)
-            else:
-                logger.warning(f"Не удалось создать вариацию для товара {parent_id}")
+        batch_result = self.batch_create_variations(parent_id, variations_data)
+        created_variations = batch_result["success"]
+        for error in batch_result["errors"]:
+            logger.warning(f"Не удалось создать вариацию {error['index'] + 1} для товара {parent_id}: {error['error']}")
+        
+        parent_product["variation_errors"] = batch_result["errors"]
         
         # Возвращаем полную информацию
         parent_product["variations"] = created_variations